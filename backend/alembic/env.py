@@ -8,7 +8,25 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from alembic import context
 
 from app.database import Base
-from app.models import Container, Note, Tag  # noqa: F401
+from app.models import (  # noqa: F401
+    Change,
+    ChunkEmbedding,
+    Container,
+    Document,
+    DocumentChunk,
+    Highlight,
+    Job,
+    Note,
+    NoteChunk,
+    NoteEmbedding,
+    NoteLshBucket,
+    NoteNeighbor,
+    NoteRevision,
+    NoteSignature,
+    NoteTerm,
+    Tag,
+    TermTrigram,
+)
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -1,8 +1,25 @@
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, Header, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 
 DbSession = Annotated[AsyncSession, Depends(get_db)]
+
+
+def etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def if_match_version(if_match: Annotated[str | None, Header()] = None) -> int | None:
+    """The version a write is conditional on, from an ETag this API sent; None if unconditional."""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    tag = if_match.strip().removeprefix('"').removesuffix('"')
+    if not tag.isdigit():
+        raise HTTPException(status_code=400, detail="If-Match must be one ETag sent by this API")
+    return int(tag)
+
+
+IfMatch = Annotated[int | None, Depends(if_match_version)]
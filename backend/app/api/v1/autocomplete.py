@@ -0,0 +1,25 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Query
+
+from app.api.deps import DbSession
+from app.schemas.autocomplete import AutocompleteStats, Suggestion, SuggestionKind
+from app.services.autocomplete_service import AutocompleteService, autocomplete_index
+
+router = APIRouter()
+
+
+@router.get("", response_model=list[Suggestion])
+async def autocomplete(
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    db: DbSession,
+    kinds: Annotated[list[SuggestionKind] | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=50)] = 10,
+) -> list[Suggestion]:
+    service = AutocompleteService(db)
+    return await service.suggest(q, kinds, limit)
+
+
+@router.get("/stats", response_model=AutocompleteStats)
+async def get_autocomplete_stats() -> AutocompleteStats:
+    return autocomplete_index.stats()
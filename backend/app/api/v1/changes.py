@@ -0,0 +1,25 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Query
+
+from app.api.deps import DbSession
+from app.schemas.change import ChangePage, WriteConflictStats
+from app.services.change_service import ChangeService
+from app.services.concurrency import write_conflicts
+
+router = APIRouter()
+
+
+@router.get("", response_model=ChangePage)
+async def list_changes(
+    db: DbSession,
+    since: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 500,
+) -> ChangePage:
+    service = ChangeService(db)
+    return await service.list_changes(since, limit)
+
+
+@router.get("/conflicts", response_model=list[WriteConflictStats])
+async def get_write_conflicts() -> list[WriteConflictStats]:
+    return write_conflicts.stats()
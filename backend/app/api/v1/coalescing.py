@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from app.schemas.single_flight import SingleFlightStats
+from app.services.single_flight import read_flights
+
+router = APIRouter()
+
+
+@router.get("", response_model=list[SingleFlightStats])
+async def get_coalescing_stats() -> list[SingleFlightStats]:
+    return read_flights.stats()
@@ -1,12 +1,13 @@
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Response, status
 
-from app.api.deps import DbSession
+from app.api.deps import DbSession, IfMatch, etag
 from app.models.container import Container
 from app.schemas.container import (
     ContainerCreate,
     ContainerResponse,
+    ContainerSubtreeResult,
     ContainerUpdate,
     ContainerWithCount,
     ContainerWithNotes,
@@ -17,49 +18,84 @@ router = APIRouter()
 
 
 @router.post("", response_model=ContainerResponse, status_code=status.HTTP_201_CREATED)
-async def create_container(container_in: ContainerCreate, db: DbSession) -> Container:
+async def create_container(
+    container_in: ContainerCreate, db: DbSession, response: Response
+) -> Container:
     service = ContainerService(db)
-    return await service.create_container(container_in)
+    container = await service.create_container(container_in)
+    response.headers["ETag"] = etag(container.version)
+    return container
 
 
 @router.get("", response_model=list[ContainerWithCount])
 async def list_containers(db: DbSession) -> list[ContainerWithCount]:
     service = ContainerService(db)
-    return await service.list_containers_with_counts()
+    return await service.list_containers_coalesced()
 
 
 @router.get("/{container_id}", response_model=ContainerWithNotes)
-async def get_container(container_id: UUID, db: DbSession) -> Container:
+async def get_container(container_id: UUID, db: DbSession, response: Response) -> Container:
     service = ContainerService(db)
     container = await service.get_container_with_notes(container_id)
     if not container:
         raise HTTPException(status_code=404, detail="Container not found")
+    response.headers["ETag"] = etag(container.version)
     return container
 
 
 @router.put("/{container_id}", response_model=ContainerResponse)
 async def update_container(
-    container_id: UUID, container_in: ContainerUpdate, db: DbSession
+    container_id: UUID,
+    container_in: ContainerUpdate,
+    db: DbSession,
+    if_match: IfMatch,
+    response: Response,
 ) -> Container:
     service = ContainerService(db)
-    container = await service.update_container(container_id, container_in)
+    container = await service.update_container(container_id, container_in, if_match)
     if not container:
         raise HTTPException(status_code=404, detail="Container not found")
+    response.headers["ETag"] = etag(container.version)
     return container
 
 
 @router.patch("/{container_id}/archive", response_model=ContainerResponse)
-async def archive_container(container_id: UUID, db: DbSession) -> Container:
+async def archive_container(
+    container_id: UUID, db: DbSession, if_match: IfMatch, response: Response
+) -> Container:
     service = ContainerService(db)
-    container = await service.archive_container(container_id)
+    container = await service.archive_container(container_id, if_match)
     if not container:
         raise HTTPException(status_code=404, detail="Container not found")
+    response.headers["ETag"] = etag(container.version)
     return container
 
 
+@router.patch("/{container_id}/subtree/archive", response_model=ContainerSubtreeResult)
+async def archive_subtree(
+    container_id: UUID, db: DbSession, if_match: IfMatch
+) -> ContainerSubtreeResult:
+    service = ContainerService(db)
+    result = await service.archive_subtree(container_id, if_match)
+    if not result:
+        raise HTTPException(status_code=404, detail="Container not found")
+    return result
+
+
 @router.delete("/{container_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_container(container_id: UUID, db: DbSession) -> None:
+async def delete_container(container_id: UUID, db: DbSession, if_match: IfMatch) -> None:
     service = ContainerService(db)
-    deleted = await service.delete_container(container_id)
+    deleted = await service.delete_container(container_id, if_match)
     if not deleted:
         raise HTTPException(status_code=404, detail="Container not found")
+
+
+@router.delete("/{container_id}/subtree", response_model=ContainerSubtreeResult)
+async def delete_subtree(
+    container_id: UUID, db: DbSession, if_match: IfMatch
+) -> ContainerSubtreeResult:
+    service = ContainerService(db)
+    result = await service.delete_subtree(container_id, if_match)
+    if not result:
+        raise HTTPException(status_code=404, detail="Container not found")
+    return result
@@ -0,0 +1,84 @@
+from typing import Annotated, Any
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+
+from app.api.deps import DbSession
+from app.models.document import Document, DocumentChunk
+from app.schemas.document import DocumentChunkResponse, DocumentResponse
+from app.services.document_service import DocumentService
+from app.services.upload_stream import UploadRejectedError
+
+router = APIRouter()
+
+Limit = Annotated[int, Query(ge=1, le=500)]
+Offset = Annotated[int, Query(ge=0)]
+
+# The body is parsed as it streams in rather than by FastAPI, so describe it by hand
+_UPLOAD_BODY: dict[str, Any] = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"],
+                }
+            }
+        },
+    }
+}
+
+
+@router.post(
+    "",
+    response_model=DocumentResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=_UPLOAD_BODY,
+)
+async def upload_document(request: Request, response: Response, db: DbSession) -> Document:
+    service = DocumentService(db)
+    try:
+        document, created = await service.upload(
+            request.stream(), request.headers.get("content-type", "")
+        )
+    except UploadRejectedError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=str(exc)) from exc
+    if not created:
+        response.status_code = status.HTTP_200_OK
+    return document
+
+
+@router.get("", response_model=list[DocumentResponse])
+async def list_documents(db: DbSession, limit: Limit = 50, offset: Offset = 0) -> list[Document]:
+    service = DocumentService(db)
+    return await service.list_documents(limit, offset)
+
+
+@router.get("/{document_id}", response_model=DocumentResponse)
+async def get_document(document_id: UUID, db: DbSession) -> Document:
+    service = DocumentService(db)
+    document = await service.get_document(document_id)
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return document
+
+
+@router.get("/{document_id}/chunks", response_model=list[DocumentChunkResponse])
+async def list_document_chunks(
+    document_id: UUID, db: DbSession, offset: Offset = 0, limit: Limit = 50
+) -> list[DocumentChunk]:
+    service = DocumentService(db)
+    chunks = await service.list_chunks(document_id, offset, limit)
+    if chunks is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return chunks
+
+
+@router.delete("/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_document(document_id: UUID, db: DbSession) -> None:
+    service = DocumentService(db)
+    deleted = await service.delete_document(document_id)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Document not found")
@@ -0,0 +1,21 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Header, Query
+from fastapi.responses import StreamingResponse
+
+from app.models.change import ChangeEntity
+from app.services.broadcaster import change_broadcaster
+
+router = APIRouter()
+
+
+@router.get("", response_class=StreamingResponse)
+async def stream_events(
+    kinds: Annotated[list[ChangeEntity] | None, Query()] = None,
+    last_event_id: Annotated[int | None, Header(ge=0)] = None,
+) -> StreamingResponse:
+    return StreamingResponse(
+        change_broadcaster.stream(kinds, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,38 @@
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Query
+
+from app.api.deps import DbSession
+from app.schemas.highlight import HighlightedNote, HighlightPage
+from app.services.highlight_service import HighlightService
+
+router = APIRouter()
+
+Layer = Annotated[int | None, Query(ge=2, le=3)]
+Limit = Annotated[int, Query(ge=1, le=500)]
+
+
+@router.get("", response_model=HighlightPage)
+async def list_highlights(
+    db: DbSession,
+    layer: Layer = None,
+    container_id: UUID | None = None,
+    note_id: UUID | None = None,
+    after: int | None = None,
+    limit: Limit = 100,
+) -> HighlightPage:
+    service = HighlightService(db)
+    return await service.list_highlights(layer, container_id, note_id, after, limit)
+
+
+@router.get("/notes", response_model=list[HighlightedNote])
+async def list_highlighted_notes(
+    db: DbSession,
+    layer: Layer = None,
+    container_id: UUID | None = None,
+    limit: Limit = 100,
+    offset: Annotated[int, Query(ge=0)] = 0,
+) -> list[HighlightedNote]:
+    service = HighlightService(db)
+    return await service.list_highlighted_notes(layer, container_id, limit, offset)
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+
+from app.api.deps import DbSession
+from app.schemas.job import CpuTaskStats, JobQueueStatus
+from app.services.cpu_pool import cpu_pool
+from app.services.job_service import JobService
+
+router = APIRouter()
+
+
+@router.get("", response_model=JobQueueStatus)
+async def get_job_status(db: DbSession) -> JobQueueStatus:
+    service = JobService(db)
+    return await service.status()
+
+
+@router.get("/cpu-pool", response_model=list[CpuTaskStats])
+async def get_cpu_pool_stats() -> list[CpuTaskStats]:
+    return cpu_pool.stats()
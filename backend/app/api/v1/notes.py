@@ -1,79 +1,216 @@
+from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, Response, status
 
-from app.api.deps import DbSession
+from app.api.deps import DbSession, IfMatch, etag
 from app.models.note import Note
+from app.schemas.duplicate import DuplicateCluster
 from app.schemas.note import (
+    NoteBatch,
     NoteCreate,
+    NoteDistilled,
+    NoteField,
     NoteHighlightsUpdate,
     NoteMoveRequest,
     NoteResponse,
     NoteUpdate,
+    NoteWithTags,
+    RelatedNote,
 )
+from app.schemas.revision import NoteRevisionContent, NoteRevisionInfo, RevisionStorageStats
+from app.schemas.tag import NoteTagsUpdate
+from app.services.dedup_service import DedupService
 from app.services.note_service import NoteService
+from app.services.related_service import RelatedNotesService
+from app.services.revision_service import RevisionService
+from app.services.tag_service import TagService
 
 router = APIRouter()
 
 
 @router.post("", response_model=NoteResponse, status_code=status.HTTP_201_CREATED)
-async def create_note(note_in: NoteCreate, db: DbSession) -> Note:
+async def create_note(note_in: NoteCreate, db: DbSession, response: Response) -> Note:
     service = NoteService(db)
-    return await service.create_note(note_in)
+    note = await service.create_note(note_in)
+    response.headers["ETag"] = etag(note.version)
+    return note
 
 
-@router.get("", response_model=list[NoteResponse])
+@router.get("", response_model=list[NoteWithTags])
 async def list_notes(
     db: DbSession,
     container_id: UUID | None = None,
     stage: str | None = None,
     q: str | None = None,
+    tags_all: Annotated[list[str] | None, Query()] = None,
+    tags_any: Annotated[list[str] | None, Query()] = None,
+    tags_none: Annotated[list[str] | None, Query()] = None,
 ) -> list[Note]:
     service = NoteService(db)
-    return await service.list_notes(container_id=container_id, stage=stage, q=q)
+    return await service.list_notes(
+        container_id=container_id,
+        stage=stage,
+        q=q,
+        tags_all=tags_all,
+        tags_any=tags_any,
+        tags_none=tags_none,
+    )
+
+
+@router.get("/distilled", response_model=list[NoteDistilled])
+async def list_distilled(
+    db: DbSession,
+    container_id: UUID | None = None,
+    stage: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=500)] = 100,
+    offset: Annotated[int, Query(ge=0)] = 0,
+) -> list[NoteDistilled]:
+    service = NoteService(db)
+    return await service.list_distilled(container_id, stage, limit, offset)
 
 
-@router.get("/{note_id}", response_model=NoteResponse)
-async def get_note(note_id: UUID, db: DbSession) -> Note:
+@router.get("/batch", response_model=NoteBatch)
+async def get_notes_batch(
+    db: DbSession,
+    ids: Annotated[list[UUID], Query(min_length=1, max_length=100)],
+    fields: Annotated[list[NoteField] | None, Query()] = None,
+) -> NoteBatch:
     service = NoteService(db)
-    note = await service.get_note(note_id)
+    return await service.get_notes_batch(ids, fields)
+
+
+@router.get("/duplicates", response_model=list[DuplicateCluster])
+async def list_duplicate_clusters(db: DbSession) -> list[DuplicateCluster]:
+    service = DedupService(db)
+    return await service.list_clusters()
+
+
+@router.get("/revisions/stats", response_model=RevisionStorageStats)
+async def get_revision_storage(db: DbSession) -> RevisionStorageStats:
+    service = RevisionService(db)
+    return await service.storage_stats()
+
+
+@router.get("/{note_id}", response_model=NoteWithTags)
+async def get_note(note_id: UUID, db: DbSession, response: Response) -> Note:
+    service = NoteService(db)
+    note = await service.get_note_with_tags(note_id)
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
+    response.headers["ETag"] = etag(note.version)
+    return note
+
+
+@router.get("/{note_id}/distilled", response_model=NoteDistilled)
+async def get_distilled(note_id: UUID, db: DbSession) -> NoteDistilled:
+    service = NoteService(db)
+    distilled = await service.get_distilled(note_id)
+    if not distilled:
+        raise HTTPException(status_code=404, detail="Note not found")
+    return distilled
+
+
+@router.get("/{note_id}/related", response_model=list[RelatedNote])
+async def get_related(
+    note_id: UUID,
+    db: DbSession,
+    limit: Annotated[int, Query(ge=1, le=50)] = 10,
+    exclude_same_container: bool = False,
+) -> list[RelatedNote]:
+    service = RelatedNotesService(db)
+    related = await service.get_related(note_id, limit, exclude_same_container)
+    if related is None:
+        raise HTTPException(status_code=404, detail="Note not found")
+    return related
+
+
+@router.get("/{note_id}/revisions", response_model=list[NoteRevisionInfo])
+async def list_revisions(note_id: UUID, db: DbSession) -> list[NoteRevisionInfo]:
+    service = RevisionService(db)
+    revisions = await service.list_revisions(note_id)
+    if revisions is None:
+        raise HTTPException(status_code=404, detail="Note not found")
+    return revisions
+
+
+@router.get("/{note_id}/revisions/{revision}", response_model=NoteRevisionContent)
+async def get_revision(note_id: UUID, revision: int, db: DbSession) -> NoteRevisionContent:
+    service = RevisionService(db)
+    content = await service.get_revision(note_id, revision)
+    if not content:
+        raise HTTPException(status_code=404, detail="Revision not found")
+    return content
+
+
+@router.post("/{note_id}/revisions/{revision}/restore", response_model=NoteResponse)
+async def restore_revision(
+    note_id: UUID, revision: int, db: DbSession, if_match: IfMatch, response: Response
+) -> Note:
+    service = NoteService(db)
+    note = await service.restore_revision(note_id, revision, if_match)
+    if not note:
+        raise HTTPException(status_code=404, detail="Revision not found")
+    response.headers["ETag"] = etag(note.version)
     return note
 
 
 @router.put("/{note_id}", response_model=NoteResponse)
-async def update_note(note_id: UUID, note_in: NoteUpdate, db: DbSession) -> Note:
+async def update_note(
+    note_id: UUID, note_in: NoteUpdate, db: DbSession, if_match: IfMatch, response: Response
+) -> Note:
     service = NoteService(db)
-    note = await service.update_note(note_id, note_in)
+    note = await service.update_note(note_id, note_in, if_match)
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
+    response.headers["ETag"] = etag(note.version)
     return note
 
 
 @router.patch("/{note_id}/move", response_model=NoteResponse)
-async def move_note(note_id: UUID, move_request: NoteMoveRequest, db: DbSession) -> Note:
+async def move_note(
+    note_id: UUID,
+    move_request: NoteMoveRequest,
+    db: DbSession,
+    if_match: IfMatch,
+    response: Response,
+) -> Note:
     service = NoteService(db)
-    note = await service.move_to_container(note_id, move_request.container_id)
+    note = await service.move_to_container(note_id, move_request.container_id, if_match)
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
+    response.headers["ETag"] = etag(note.version)
     return note
 
 
 @router.patch("/{note_id}/highlights", response_model=NoteResponse)
 async def update_highlights(
-    note_id: UUID, highlights_in: NoteHighlightsUpdate, db: DbSession
+    note_id: UUID,
+    highlights_in: NoteHighlightsUpdate,
+    db: DbSession,
+    if_match: IfMatch,
+    response: Response,
 ) -> Note:
     service = NoteService(db)
-    note = await service.update_highlights(note_id, highlights_in)
+    note = await service.update_highlights(note_id, highlights_in, if_match)
+    if not note:
+        raise HTTPException(status_code=404, detail="Note not found")
+    response.headers["ETag"] = etag(note.version)
+    return note
+
+
+@router.put("/{note_id}/tags", response_model=NoteWithTags)
+async def set_note_tags(note_id: UUID, tags_in: NoteTagsUpdate, db: DbSession) -> Note:
+    service = TagService(db)
+    note = await service.set_note_tags(note_id, tags_in.tags)
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
     return note
 
 
 @router.delete("/{note_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_note(note_id: UUID, db: DbSession) -> None:
+async def delete_note(note_id: UUID, db: DbSession, if_match: IfMatch) -> None:
     service = NoteService(db)
-    deleted = await service.delete_note(note_id)
+    deleted = await service.delete_note(note_id, if_match)
     if not deleted:
         raise HTTPException(status_code=404, detail="Note not found")
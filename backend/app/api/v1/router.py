@@ -1,9 +1,31 @@
 from fastapi import APIRouter
 
-from app.api.v1 import containers, notes, search
+from app.api.v1 import (
+    autocomplete,
+    changes,
+    coalescing,
+    containers,
+    documents,
+    events,
+    highlights,
+    jobs,
+    notes,
+    search,
+    startup,
+    tags,
+)
 
 api_router = APIRouter()
 
 api_router.include_router(notes.router, prefix="/notes", tags=["notes"])
 api_router.include_router(containers.router, prefix="/containers", tags=["containers"])
+api_router.include_router(documents.router, prefix="/documents", tags=["documents"])
+api_router.include_router(highlights.router, prefix="/highlights", tags=["highlights"])
+api_router.include_router(tags.router, prefix="/tags", tags=["tags"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+api_router.include_router(changes.router, prefix="/changes", tags=["changes"])
+api_router.include_router(events.router, prefix="/events", tags=["events"])
+api_router.include_router(autocomplete.router, prefix="/autocomplete", tags=["autocomplete"])
+api_router.include_router(coalescing.router, prefix="/coalescing", tags=["coalescing"])
+api_router.include_router(startup.router, prefix="/startup", tags=["startup"])
 api_router.include_router(search.router, tags=["search"])
@@ -1,26 +1,94 @@
-from fastapi import APIRouter
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
 
 from app.api.deps import DbSession
-from app.models.note import Note
+from app.models.container import ContainerType
+from app.models.note import CodeStage, Note
+from app.schemas.filing import FilingModelStats, InboxSuggestions
 from app.schemas.note import NoteResponse
+from app.schemas.search import (
+    ChunkEmbeddingStats,
+    FacetedSearchResponse,
+    HybridSearchOptions,
+    SearchHit,
+    SearchMode,
+)
+from app.services.embedding_service import EmbeddingService
+from app.services.filing_service import FilingService
 from app.services.search_service import SearchService
 
 router = APIRouter()
 
 
 @router.get("/inbox", response_model=list[NoteResponse])
-async def get_inbox(db: DbSession) -> list[Note]:
+async def get_inbox(db: DbSession) -> list[NoteResponse]:
     service = SearchService(db)
-    return await service.get_inbox()
+    return await service.get_inbox_coalesced()
+
+
+@router.get("/inbox/suggestions", response_model=list[InboxSuggestions])
+async def get_inbox_suggestions(
+    db: DbSession,
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    top: Annotated[int, Query(ge=1, le=10)] = 3,
+) -> list[InboxSuggestions]:
+    service = FilingService(db)
+    return await service.suggest_inbox(limit, offset, top)
+
+
+@router.get("/inbox/suggestions/stats", response_model=FilingModelStats)
+async def get_filing_model_stats(db: DbSession) -> FilingModelStats:
+    service = FilingService(db)
+    return await service.stats()
 
 
 @router.get("/search", response_model=list[NoteResponse])
-async def search_notes(q: str, db: DbSession) -> list[Note]:
+async def search_notes(
+    q: str,
+    db: DbSession,
+    hybrid: Annotated[HybridSearchOptions, Depends()],
+    mode: SearchMode = SearchMode.KEYWORD,
+    limit: Annotated[int | None, Query(ge=1, le=200)] = None,
+) -> list[Note]:
+    service = SearchService(db)
+    return await service.search(q, mode, hybrid, limit)
+
+
+@router.get("/search/snippets", response_model=list[SearchHit])
+async def search_snippets(
+    q: str,
+    db: DbSession,
+    hybrid: Annotated[HybridSearchOptions, Depends()],
+    mode: SearchMode = SearchMode.KEYWORD,
+    limit: Annotated[int, Query(ge=1, le=200)] = 20,
+) -> list[SearchHit]:
+    service = SearchService(db)
+    return await service.search_snippets(q, mode, hybrid, limit)
+
+
+@router.get("/search/embeddings", response_model=ChunkEmbeddingStats)
+async def get_embedding_stats(db: DbSession) -> ChunkEmbeddingStats:
+    service = EmbeddingService(db)
+    return await service.chunk_stats()
+
+
+@router.get("/search/faceted", response_model=FacetedSearchResponse)
+async def search_faceted(
+    q: str,
+    db: DbSession,
+    stage: CodeStage | None = None,
+    container_type: ContainerType | None = None,
+    container_id: UUID | None = None,
+    tag: Annotated[list[str] | None, Query()] = None,
+) -> FacetedSearchResponse:
     service = SearchService(db)
-    return await service.search_notes(q)
+    return await service.search_faceted(q, stage, container_type, container_id, tag)
 
 
 @router.get("/recent", response_model=list[NoteResponse])
-async def get_recent(db: DbSession, limit: int = 20) -> list[Note]:
+async def get_recent(db: DbSession, limit: int = 20) -> list[NoteResponse]:
     service = SearchService(db)
-    return await service.get_recent(limit=limit)
+    return await service.get_recent_coalesced(limit=limit)
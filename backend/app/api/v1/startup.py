@@ -0,0 +1,13 @@
+from fastapi import APIRouter, HTTPException, Request
+
+from app.schemas.startup import StartupReport
+
+router = APIRouter()
+
+
+@router.get("", response_model=StartupReport)
+async def get_startup_report(request: Request) -> StartupReport:
+    report: StartupReport | None = getattr(request.app.state, "startup_report", None)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Startup report not available")
+    return report
@@ -0,0 +1,29 @@
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, status
+
+from app.api.deps import DbSession
+from app.schemas.tag import TagAssignRequest, TagAssignResult, TagWithCount
+from app.services.tag_service import TagService
+
+router = APIRouter()
+
+
+@router.get("", response_model=list[TagWithCount])
+async def list_tags(db: DbSession) -> list[TagWithCount]:
+    service = TagService(db)
+    return await service.list_tags_with_counts()
+
+
+@router.post("/assign", response_model=TagAssignResult)
+async def assign_tags(assign_in: TagAssignRequest, db: DbSession) -> TagAssignResult:
+    service = TagService(db)
+    return await service.assign_tags(assign_in.note_ids, assign_in.tags)
+
+
+@router.delete("/{tag_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_tag(tag_id: UUID, db: DbSession) -> None:
+    service = TagService(db)
+    deleted = await service.delete_tag(tag_id)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Tag not found")
@@ -12,5 +12,90 @@ class Settings(BaseSettings):
     DEBUG: bool = True
     CORS_ORIGINS: list[str] = ["http://localhost:5173"]
 
+    # Faceted search keeps each query's matched note IDs so follow-up filters skip the scan
+    SEARCH_CACHE_TTL_SECONDS: float = 60.0
+    SEARCH_CACHE_MAX_ENTRIES: int = 128
+    SEARCH_CACHE_MAX_IDS: int = 10_000
+
+    # Length of the match-centred excerpt returned by /search/snippets
+    SEARCH_SNIPPET_CHARS: int = 200
+
+    # Fuzzy search: minimum trigram similarity of a word match and of a note's mean score
+    FUZZY_SIMILARITY_THRESHOLD: float = 0.3
+
+    # Semantic search: local embedder and in-process IVF vector index
+    EMBEDDER: str = "hashing"
+    EMBEDDING_DIM: int = 384
+    VECTOR_IVF_MIN_SIZE: int = 4096
+    VECTOR_IVF_NPROBE: int = 8
+    SEMANTIC_MIN_SCORE: float = 0.1
+    HYBRID_RRF_K: int = 60
+
+    # Notes are embedded as chunks cached by content hash, so an edit only re-embeds the chunks
+    # it touched. Paragraphs are packed into chunks of at most NOTE_CHUNK_MAX_CHARS, ending past
+    # NOTE_CHUNK_MIN_CHARS after a paragraph whose own hash marks a boundary
+    NOTE_CHUNK_MIN_CHARS: int = 500
+    NOTE_CHUNK_MAX_CHARS: int = 2000
+
+    # Related notes: stored top-k neighbour lists, refreshed around each changed note
+    RELATED_TOP_K: int = 20
+    RELATED_CANDIDATE_POOL: int = 200
+
+    # Inbox filing suggestions: nearest container centroid of filed notes' embeddings
+    FILING_MIN_SCORE: float = 0.1
+
+    # Near-duplicate detection: MinHash over word shingles, LSH with BANDS x (PERM/BANDS) rows
+    DEDUP_NUM_PERM: int = 128
+    DEDUP_BANDS: int = 16
+    DEDUP_SHINGLE_SIZE: int = 3
+    DEDUP_THRESHOLD: float = 0.8
+    # Signature backfills this large are computed in the CPU pool
+    DEDUP_PROCESS_MIN_BATCH: int = 512
+
+    # Background jobs for derived data (run in-process, queued in the jobs table)
+    JOB_CONCURRENCY: int = 4
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: float = 2.0
+    JOB_POLL_INTERVAL_SECONDS: float = 30.0
+    JOB_SHUTDOWN_GRACE_SECONDS: float = 5.0
+
+    # Process pool for CPU-bound text work; texts below the inline limit skip the round trip
+    CPU_POOL_WORKERS: int | None = None
+    CPU_POOL_START_METHOD: str = "spawn"
+    CPU_POOL_INLINE_MAX_CHARS: int = 50_000
+    CPU_POOL_SHM_MIN_BYTES: int = 1 << 20
+    CPU_POOL_MAX_PAYLOAD_BYTES: int = 64 << 20
+    CPU_POOL_CHUNK_BYTES: int = 4 << 20
+    CPU_POOL_SLOW_TASK_SECONDS: float = 1.0
+
+    # Startup warm-up: open pooled connections, build route models and compile hot queries.
+    # Optionally prebuild the OpenAPI schema (~200 ms, only /docs needs it) and read up to
+    # PREFETCH_MAX_BYTES of the SQLite file into the OS page cache (0 disables)
+    WARMUP_ENABLED: bool = True
+    WARMUP_POOL_CONNECTIONS: int = 2
+    WARMUP_OPENAPI: bool = False
+    WARMUP_PREFETCH_MAX_BYTES: int = 0
+
+    # Note revision history: a full snapshot every SNAPSHOT_INTERVAL revisions (or when a
+    # delta would be no smaller), deltas between. Keeps the newest RETENTION_COUNT
+    # revisions per note, and drops those older than RETENTION_DAYS (0 keeps all)
+    REVISION_SNAPSHOT_INTERVAL: int = 16
+    REVISION_RETENTION_COUNT: int = 100
+    REVISION_RETENTION_DAYS: int = 0
+
+    # Document uploads: streamed to STORAGE_DIR under their SHA-256, up to MAX_BYTES, then read
+    # back READ_BLOCK_BYTES at a time and split into ~CHUNK_CHARS chunks that repeat the last
+    # CHUNK_OVERLAP_CHARS of the previous one, inserted CHUNK_INSERT_BATCH rows at a time
+    DOCUMENT_STORAGE_DIR: str = "./documents"
+    DOCUMENT_MAX_BYTES: int = 512 << 20
+    DOCUMENT_READ_BLOCK_BYTES: int = 1 << 20
+    DOCUMENT_CHUNK_CHARS: int = 2000
+    DOCUMENT_CHUNK_OVERLAP_CHARS: int = 200
+    DOCUMENT_CHUNK_INSERT_BATCH: int = 500
+
+    # Server-sent change events: idle heartbeat and per-client buffer before a resync
+    SSE_HEARTBEAT_SECONDS: float = 15.0
+    SSE_CLIENT_QUEUE_SIZE: int = 256
+
 
 settings = Settings()
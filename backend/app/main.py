@@ -1,18 +1,61 @@
+import logging
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from app.api.deps import etag
 from app.api.v1.router import api_router
 from app.config import settings
+from app.database import async_session_maker, engine
+from app.services.autocomplete_service import AutocompleteService, autocomplete_index
+from app.services.concurrency import VersionConflictError
+from app.services.cpu_pool import cpu_pool
+from app.services.embedding_service import EmbeddingService
+from app.services.job_service import BACKFILL_SIGNATURES, TRAIN_FILING, JobService, job_runner
+from app.services.warmup_service import StartupTimer, warm_up
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     # Startup
+    timer = StartupTimer()
+    with timer.phase("cpu_pool"):
+        await cpu_pool.start()
+    with timer.phase("indexes"):
+        async with async_session_maker() as session:
+            await EmbeddingService(session).ensure_index()
+            await AutocompleteService(session).ensure_index()
+            # Notes stored before dedup existed are signed, and the filing
+            # classifier trained, in the background
+            await JobService(session).enqueue(BACKFILL_SIGNATURES)
+            await JobService(session).enqueue(TRAIN_FILING)
+            await session.commit()
+    stats = autocomplete_index.stats()
+    logger.info(
+        "Autocomplete index: %d labels, %d keys, ~%d KiB",
+        stats.entries,
+        stats.keys,
+        stats.approx_bytes // 1024,
+    )
+    if settings.WARMUP_ENABLED:
+        await warm_up(app, engine, async_session_maker, timer)
+    with timer.phase("job_runner"):
+        await job_runner.start()
+    app.state.startup_report = report = timer.report(warmed_up=settings.WARMUP_ENABLED)
+    logger.info(
+        "Startup took %.0f ms (%s)",
+        report.total_ms,
+        ", ".join(f"{phase.name} {phase.ms:.0f} ms" for phase in report.phases),
+    )
     yield
     # Shutdown
+    await job_runner.stop(grace=settings.JOB_SHUTDOWN_GRACE_SECONDS)
+    await cpu_pool.stop()
 
 
 app = FastAPI(
@@ -28,6 +71,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+
+@app.exception_handler(VersionConflictError)
+async def version_conflict_handler(request: Request, exc: VersionConflictError) -> JSONResponse:
+    # 412 when the client's If-Match was stale; 409 when an unconditional write lost a race
+    status_code = 412 if exc.expected_version is not None else 409
+    headers = {"ETag": etag(exc.current_version)} if exc.current_version is not None else None
+    return JSONResponse({"detail": str(exc)}, status_code=status_code, headers=headers)
+
+
 app.include_router(api_router, prefix="/api/v1")
@@ -1,12 +1,40 @@
+from app.models.change import Change, ChangeEntity, ChangeOp
 from app.models.container import Container, ContainerType
+from app.models.document import Document, DocumentChunk, DocumentFormat
+from app.models.embedding import ChunkEmbedding, NoteChunk, NoteEmbedding
+from app.models.highlight import Highlight
+from app.models.job import Job, JobStatus
+from app.models.neighbor import NoteNeighbor
 from app.models.note import CodeStage, Note
+from app.models.revision import NoteRevision, RevisionKind
+from app.models.signature import NoteLshBucket, NoteSignature
 from app.models.tag import Tag, note_tags
+from app.models.trigram import NoteTerm, TermTrigram
 
 __all__ = [
+    "Change",
+    "ChangeEntity",
+    "ChangeOp",
+    "ChunkEmbedding",
     "CodeStage",
     "Container",
     "ContainerType",
+    "Document",
+    "DocumentChunk",
+    "DocumentFormat",
+    "Highlight",
+    "Job",
+    "JobStatus",
     "Note",
+    "NoteChunk",
+    "NoteEmbedding",
+    "NoteLshBucket",
+    "NoteNeighbor",
+    "NoteRevision",
+    "NoteSignature",
+    "NoteTerm",
+    "RevisionKind",
     "Tag",
+    "TermTrigram",
     "note_tags",
 ]
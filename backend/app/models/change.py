@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import DateTime, Index, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class ChangeEntity(str, Enum):
+    NOTE = "note"
+    CONTAINER = "container"
+    TAG = "tag"
+    # A note's highlight set; entity_id is the note ID
+    HIGHLIGHTS = "highlights"
+
+
+class ChangeOp(str, Enum):
+    UPSERT = "upsert"
+    DELETE = "delete"
+
+
+class Change(Base):
+    """Latest change per entity, ordered by a sequence number clients sync from.
+
+    Older rows for an entity are replaced, so the feed stays one row per live
+    entity or tombstone. AUTOINCREMENT keeps SQLite from reusing a removed
+    maximum ``seq``, which would hide a change from clients already past it.
+    """
+
+    __tablename__ = "changes"
+    __table_args__ = (
+        Index("ix_changes_entity_entity_id", "entity", "entity_id"),
+        {"sqlite_autoincrement": True},
+    )
+
+    seq: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    entity: Mapped[ChangeEntity]
+    entity_id: Mapped[uuid.UUID]
+    op: Mapped[ChangeOp] = mapped_column(default=ChangeOp.UPSERT)
+    changed_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, LargeBinary, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class NoteEmbedding(Base):
+    """Stored embedding vector for a note (float32 bytes), the source the ANN index loads from."""
+
+    __tablename__ = "note_embeddings"
+
+    note_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("notes.id", ondelete="CASCADE"), primary_key=True
+    )
+    model: Mapped[str] = mapped_column(String(100))
+    dim: Mapped[int]
+    vector: Mapped[bytes] = mapped_column(LargeBinary)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+
+class NoteChunk(Base):
+    """A span of a note's text, keyed by the hash its cached embedding is stored under."""
+
+    __tablename__ = "note_chunks"
+
+    note_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("notes.id", ondelete="CASCADE"), primary_key=True
+    )
+    ordinal: Mapped[int] = mapped_column(primary_key=True)
+    # Character offset and length of the chunk in the embedded note text
+    start_offset: Mapped[int]
+    length: Mapped[int]
+    content_hash: Mapped[str] = mapped_column(String(64), index=True)
+
+
+class ChunkEmbedding(Base):
+    """Embedding cache: one vector (float32 bytes) per model and chunk content hash."""
+
+    __tablename__ = "chunk_embeddings"
+
+    model: Mapped[str] = mapped_column(String(100), primary_key=True)
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    vector: Mapped[bytes] = mapped_column(LargeBinary)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
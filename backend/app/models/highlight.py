@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import ForeignKey, Index, Integer, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class Highlight(Base):
+    """One progressive-summarization range, normalized out of ``Note.highlights``.
+
+    ``Note.highlights`` stays the editor's source of truth; these rows mirror it so
+    highlights can be queried across notes without loading note bodies.
+    """
+
+    __tablename__ = "highlights"
+    __table_args__ = (Index("ix_highlights_layer_note_id", "layer", "note_id"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    note_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("notes.id", ondelete="CASCADE"), index=True
+    )
+    start: Mapped[int]
+    end: Mapped[int]
+    layer: Mapped[int]
+    text: Mapped[str] = mapped_column(Text)
+    # Set when a content edit touched the highlighted text itself
+    stale: Mapped[bool] = mapped_column(default=False)
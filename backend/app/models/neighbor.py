@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import Float, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class NoteNeighbor(Base):
+    """Precomputed top-k similar notes for a note, ordered by ``rank``."""
+
+    __tablename__ = "note_neighbors"
+    # The primary key serves "neighbours of X"; this index serves "who lists X"
+    __table_args__ = (Index("ix_note_neighbors_neighbor_id", "neighbor_id"),)
+
+    note_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("notes.id", ondelete="CASCADE"), primary_key=True
+    )
+    neighbor_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("notes.id", ondelete="CASCADE"), primary_key=True
+    )
+    rank: Mapped[int]
+    score: Mapped[float] = mapped_column(Float)
@@ -7,7 +7,7 @@ from typing import TYPE_CHECKING, Any
 
 from sqlalchemy import DateTime, ForeignKey, String, Text, func
 from sqlalchemy.dialects.sqlite import JSON
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, declared_attr, mapped_column, relationship
 
 from app.database import Base
 from app.models.tag import note_tags
@@ -33,17 +33,31 @@ class Note(Base):
     content_html: Mapped[str | None] = mapped_column(Text, nullable=True)
     highlights: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
     executive_summary: Mapped[str | None] = mapped_column(Text, nullable=True)
-    source_url: Mapped[str | None] = mapped_column(String(2000), nullable=True)
+    # Cached L2/L3 excerpt text, rebuilt whenever highlights or content change
+    l2_excerpt: Mapped[str | None] = mapped_column(Text, nullable=True)
+    l3_excerpt: Mapped[str | None] = mapped_column(Text, nullable=True)
+    highlights_stale: Mapped[bool] = mapped_column(default=False)
+    source_url: Mapped[str | None] = mapped_column(String(2000), nullable=True, index=True)
     source_type: Mapped[str | None] = mapped_column(String(50), nullable=True)
     container_id: Mapped[uuid.UUID | None] = mapped_column(
         ForeignKey("containers.id"), nullable=True
     )
+    # Earlier note this one was flagged as a near-duplicate of at capture time
+    duplicate_of_id: Mapped[uuid.UUID | None] = mapped_column(
+        ForeignKey("notes.id", ondelete="SET NULL"), nullable=True
+    )
     code_stage: Mapped[CodeStage] = mapped_column(default=CodeStage.CAPTURE)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=func.now(), onupdate=func.now(), nullable=False
     )
     captured_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
+    version: Mapped[int] = mapped_column(server_default="1")
+
+    @declared_attr.directive
+    def __mapper_args__(cls) -> dict[str, Any]:
+        # Bumps version on every ORM UPDATE, which only matches the row at the version it read
+        return {"version_id_col": cls.__table__.c.version}
 
     # Relationships
     container: Mapped[Container | None] = relationship("Container", back_populates="notes")
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import DateTime, ForeignKey, LargeBinary, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class RevisionKind(str, Enum):
+    # Every revised field in full
+    SNAPSHOT = "snapshot"
+    # Per-field edits against the previous revision
+    DELTA = "delta"
+
+
+class NoteRevision(Base):
+    """A past state of a note's text fields, stored zlib-compressed as a snapshot or a delta.
+
+    ``revision`` is the note's ``version`` when it was recorded, so numbers have
+    gaps where saves in quick succession were recorded as one revision.
+    """
+
+    __tablename__ = "note_revisions"
+
+    note_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("notes.id", ondelete="CASCADE"), primary_key=True
+    )
+    revision: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[RevisionKind]
+    payload: Mapped[bytes] = mapped_column(LargeBinary)
+    # Size of the fields in full, for the storage overhead report
+    full_bytes: Mapped[int]
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
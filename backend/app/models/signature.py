@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import BigInteger, ForeignKey, Index, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class NoteSignature(Base):
+    """MinHash signature of a note's text (uint32 bytes), used to confirm LSH candidates."""
+
+    __tablename__ = "note_signatures"
+
+    note_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("notes.id", ondelete="CASCADE"), primary_key=True
+    )
+    minhash: Mapped[bytes] = mapped_column(LargeBinary)
+
+
+class NoteLshBucket(Base):
+    """One LSH band of a note's signature; notes sharing any (band, bucket) are candidates."""
+
+    __tablename__ = "note_lsh_buckets"
+    # The primary key serves "buckets of X"; this index serves "notes in bucket B"
+    __table_args__ = (Index("ix_note_lsh_buckets_band_bucket", "band", "bucket"),)
+
+    note_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("notes.id", ondelete="CASCADE"), primary_key=True
+    )
+    band: Mapped[int] = mapped_column(primary_key=True)
+    bucket: Mapped[int] = mapped_column(BigInteger)
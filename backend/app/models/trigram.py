@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class NoteTerm(Base):
+    """A distinct lower-cased word in a note's title or content, for fuzzy search."""
+
+    __tablename__ = "note_terms"
+    # The primary key serves "terms of X"; this index serves "notes containing term T"
+    __table_args__ = (Index("ix_note_terms_term", "term"),)
+
+    note_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("notes.id", ondelete="CASCADE"), primary_key=True
+    )
+    term: Mapped[str] = mapped_column(String(32), primary_key=True)
+
+
+class TermTrigram(Base):
+    """One padded trigram of a vocabulary word; the primary key serves "words with trigram G"."""
+
+    __tablename__ = "term_trigrams"
+
+    trigram: Mapped[str] = mapped_column(String(3), primary_key=True)
+    term: Mapped[str] = mapped_column(String(32), primary_key=True)
@@ -1,29 +1,107 @@
+from app.schemas.autocomplete import AutocompleteStats, Suggestion, SuggestionKind
+from app.schemas.change import ChangeEvent, ChangePage, ChangeRecord, WriteConflictStats
 from app.schemas.container import (
     ContainerCreate,
     ContainerResponse,
+    ContainerSubtreeResult,
     ContainerUpdate,
     ContainerWithCount,
     ContainerWithNotes,
 )
+from app.schemas.document import DocumentChunkResponse, DocumentResponse
+from app.schemas.duplicate import DuplicateCluster, DuplicateNote
+from app.schemas.filing import FilingModelStats, FilingSuggestion, InboxSuggestions
+from app.schemas.highlight import HighlightedNote, HighlightPage, HighlightResponse
+from app.schemas.job import CpuTaskStats, JobQueueStatus, JobResponse
 from app.schemas.note import (
     HighlightRange,
+    NoteBatch,
     NoteCreate,
+    NoteDistilled,
+    NoteField,
     NoteHighlightsUpdate,
     NoteMoveRequest,
     NoteResponse,
     NoteUpdate,
+    NoteWithTags,
+    RelatedNote,
+)
+from app.schemas.revision import NoteRevisionContent, NoteRevisionInfo, RevisionStorageStats
+from app.schemas.search import (
+    ChunkEmbeddingStats,
+    FacetCount,
+    FacetedSearchResponse,
+    HybridSearchOptions,
+    SearchFacets,
+    SearchHit,
+    SearchMode,
+    TextSpan,
+)
+from app.schemas.single_flight import SingleFlightStats
+from app.schemas.startup import StartupPhase, StartupReport
+from app.schemas.tag import (
+    NoteTagsUpdate,
+    TagAssignRequest,
+    TagAssignResult,
+    TagResponse,
+    TagWithCount,
 )
 
 __all__ = [
+    "AutocompleteStats",
+    "ChangeEvent",
+    "ChangePage",
+    "ChangeRecord",
+    "ChunkEmbeddingStats",
     "ContainerCreate",
     "ContainerResponse",
+    "ContainerSubtreeResult",
     "ContainerUpdate",
     "ContainerWithCount",
     "ContainerWithNotes",
+    "CpuTaskStats",
+    "DocumentChunkResponse",
+    "DocumentResponse",
+    "DuplicateCluster",
+    "DuplicateNote",
+    "FacetCount",
+    "FacetedSearchResponse",
+    "FilingModelStats",
+    "FilingSuggestion",
+    "HighlightPage",
     "HighlightRange",
+    "HighlightResponse",
+    "HighlightedNote",
+    "HybridSearchOptions",
+    "InboxSuggestions",
+    "JobQueueStatus",
+    "JobResponse",
+    "NoteBatch",
     "NoteCreate",
+    "NoteDistilled",
+    "NoteField",
     "NoteHighlightsUpdate",
     "NoteMoveRequest",
     "NoteResponse",
+    "NoteRevisionContent",
+    "NoteRevisionInfo",
+    "NoteTagsUpdate",
     "NoteUpdate",
+    "NoteWithTags",
+    "RelatedNote",
+    "RevisionStorageStats",
+    "SearchFacets",
+    "SearchHit",
+    "SearchMode",
+    "SingleFlightStats",
+    "StartupPhase",
+    "StartupReport",
+    "Suggestion",
+    "SuggestionKind",
+    "TagAssignRequest",
+    "TagAssignResult",
+    "TagResponse",
+    "TagWithCount",
+    "TextSpan",
+    "WriteConflictStats",
 ]
@@ -0,0 +1,25 @@
+from enum import Enum
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class SuggestionKind(str, Enum):
+    NOTE = "note"
+    CONTAINER = "container"
+    TAG = "tag"
+
+
+class Suggestion(BaseModel):
+    id: UUID
+    kind: SuggestionKind
+    label: str
+
+
+class AutocompleteStats(BaseModel):
+    """Size of the in-memory autocomplete index; ``approx_bytes`` counts shared strings once."""
+
+    loaded: bool
+    entries: int
+    keys: int
+    approx_bytes: int
@@ -0,0 +1,50 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+from app.models.change import ChangeEntity, ChangeOp
+
+
+class ChangeRecord(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    seq: int
+    entity: ChangeEntity
+    entity_id: UUID
+    op: ChangeOp
+    changed_at: datetime
+
+
+class ChangePage(BaseModel):
+    """Changes after a cursor; pass ``next_cursor`` as ``since`` to continue."""
+
+    changes: list[ChangeRecord]
+    next_cursor: int
+    has_more: bool
+
+
+class ChangeEvent(BaseModel):
+    """Pushed to event-stream clients after a change commits; ``seq`` is its change-feed cursor."""
+
+    id: UUID
+    kind: ChangeEntity
+    op: ChangeOp
+    seq: int
+
+
+class WriteConflictStats(BaseModel):
+    """Versioned writes to one entity kind and how many lost to a concurrent writer.
+
+    ``precondition_failed`` writes sent an ``If-Match`` version that was already
+    stale; ``lost_races`` read the current version but another write committed
+    before theirs did.
+    """
+
+    entity: ChangeEntity
+    writes: int
+    conditional: int
+    committed: int
+    precondition_failed: int
+    lost_races: int
+    conflict_rate: float
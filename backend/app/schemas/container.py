@@ -39,6 +39,8 @@ class ContainerResponse(ContainerBase):
     is_active: bool
     created_at: datetime
     updated_at: datetime
+    # Also sent as the ETag; send it back in If-Match to write only over this version
+    version: int
 
 
 class ContainerWithCount(ContainerResponse):
@@ -47,3 +49,14 @@ class ContainerWithCount(ContainerResponse):
 
 class ContainerWithNotes(ContainerResponse):
     notes: list[NoteResponse] = []
+
+
+class ContainerSubtreeResult(BaseModel):
+    """Containers archived or deleted with a subtree, root included, and notes in them.
+
+    On delete, ``notes`` were moved to the inbox; on archive, they stay in place.
+    """
+
+    root_id: UUID
+    containers: int
+    notes: int
@@ -0,0 +1,28 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+from app.models.document import DocumentFormat
+
+
+class DocumentResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    filename: str
+    media_type: str | None
+    format: DocumentFormat
+    sha256: str
+    size_bytes: int
+    char_count: int
+    chunk_count: int
+    created_at: datetime
+
+
+class DocumentChunkResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    ordinal: int
+    start_offset: int
+    content: str
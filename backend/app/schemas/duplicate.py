@@ -0,0 +1,20 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class DuplicateNote(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    title: str
+    source_url: str | None = None
+    captured_at: datetime
+
+
+class DuplicateCluster(BaseModel):
+    """Notes that are near-duplicates of one another or share a source URL, oldest first."""
+
+    size: int
+    notes: list[DuplicateNote]
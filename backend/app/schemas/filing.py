@@ -0,0 +1,29 @@
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.models.container import ContainerType
+
+
+class FilingSuggestion(BaseModel):
+    container_id: UUID
+    container_name: str
+    container_type: ContainerType
+    score: float
+
+
+class InboxSuggestions(BaseModel):
+    """Likely containers for one inbox note, best first; empty when nothing scores high enough."""
+
+    note_id: UUID
+    title: str
+    suggestions: list[FilingSuggestion]
+
+
+class FilingModelStats(BaseModel):
+    """State of the in-memory filing classifier; stale containers await the next training."""
+
+    loaded: bool
+    filed_notes: int
+    containers: int
+    stale_containers: int
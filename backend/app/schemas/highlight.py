@@ -0,0 +1,27 @@
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class HighlightResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    note_id: UUID
+    start: int
+    end: int
+    layer: int
+    text: str
+    stale: bool = False
+
+
+class HighlightPage(BaseModel):
+    items: list[HighlightResponse]
+    next_cursor: int | None = None
+
+
+class HighlightedNote(BaseModel):
+    note_id: UUID
+    title: str
+    container_id: UUID | None = None
+    highlight_count: int
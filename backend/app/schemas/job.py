@@ -0,0 +1,42 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+from app.models.job import JobStatus
+
+
+class JobResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    kind: str
+    note_id: UUID | None = None
+    status: JobStatus
+    attempts: int
+    last_error: str | None = None
+    run_after: datetime
+    created_at: datetime
+
+
+class JobQueueStatus(BaseModel):
+    """Backlog of deferred work; succeeded jobs are removed, so only open work is counted."""
+
+    pending: int = 0
+    running: int = 0
+    failed: int = 0
+    oldest_pending_at: datetime | None = None
+    runner_active: bool
+    in_flight: int
+    recent_failures: list[JobResponse] = []
+
+
+class CpuTaskStats(BaseModel):
+    """Latency of CPU-pool tasks by function, over the most recent calls."""
+
+    name: str
+    count: int
+    p50_ms: float
+    p99_ms: float
+    max_ms: float
+    queue_wait_p99_ms: float
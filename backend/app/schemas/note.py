@@ -1,10 +1,11 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict
 
 from app.models.note import CodeStage
+from app.schemas.tag import TagResponse
 
 
 class NoteBase(BaseModel):
@@ -48,8 +49,70 @@ class NoteResponse(NoteBase):
     content_html: str | None = None
     highlights: dict[str, Any] = {}
     executive_summary: str | None = None
+    highlights_stale: bool = False
+    duplicate_of_id: UUID | None = None
     container_id: UUID | None = None
     code_stage: CodeStage
     created_at: datetime
     updated_at: datetime
     captured_at: datetime
+    # Also sent as the ETag; send it back in If-Match to write only over this version
+    version: int
+
+
+class NoteWithTags(NoteResponse):
+    tags: list[TagResponse] = []
+
+
+NoteField = Literal[
+    "id",
+    "title",
+    "content",
+    "content_html",
+    "source_url",
+    "source_type",
+    "highlights",
+    "executive_summary",
+    "highlights_stale",
+    "duplicate_of_id",
+    "container_id",
+    "code_stage",
+    "created_at",
+    "updated_at",
+    "captured_at",
+    "version",
+    "tags",
+]
+
+
+class NoteBatch(BaseModel):
+    """Found notes in request order, limited to the requested fields, and the IDs that were not."""
+
+    notes: list[dict[str, Any]]
+    not_found: list[UUID]
+
+
+class NoteDistilled(BaseModel):
+    """Progressive-summarization view of a note: cached L2/L3 excerpts, never raw L1 text."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    title: str
+    container_id: UUID | None = None
+    code_stage: CodeStage
+    l2_excerpt: str | None = None
+    l3_excerpt: str | None = None
+    executive_summary: str | None = None
+    highlights_stale: bool = False
+    updated_at: datetime
+
+
+class RelatedNote(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    title: str
+    container_id: UUID | None = None
+    code_stage: CodeStage
+    score: float
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+from app.models.revision import RevisionKind
+
+
+class NoteRevisionInfo(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    revision: int
+    kind: RevisionKind
+    stored_bytes: int
+    full_bytes: int
+    created_at: datetime
+
+
+class NoteRevisionContent(BaseModel):
+    """A note's text fields as they were at ``revision``."""
+
+    revision: int
+    title: str
+    content: str
+    content_html: str | None
+    created_at: datetime
+
+
+class RevisionStorageStats(BaseModel):
+    """Revision store size against keeping every revision as a full uncompressed copy."""
+
+    notes: int
+    revisions: int
+    snapshots: int
+    deltas: int
+    stored_bytes: int
+    full_bytes: int
+    overhead_ratio: float
@@ -0,0 +1,81 @@
+from datetime import datetime
+from enum import Enum
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.models.container import ContainerType
+from app.models.note import CodeStage
+from app.schemas.note import NoteResponse
+
+
+class SearchMode(str, Enum):
+    KEYWORD = "keyword"
+    SEMANTIC = "semantic"
+    HYBRID = "hybrid"
+    FUZZY = "fuzzy"
+
+
+class HybridSearchOptions(BaseModel):
+    """Fusion weights, candidate pool size and pre-fusion filters for hybrid search."""
+
+    keyword_weight: float = Field(default=1.0, ge=0)
+    semantic_weight: float = Field(default=1.0, ge=0)
+    pool_size: int = Field(default=50, ge=1, le=500)
+    stage: CodeStage | None = None
+    container_type: ContainerType | None = None
+    container_id: UUID | None = None
+
+
+class FacetCount(BaseModel):
+    value: str | None
+    label: str | None = None
+    count: int
+
+
+class SearchFacets(BaseModel):
+    code_stage: list[FacetCount] = []
+    container_type: list[FacetCount] = []
+    container: list[FacetCount] = []
+    tag: list[FacetCount] = []
+
+
+class FacetedSearchResponse(BaseModel):
+    total: int
+    results: list[NoteResponse]
+    facets: SearchFacets
+
+
+class TextSpan(BaseModel):
+    start: int
+    end: int
+
+
+class SearchHit(BaseModel):
+    """A search result without the note body: a snippet around the best match instead.
+
+    ``highlights`` are character offsets into ``snippet`` of the matched query terms.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    title: str
+    container_id: UUID | None = None
+    code_stage: CodeStage
+    updated_at: datetime
+    snippet: str
+    highlights: list[TextSpan] = []
+
+
+class ChunkEmbeddingStats(BaseModel):
+    """Note chunks embedded since startup: unchanged by the edit, found in the cache, or new."""
+
+    notes: int
+    chunks: int
+    unchanged: int
+    cache_hits: int
+    embedded: int
+    reuse_rate: float
+    # Vectors in the cache for the current embedding model
+    cached_vectors: int
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+
+class SingleFlightStats(BaseModel):
+    """How often concurrent identical reads shared one query, per read since startup."""
+
+    name: str
+    calls: int
+    executed: int
+    shared: int
+    failed: int
+    coalescing_ratio: float
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+
+class StartupPhase(BaseModel):
+    name: str
+    ms: float
+
+
+class StartupReport(BaseModel):
+    """Wall-clock time of each lifespan startup step, in the order they ran."""
+
+    phases: list[StartupPhase]
+    total_ms: float
+    warmed_up: bool
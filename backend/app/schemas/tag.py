@@ -0,0 +1,31 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class TagResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    name: str
+    created_at: datetime
+
+
+class TagWithCount(TagResponse):
+    note_count: int = 0
+
+
+class NoteTagsUpdate(BaseModel):
+    tags: list[str] = []
+
+
+class TagAssignRequest(BaseModel):
+    note_ids: list[UUID] = Field(min_length=1)
+    tags: list[str] = Field(min_length=1)
+
+
+class TagAssignResult(BaseModel):
+    tags: list[TagResponse]
+    assigned: int
+    missing_note_ids: list[UUID] = []
@@ -1,5 +1,21 @@
+from app.services.change_service import ChangeService
 from app.services.container_service import ContainerService
+from app.services.dedup_service import DedupService
+from app.services.highlight_service import HighlightService
+from app.services.job_service import JobService
 from app.services.note_service import NoteService
+from app.services.related_service import RelatedNotesService
 from app.services.search_service import SearchService
+from app.services.tag_service import TagService
 
-__all__ = ["ContainerService", "NoteService", "SearchService"]
+__all__ = [
+    "ChangeService",
+    "ContainerService",
+    "DedupService",
+    "HighlightService",
+    "JobService",
+    "NoteService",
+    "RelatedNotesService",
+    "SearchService",
+    "TagService",
+]
@@ -0,0 +1,183 @@
+import asyncio
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from collections.abc import Collection, Iterable
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.container import Container
+from app.models.note import Note
+from app.models.tag import Tag
+from app.schemas.autocomplete import AutocompleteStats, Suggestion, SuggestionKind
+
+KEY_CHARS = 32
+SCAN_LIMIT = 1000
+STREAM_BATCH = 1000
+_WORD_START = re.compile(r"\b\w")
+
+Label = tuple[SuggestionKind, UUID, str]
+
+
+class _Entry:
+    __slots__ = ("id", "kind", "label")
+
+    def __init__(self, kind: SuggestionKind, entry_id: UUID, label: str):
+        self.kind = kind
+        self.id = entry_id
+        self.label = label
+
+
+def _keys(label: str) -> list[str]:
+    """One key per word start: the case-folded label from there, cut to ``KEY_CHARS``."""
+    folded = label.casefold()
+    return [
+        sys.intern(folded[match.start() : match.start() + KEY_CHARS])
+        for match in _WORD_START.finditer(folded)
+    ]
+
+
+class AutocompleteIndex:
+    """In-memory prefix index over note titles, container names and tag names.
+
+    Each word start of a label is a key, so "sum" finds "Progressive Summarization".
+    Keys live in one sorted list searched with bisect, next to a parallel list of
+    ``__slots__`` entries shared by all of a label's keys; keys are interned, so
+    labels repeating words share storage. Services update it after each commit.
+    """
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self.loaded = False
+        self._keys: list[str] = []
+        self._owners: list[_Entry] = []
+        self._entries: dict[UUID, _Entry] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self, labels: Iterable[Label]) -> None:
+        """Replace the index contents in one sort (used at startup)."""
+        self.clear()
+        pairs: list[tuple[str, _Entry]] = []
+        for kind, entry_id, label in labels:
+            entry = _Entry(kind, entry_id, sys.intern(label))
+            self._entries[entry_id] = entry
+            pairs.extend((key, entry) for key in _keys(label))
+        pairs.sort(key=lambda pair: pair[0])
+        self._keys = [key for key, _ in pairs]
+        self._owners = [entry for _, entry in pairs]
+        self.loaded = True
+
+    def upsert(self, kind: SuggestionKind, entry_id: UUID, label: str) -> None:
+        existing = self._entries.get(entry_id)
+        if existing is not None:
+            if existing.label == label:
+                return
+            self._unlink(existing)
+        entry = _Entry(kind, entry_id, sys.intern(label))
+        self._entries[entry_id] = entry
+        for key in _keys(label):
+            position = bisect_right(self._keys, key)
+            self._keys.insert(position, key)
+            self._owners.insert(position, entry)
+
+    def remove(self, entry_id: UUID) -> None:
+        entry = self._entries.pop(entry_id, None)
+        if entry is not None:
+            self._unlink(entry)
+
+    def search(
+        self, prefix: str, kinds: Collection[SuggestionKind] | None = None, limit: int = 10
+    ) -> list[Suggestion]:
+        """Labels with a word starting with ``prefix``; whole-label prefixes first, then shortest.
+
+        At most ``SCAN_LIMIT`` keys are weighed, so one-letter prefixes stay cheap.
+        """
+        query = prefix.strip().casefold()
+        if not query:
+            return []
+        probe = query[:KEY_CHARS]
+        position = bisect_left(self._keys, probe)
+        end = min(len(self._keys), position + SCAN_LIMIT)
+        seen: set[UUID] = set()
+        ranked = []
+        for index in range(position, end):
+            if not self._keys[index].startswith(probe):
+                break
+            entry = self._owners[index]
+            if entry.id in seen or (kinds and entry.kind not in kinds):
+                continue
+            folded = entry.label.casefold()
+            if len(query) > KEY_CHARS and query not in folded:
+                continue
+            seen.add(entry.id)
+            ranked.append((not folded.startswith(query), len(entry.label), folded, entry))
+        ranked.sort(key=lambda item: item[:3])
+        return [
+            Suggestion(id=entry.id, kind=entry.kind, label=entry.label)
+            for *_, entry in ranked[:limit]
+        ]
+
+    def stats(self) -> AutocompleteStats:
+        strings = {id(key): key for key in self._keys}
+        strings.update((id(entry.label), entry.label) for entry in self._entries.values())
+        size = (
+            sys.getsizeof(self._keys)
+            + sys.getsizeof(self._owners)
+            + sys.getsizeof(self._entries)
+            + sum(sys.getsizeof(entry) for entry in self._entries.values())
+            + sum(sys.getsizeof(text) for text in strings.values())
+        )
+        return AutocompleteStats(
+            loaded=self.loaded, entries=len(self._entries), keys=len(self._keys), approx_bytes=size
+        )
+
+    def _unlink(self, entry: _Entry) -> None:
+        """Drop the entry's keys; keys it no longer owns are skipped, not searched past."""
+        for key in _keys(entry.label):
+            position = bisect_left(self._keys, key)
+            while position < len(self._keys) and self._keys[position] == key:
+                if self._owners[position] is entry:
+                    del self._keys[position]
+                    del self._owners[position]
+                    break
+                position += 1
+
+
+autocomplete_index = AutocompleteIndex()
+_index_lock = asyncio.Lock()
+
+
+class AutocompleteService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def ensure_index(self) -> None:
+        """Fill the index once per process, streaming labels instead of loading whole rows."""
+        if autocomplete_index.loaded:
+            return
+        async with _index_lock:
+            if autocomplete_index.loaded:
+                return
+            sources = [
+                (SuggestionKind.NOTE, select(Note.id, Note.title)),
+                (SuggestionKind.CONTAINER, select(Container.id, Container.name)),
+                (SuggestionKind.TAG, select(Tag.id, Tag.name)),
+            ]
+            labels: list[Label] = []
+            for kind, stmt in sources:
+                result = await self.db.stream(stmt.execution_options(yield_per=STREAM_BATCH))
+                async for partition in result.partitions():
+                    labels.extend((kind, entry_id, label) for entry_id, label in partition)
+            autocomplete_index.load(labels)
+
+    async def suggest(
+        self, prefix: str, kinds: Collection[SuggestionKind] | None = None, limit: int = 10
+    ) -> list[Suggestion]:
+        await self.ensure_index()
+        return autocomplete_index.search(prefix, kinds, limit)
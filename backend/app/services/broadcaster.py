@@ -0,0 +1,120 @@
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator, Collection, Iterable
+
+from app.config import settings
+from app.models.change import ChangeEntity
+from app.schemas.change import ChangeEvent
+
+logger = logging.getLogger(__name__)
+
+
+def sse_frame(event: str, data: str, event_id: int | None = None) -> str:
+    lines = [] if event_id is None else [f"id: {event_id}"]
+    lines += [f"event: {event}", f"data: {data}"]
+    return "\n".join(lines) + "\n\n"
+
+
+def resync_frame(since: int) -> str:
+    """Tells the client to catch up from ``GET /changes?since=`` before trusting the stream."""
+    return sse_frame("resync", json.dumps({"since": since}))
+
+
+class Subscription:
+    """One client's bounded buffer of committed change events.
+
+    If the client reads slower than changes commit and the buffer fills, its
+    backlog is discarded and it is sent a single ``resync`` instead, so a stalled
+    connection costs at most ``queue_size`` events of memory.
+    """
+
+    def __init__(self, kinds: Collection[ChangeEntity] | None, queue_size: int, since: int):
+        self.kinds = set(kinds) if kinds else None
+        self.last_seq = since
+        self.lagged = False
+        # None marks the point where the backlog was dropped
+        self._queue: asyncio.Queue[ChangeEvent | None] = asyncio.Queue(maxsize=queue_size)
+
+    def offer(self, event: ChangeEvent) -> None:
+        if self.lagged or (self.kinds is not None and event.kind not in self.kinds):
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(None)
+            self.lagged = True
+
+    async def frames(self, heartbeat: float) -> AsyncIterator[str]:
+        """Event-stream frames, with a comment line after ``heartbeat`` idle seconds."""
+        while True:
+            try:
+                event = await asyncio.wait_for(self._queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            if event is None:
+                self.lagged = False
+                yield resync_frame(self.last_seq)
+                continue
+            self.last_seq = event.seq
+            yield sse_frame("change", event.model_dump_json(), event.seq)
+
+
+class ChangeBroadcaster:
+    """Fans committed changes out to connected event-stream clients, in process.
+
+    Subscribers hold no database session or task of their own: an idle client is
+    just a queue, so thousands of open streams cost little. Events are published
+    from the session ``after_commit`` hook, so clients never see a rolled-back write.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: set[Subscription] = set()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(
+        self,
+        kinds: Collection[ChangeEntity] | None = None,
+        since: int = 0,
+        queue_size: int | None = None,
+    ) -> Subscription:
+        subscription = Subscription(kinds, queue_size or settings.SSE_CLIENT_QUEUE_SIZE, since)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def publish(self, events: Iterable[ChangeEvent]) -> None:
+        for event in events:
+            for subscription in self._subscribers:
+                subscription.offer(event)
+
+    async def stream(
+        self,
+        kinds: Collection[ChangeEntity] | None = None,
+        last_event_id: int | None = None,
+        heartbeat: float | None = None,
+    ) -> AsyncIterator[str]:
+        """Frames for one client until it disconnects.
+
+        A reconnecting client sends the last id it saw and is first told to resync
+        from it, covering whatever committed while it was away.
+        """
+        subscription = self.subscribe(kinds, since=last_event_id or 0)
+        try:
+            if last_event_id is not None:
+                yield resync_frame(last_event_id)
+            async for frame in subscription.frames(heartbeat or settings.SSE_HEARTBEAT_SECONDS):
+                yield frame
+        finally:
+            self.unsubscribe(subscription)
+
+
+change_broadcaster = ChangeBroadcaster()
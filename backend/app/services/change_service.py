@@ -0,0 +1,74 @@
+from collections.abc import Iterable
+from uuid import UUID
+
+from sqlalchemy import delete, event, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.change import Change, ChangeEntity, ChangeOp
+from app.schemas.change import ChangeEvent, ChangePage, ChangeRecord
+from app.services.broadcaster import change_broadcaster
+from app.services.single_flight import read_flights
+
+PENDING_EVENTS = "pending_change_events"
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session: Session) -> None:
+    events = session.info.pop(PENDING_EVENTS, None)
+    if events:
+        change_broadcaster.publish(events)
+        read_flights.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop(PENDING_EVENTS, None)
+
+
+class ChangeService:
+    """Writes and pages the change feed clients use for incremental sync.
+
+    Writers call ``record`` before their own commit, so a change is visible in
+    the feed exactly when the mutation is. SQLite serialises writers, so ``seq``
+    order is also commit order and a cursor never skips a late-committing row.
+    The same rows are pushed to event-stream clients once the transaction commits.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def record(
+        self, entity: ChangeEntity, ids: Iterable[UUID], op: ChangeOp = ChangeOp.UPSERT
+    ) -> None:
+        """Stage changes for ``ids``, replacing any earlier rows for the same entities."""
+        unique_ids = list(dict.fromkeys(ids))
+        if not unique_ids:
+            return
+        await self.db.execute(
+            delete(Change).where(Change.entity == entity, Change.entity_id.in_(unique_ids))
+        )
+        # Returning each row's entity_id with its seq lets SQLite batch the rows into a
+        # few multi-VALUES statements; matching seqs by parameter order needs one per row
+        result = await self.db.execute(
+            insert(Change).returning(Change.entity_id, Change.seq),
+            [{"entity": entity, "entity_id": entity_id, "op": op} for entity_id in unique_ids],
+        )
+        events = [
+            ChangeEvent(id=entity_id, kind=entity, op=op, seq=seq)
+            for entity_id, seq in sorted(result.tuples(), key=lambda row: row[1])
+        ]
+        if events:
+            self.db.info.setdefault(PENDING_EVENTS, []).extend(events)
+
+    async def list_changes(self, since: int = 0, limit: int = 500) -> ChangePage:
+        result = await self.db.execute(
+            select(Change).where(Change.seq > since).order_by(Change.seq).limit(limit + 1)
+        )
+        rows = list(result.scalars().all())
+        changes = [ChangeRecord.model_validate(row) for row in rows[:limit]]
+        return ChangePage(
+            changes=changes,
+            next_cursor=changes[-1].seq if changes else since,
+            has_more=len(rows) > limit,
+        )
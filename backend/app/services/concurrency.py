@@ -0,0 +1,85 @@
+from collections import Counter, defaultdict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.models.change import ChangeEntity
+from app.schemas.change import WriteConflictStats
+
+
+class VersionConflictError(Exception):
+    """A write to a versioned row that another write got to first.
+
+    ``expected_version`` is the client's ``If-Match`` version, or None for an
+    unconditional write that lost a race; ``current_version`` is the row's
+    version when it is known.
+    """
+
+    def __init__(
+        self, entity: ChangeEntity, expected_version: int | None, current_version: int | None
+    ):
+        super().__init__(f"{entity.value.capitalize()} was modified by another request")
+        self.entity = entity
+        self.expected_version = expected_version
+        self.current_version = current_version
+
+
+class WriteConflictCounters:
+    """Counts versioned writes per entity kind and how many of them conflicted."""
+
+    def __init__(self) -> None:
+        self._counters: defaultdict[ChangeEntity, Counter[str]] = defaultdict(Counter)
+
+    def record(self, entity: ChangeEntity, outcome: str, conditional: bool) -> None:
+        counters = self._counters[entity]
+        counters["writes"] += 1
+        counters["conditional"] += conditional
+        counters[outcome] += 1
+
+    def clear(self) -> None:
+        self._counters.clear()
+
+    def stats(self) -> list[WriteConflictStats]:
+        return [
+            WriteConflictStats(
+                entity=entity,
+                writes=counters["writes"],
+                conditional=counters["conditional"],
+                committed=counters["committed"],
+                precondition_failed=counters["precondition_failed"],
+                lost_races=counters["lost_races"],
+                conflict_rate=(counters["precondition_failed"] + counters["lost_races"])
+                / counters["writes"],
+            )
+            for entity, counters in sorted(self._counters.items())
+            if counters["writes"]
+        ]
+
+
+write_conflicts = WriteConflictCounters()
+
+
+@asynccontextmanager
+async def versioned_write(
+    db: AsyncSession, entity: ChangeEntity, version: int, expected_version: int | None
+) -> AsyncIterator[None]:
+    """Guard a read-modify-write of a row read at ``version``, committed inside the block.
+
+    Fails before any change when the client expected another version. The ORM
+    then writes the row with ``UPDATE ... WHERE id = :id AND version = :version``;
+    if a concurrent write committed first, that matches nothing and the whole
+    transaction is rolled back, instead of overwriting the other write.
+    """
+    conditional = expected_version is not None
+    if conditional and expected_version != version:
+        write_conflicts.record(entity, "precondition_failed", conditional)
+        raise VersionConflictError(entity, expected_version, version)
+    try:
+        yield
+    except StaleDataError:
+        await db.rollback()
+        write_conflicts.record(entity, "lost_races", conditional)
+        raise VersionConflictError(entity, expected_version, None) from None
+    write_conflicts.record(entity, "committed", conditional)
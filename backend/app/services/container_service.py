@@ -1,17 +1,34 @@
+from collections.abc import Sequence
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import CTE, ColumnElement, delete, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.exc import StaleDataError
 
+from app.models.change import ChangeEntity, ChangeOp
 from app.models.container import Container, ContainerType
-from app.models.note import Note
-from app.schemas.container import ContainerCreate, ContainerUpdate, ContainerWithCount
+from app.models.note import CodeStage, Note
+from app.schemas.autocomplete import SuggestionKind
+from app.schemas.container import (
+    ContainerCreate,
+    ContainerSubtreeResult,
+    ContainerUpdate,
+    ContainerWithCount,
+)
+from app.services.autocomplete_service import autocomplete_index
+from app.services.change_service import ChangeService
+from app.services.concurrency import versioned_write
+from app.services.filing_service import filing_model
+from app.services.job_service import TRAIN_FILING, JobService, job_runner
+from app.services.single_flight import coalesced_read
 
 
 class ContainerService:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.changes = ChangeService(db)
+        self.jobs = JobService(db)
 
     async def create_container(self, container_in: ContainerCreate) -> Container:
         container = Container(
@@ -23,7 +40,10 @@ class ContainerService:
             status=container_in.status,
         )
         self.db.add(container)
+        await self.db.flush()
+        await self.changes.record(ChangeEntity.CONTAINER, [container.id])
         await self.db.commit()
+        autocomplete_index.upsert(SuggestionKind.CONTAINER, container.id, container.name)
         await self.db.refresh(container)
         return container
 
@@ -63,44 +83,169 @@ class ContainerService:
                 "status": container.status,
                 "created_at": container.created_at,
                 "updated_at": container.updated_at,
+                "version": container.version,
                 "note_count": note_count,
             }
             containers_with_counts.append(ContainerWithCount(**container_dict))
 
         return containers_with_counts
 
+    async def list_containers_coalesced(self) -> list[ContainerWithCount]:
+        """``list_containers_with_counts``, shared by identical concurrent requests."""
+        return await coalesced_read(
+            self.db, "containers", (), lambda db: ContainerService(db).list_containers_with_counts()
+        )
+
     async def update_container(
-        self, container_id: UUID, container_in: ContainerUpdate
+        self,
+        container_id: UUID,
+        container_in: ContainerUpdate,
+        expected_version: int | None = None,
     ) -> Container | None:
         container = await self.get_container(container_id)
         if not container:
             return None
 
-        update_data = container_in.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(container, field, value)
+        async with versioned_write(
+            self.db, ChangeEntity.CONTAINER, container.version, expected_version
+        ):
+            update_data = container_in.model_dump(exclude_unset=True)
+            for field, value in update_data.items():
+                setattr(container, field, value)
 
-        await self.db.commit()
+            await self.changes.record(ChangeEntity.CONTAINER, [container.id])
+            await self.db.commit()
+        autocomplete_index.upsert(SuggestionKind.CONTAINER, container.id, container.name)
         await self.db.refresh(container)
         return container
 
-    async def archive_container(self, container_id: UUID) -> Container | None:
+    async def archive_container(
+        self, container_id: UUID, expected_version: int | None = None
+    ) -> Container | None:
         container = await self.get_container(container_id)
         if not container:
             return None
 
-        container.type = ContainerType.ARCHIVE
-        container.is_active = False
+        async with versioned_write(
+            self.db, ChangeEntity.CONTAINER, container.version, expected_version
+        ):
+            container.type = ContainerType.ARCHIVE
+            container.is_active = False
 
-        await self.db.commit()
+            await self.changes.record(ChangeEntity.CONTAINER, [container.id])
+            await self.db.commit()
         await self.db.refresh(container)
         return container
 
-    async def delete_container(self, container_id: UUID) -> bool:
+    async def delete_container(
+        self, container_id: UUID, expected_version: int | None = None
+    ) -> bool:
         container = await self.get_container(container_id)
         if not container:
             return False
 
-        await self.db.delete(container)
-        await self.db.commit()
+        async with versioned_write(
+            self.db, ChangeEntity.CONTAINER, container.version, expected_version
+        ):
+            # Deleting the container detaches its notes and child containers
+            notes = await self.db.execute(select(Note.id).where(Note.container_id == container_id))
+            children = await self.db.execute(
+                select(Container.id).where(Container.parent_id == container_id)
+            )
+            await self.changes.record(ChangeEntity.NOTE, notes.scalars().all())
+            await self.changes.record(ChangeEntity.CONTAINER, children.scalars().all())
+            await self.changes.record(ChangeEntity.CONTAINER, [container_id], ChangeOp.DELETE)
+            await self.jobs.enqueue(TRAIN_FILING)
+            await self.db.delete(container)
+            await self.db.commit()
+        autocomplete_index.remove(container_id)
+        filing_model.drop_containers([container_id])
+        job_runner.wake()
         return True
+
+    async def archive_subtree(
+        self, container_id: UUID, expected_version: int | None = None
+    ) -> ContainerSubtreeResult | None:
+        """Archive a container and all its descendants with one UPDATE; notes stay in place."""
+        root = await self.get_container(container_id)
+        if not root:
+            return None
+
+        async with versioned_write(self.db, ChangeEntity.CONTAINER, root.version, expected_version):
+            archived = await self.db.execute(
+                update(Container)
+                .where(Container.id.in_(select(_subtree(container_id).c.id)))
+                .where(_root_unchanged(root))
+                .values(type=ContainerType.ARCHIVE, is_active=False, version=Container.version + 1)
+                .returning(Container.id)
+            )
+            container_ids = _require_root(container_id, archived.scalars().all())
+            notes = await self.db.scalar(
+                select(func.count())
+                .select_from(Note)
+                .where(Note.container_id.in_(select(_subtree(container_id).c.id)))
+            )
+            await self.changes.record(ChangeEntity.CONTAINER, container_ids)
+            await self.db.commit()
+        return ContainerSubtreeResult(
+            root_id=container_id, containers=len(container_ids), notes=notes or 0
+        )
+
+    async def delete_subtree(
+        self, container_id: UUID, expected_version: int | None = None
+    ) -> ContainerSubtreeResult | None:
+        """Delete a container and all its descendants, moving their notes to the inbox.
+
+        One UPDATE moves the notes and one DELETE removes the containers, both
+        selecting the subtree with the same recursive CTE.
+        """
+        root = await self.get_container(container_id)
+        if not root:
+            return None
+
+        async with versioned_write(self.db, ChangeEntity.CONTAINER, root.version, expected_version):
+            moved = await self.db.execute(
+                update(Note)
+                .where(Note.container_id.in_(select(_subtree(container_id).c.id)))
+                .values(container_id=None, code_stage=CodeStage.CAPTURE, version=Note.version + 1)
+                .returning(Note.id)
+            )
+            note_ids = moved.scalars().all()
+            deleted = await self.db.execute(
+                delete(Container)
+                .where(Container.id.in_(select(_subtree(container_id).c.id)))
+                .where(_root_unchanged(root))
+                .returning(Container.id)
+            )
+            container_ids = _require_root(container_id, deleted.scalars().all())
+            await self.changes.record(ChangeEntity.NOTE, note_ids)
+            await self.changes.record(ChangeEntity.CONTAINER, container_ids, ChangeOp.DELETE)
+            await self.jobs.enqueue(TRAIN_FILING)
+            await self.db.commit()
+        for deleted_id in container_ids:
+            autocomplete_index.remove(deleted_id)
+        filing_model.drop_containers(container_ids)
+        job_runner.wake()
+        return ContainerSubtreeResult(
+            root_id=container_id, containers=len(container_ids), notes=len(note_ids)
+        )
+
+
+def _subtree(root_id: UUID) -> CTE:
+    """IDs of a container and all its descendants, as a recursive CTE.
+
+    UNION rather than UNION ALL, so a ``parent_id`` cycle ends the recursion.
+    """
+    tree = select(Container.id).where(Container.id == root_id).cte("subtree", recursive=True)
+    return tree.union(select(Container.id).join(tree, Container.parent_id == tree.c.id))
+
+
+def _root_unchanged(root: Container) -> ColumnElement[bool]:
+    # The set-based statements bypass the ORM's version check, so the root's is inlined
+    return or_(Container.id != root.id, Container.version == root.version)
+
+
+def _require_root(root_id: UUID, ids: Sequence[UUID]) -> Sequence[UUID]:
+    if root_id not in ids:
+        raise StaleDataError(f"Container {root_id} was changed by a concurrent write")
+    return ids
@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, ParamSpec, TypeVar
+
+from app.config import settings
+from app.schemas.job import CpuTaskStats
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+LATENCY_WINDOW = 1024
+
+
+class PayloadTooLargeError(ValueError):
+    """Raised when arguments would be too large to pickle to a worker process."""
+
+
+def _timed(fn: Callable[..., R], *args: Any, **kwargs: Any) -> tuple[R, float, float]:
+    """Worker-side wrapper: returns the result plus wall-clock start and end times."""
+    started = time.time()
+    result = fn(*args, **kwargs)
+    return result, started, time.time()
+
+
+def _call_on_bytes(fn: Callable[[memoryview], R], data: bytes) -> R:
+    return fn(memoryview(data))
+
+
+def _call_on_shared(fn: Callable[[memoryview], R], name: str, size: int) -> R:
+    """Worker-side: attach to a shared-memory block and hand ``fn`` a view of it."""
+    block = SharedMemory(name=name)
+    try:
+        view = _buffer(block)[:size]
+        try:
+            return fn(view)
+        finally:
+            view.release()
+    finally:
+        block.close()
+
+
+def _buffer(block: SharedMemory) -> memoryview:
+    if block.buf is None:
+        raise RuntimeError(f"Shared memory block {block.name} is closed")
+    return block.buf
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+def payload_size(value: object) -> int:
+    """Rough pickled size of text and buffer arguments (other objects count as zero)."""
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, bytes | bytearray | memoryview):
+        return len(value)
+    if isinstance(value, list | tuple):
+        return sum(payload_size(item) for item in value)
+    return 0
+
+
+class _Latencies:
+    def __init__(self) -> None:
+        self.count = 0
+        self.total: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.queue_wait: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+
+class CpuPool:
+    """Shared process pool for CPU-bound work, started and stopped by the app lifespan.
+
+    ``run`` pickles its arguments to a worker; ``run_on_buffer`` passes large byte
+    payloads through shared memory instead; ``map_texts`` splits a text batch into
+    chunks bounded by size. Outside the lifespan (scripts, tests) work runs in a
+    thread so the event loop still stays free. Every task records its queue wait
+    and total latency per function.
+    """
+
+    def __init__(self) -> None:
+        self._executor: ProcessPoolExecutor | None = None
+        self._latencies: dict[str, _Latencies] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._executor is not None
+
+    async def start(self, workers: int | None = None) -> None:
+        if self._executor is not None:
+            return
+        workers = workers or settings.CPU_POOL_WORKERS or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(settings.CPU_POOL_START_METHOD),
+        )
+        # Spawn every worker now so the first request does not pay process start-up
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(self._executor, _warm_up) for _ in range(workers))
+        )
+
+    async def stop(self) -> None:
+        if self._executor is None:
+            return
+        executor, self._executor = self._executor, None
+        await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    async def run(self, fn: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+        """Run a picklable, module-level ``fn`` in a worker process."""
+        size = payload_size(args) + payload_size(tuple(kwargs.values()))
+        if size > settings.CPU_POOL_MAX_PAYLOAD_BYTES:
+            raise PayloadTooLargeError(
+                f"{_name(fn)} payload is {size} bytes; use run_on_buffer or map_texts"
+            )
+        return await self._submit(_name(fn), partial(_timed, fn, *args, **kwargs))
+
+    async def run_on_buffer(self, fn: Callable[[memoryview], R], data: bytes) -> R:
+        """Run ``fn`` on ``data``, via shared memory once it exceeds ``CPU_POOL_SHM_MIN_BYTES``.
+
+        ``fn`` must not keep a reference to the view after returning.
+        """
+        if self._executor is None or len(data) < settings.CPU_POOL_SHM_MIN_BYTES:
+            return await self._submit(_name(fn), partial(_timed, _call_on_bytes, fn, data))
+
+        block = SharedMemory(create=True, size=max(1, len(data)))
+        try:
+            _buffer(block)[: len(data)] = data
+            return await self._submit(
+                _name(fn), partial(_timed, _call_on_shared, fn, block.name, len(data))
+            )
+        finally:
+            block.close()
+            block.unlink()
+
+    async def map_texts(self, fn: Callable[[list[str]], list[R]], texts: Sequence[str]) -> list[R]:
+        """Apply a batch function to ``texts`` in chunks of at most ``CPU_POOL_CHUNK_BYTES``."""
+        chunks: list[list[str]] = [[]]
+        chunk_size = 0
+        for text in texts:
+            if chunks[-1] and chunk_size + len(text) > settings.CPU_POOL_CHUNK_BYTES:
+                chunks.append([])
+                chunk_size = 0
+            chunks[-1].append(text)
+            chunk_size += len(text)
+        results = await asyncio.gather(*(self.run(fn, chunk) for chunk in chunks if chunk))
+        return [item for chunk_result in results for item in chunk_result]
+
+    def stats(self) -> list[CpuTaskStats]:
+        return [
+            CpuTaskStats(
+                name=name,
+                count=latencies.count,
+                p50_ms=_percentile(latencies.total, 50),
+                p99_ms=_percentile(latencies.total, 99),
+                max_ms=max(latencies.total, default=0.0) * 1000,
+                queue_wait_p99_ms=_percentile(latencies.queue_wait, 99),
+            )
+            for name, latencies in sorted(self._latencies.items())
+        ]
+
+    async def _submit(self, name: str, call: Callable[[], tuple[R, float, float]]) -> R:
+        submitted = time.time()
+        if self._executor is None:
+            result, started, finished = await asyncio.to_thread(call)
+        else:
+            loop = asyncio.get_running_loop()
+            result, started, finished = await loop.run_in_executor(self._executor, call)
+
+        latencies = self._latencies.setdefault(name, _Latencies())
+        latencies.count += 1
+        latencies.total.append(time.time() - submitted)
+        latencies.queue_wait.append(max(0.0, started - submitted))
+        if finished - started > settings.CPU_POOL_SLOW_TASK_SECONDS:
+            logger.warning("CPU task %s took %.2fs", name, finished - started)
+        return result
+
+
+def _name(fn: Callable[..., Any]) -> str:
+    while isinstance(fn, partial):
+        fn = fn.func
+    return getattr(fn, "__qualname__", repr(fn))
+
+
+def _percentile(samples: Sequence[float], percent: int) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))
+    return ordered[index] * 1000
+
+
+cpu_pool = CpuPool()
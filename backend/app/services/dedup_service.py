@@ -0,0 +1,314 @@
+import re
+import zlib
+from collections import defaultdict
+from functools import lru_cache, partial
+from uuid import UUID
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import delete, func, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.note import Note
+from app.models.signature import NoteLshBucket, NoteSignature
+from app.schemas.duplicate import DuplicateCluster, DuplicateNote
+from app.services.cpu_pool import cpu_pool
+
+Signature = npt.NDArray[np.uint32]
+
+_WORD = re.compile(r"\w+")
+# Universal hashing (a * x + b) mod p with a, b < 2**31 and x < 2**32 never overflows uint64
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+_SHINGLE_CHUNK = 4096
+
+
+def shingles(text: str, size: int) -> set[str]:
+    """Lower-cased word ``size``-grams; shorter texts collapse to a single shingle."""
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+@lru_cache
+def _permutations(num_perm: int) -> tuple[npt.NDArray[np.uint64], npt.NDArray[np.uint64]]:
+    rng = np.random.default_rng(1)
+    a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, 1 << 31, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash_signature(text: str, num_perm: int, shingle_size: int) -> Signature | None:
+    """MinHash of the text's shingle set, or None when the text has no words."""
+    features = shingles(text, shingle_size)
+    if not features:
+        return None
+    hashes = np.fromiter(
+        (zlib.crc32(feature.encode()) for feature in features),
+        dtype=np.uint64,
+        count=len(features),
+    )
+    a, b = _permutations(num_perm)
+    signature = np.full(num_perm, _MAX_HASH, dtype=np.uint64)
+    # Chunked so a very long note never materialises a num_perm x shingles matrix at once
+    for start in range(0, hashes.size, _SHINGLE_CHUNK):
+        chunk = hashes[start : start + _SHINGLE_CHUNK]
+        permuted = (np.outer(a, chunk) + b[:, None]) % _PRIME & _MAX_HASH
+        np.minimum(signature, permuted.min(axis=1), out=signature)
+    return signature.astype(np.uint32)
+
+
+def compute_signatures(texts: list[str], num_perm: int, shingle_size: int) -> list[bytes]:
+    """Signature bytes per text (empty for wordless text); a process-pool entry point."""
+    signatures = []
+    for text in texts:
+        signature = minhash_signature(text, num_perm, shingle_size)
+        signatures.append(b"" if signature is None else signature.tobytes())
+    return signatures
+
+
+def signature_from_buffer(data: memoryview, num_perm: int, shingle_size: int) -> bytes:
+    """Signature bytes of UTF-8 text held in a (possibly shared) buffer."""
+    return compute_signatures([str(data, "utf-8")], num_perm, shingle_size)[0]
+
+
+def band_buckets(signature: Signature, bands: int) -> list[int]:
+    return [zlib.crc32(band.tobytes()) for band in np.split(signature, bands)]
+
+
+def estimated_jaccard(first: Signature, second: Signature) -> float:
+    return float(np.mean(first == second))
+
+
+class DedupService:
+    """Flags near-duplicate notes with MinHash signatures and an LSH bucket table.
+
+    A note's signature is split into ``DEDUP_BANDS`` bands; notes sharing any band
+    bucket are candidates, and candidates are confirmed by comparing signatures.
+    A capture-time check is therefore a handful of indexed bucket lookups.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.num_perm = settings.DEDUP_NUM_PERM
+        self.bands = settings.DEDUP_BANDS
+        self.shingle_size = settings.DEDUP_SHINGLE_SIZE
+
+    async def signature(self, text: str) -> Signature | None:
+        """Sign inline for typical notes; very long ones go to the CPU pool."""
+        if len(text) <= settings.CPU_POOL_INLINE_MAX_CHARS:
+            return minhash_signature(text, self.num_perm, self.shingle_size)
+        minhash = await cpu_pool.run_on_buffer(
+            partial(signature_from_buffer, num_perm=self.num_perm, shingle_size=self.shingle_size),
+            text.encode(),
+        )
+        return _from_bytes(minhash) if minhash else None
+
+    async def find_duplicate(
+        self, note_id: UUID, source_url: str | None, signature: Signature | None
+    ) -> UUID | None:
+        """Earliest note with the same source URL, else the closest near-duplicate."""
+        if source_url:
+            result = await self.db.execute(
+                select(Note.id)
+                .where(Note.source_url == source_url, Note.id != note_id)
+                .order_by(Note.captured_at)
+                .limit(1)
+            )
+            same_source = result.scalar_one_or_none()
+            if same_source is not None:
+                return same_source
+        if signature is None:
+            return None
+        matches = await self.near_duplicates(note_id, signature)
+        return matches[0][0] if matches else None
+
+    async def near_duplicates(
+        self, note_id: UUID, signature: Signature
+    ) -> list[tuple[UUID, float]]:
+        """Notes whose estimated Jaccard similarity reaches ``DEDUP_THRESHOLD``, best first."""
+        keys = list(enumerate(band_buckets(signature, self.bands)))
+        candidates = select(NoteLshBucket.note_id).where(
+            tuple_(NoteLshBucket.band, NoteLshBucket.bucket).in_(keys),
+            NoteLshBucket.note_id != note_id,
+        )
+        result = await self.db.execute(
+            select(NoteSignature.note_id, NoteSignature.minhash).where(
+                NoteSignature.note_id.in_(candidates)
+            )
+        )
+        scored = [
+            (row.note_id, estimated_jaccard(signature, _from_bytes(row.minhash)))
+            for row in result.all()
+        ]
+        matches = [match for match in scored if match[1] >= settings.DEDUP_THRESHOLD]
+        return sorted(matches, key=lambda match: match[1], reverse=True)
+
+    async def write_signature(
+        self, note_id: UUID, signature: Signature | None, is_new: bool = False
+    ) -> None:
+        """Stage a note's signature and bucket rows; the caller commits."""
+        if not is_new:
+            await self.delete_signature(note_id)
+        await self._insert([(note_id, b"" if signature is None else signature.tobytes())])
+
+    async def delete_signature(self, note_id: UUID) -> None:
+        await self.db.execute(delete(NoteLshBucket).where(NoteLshBucket.note_id == note_id))
+        await self.db.execute(delete(NoteSignature).where(NoteSignature.note_id == note_id))
+
+    async def forget_duplicate_links(self, note_id: UUID) -> list[UUID]:
+        """Clear ``duplicate_of_id`` on notes that pointed at a note being deleted."""
+        result = await self.db.execute(
+            update(Note)
+            .where(Note.duplicate_of_id == note_id)
+            # A bulk UPDATE skips the ORM's version bump, so it is done here
+            .values(duplicate_of_id=None, version=Note.version + 1)
+            .returning(Note.id)
+        )
+        return list(result.scalars().all())
+
+    async def ensure_signatures(self) -> int:
+        """Sign every note that has no signature yet and commit; returns how many were signed.
+
+        Runs as a background job queued at startup, never on a read. Large batches,
+        such as notes imported before dedup existed, are split across the CPU pool.
+        """
+        result = await self.db.execute(
+            select(Note.id, Note.title, Note.content).where(
+                Note.id.not_in(select(NoteSignature.note_id))
+            )
+        )
+        missing = result.all()
+        if not missing:
+            return 0
+
+        texts = [f"{row.title}\n{row.content}" for row in missing]
+        if len(texts) >= settings.DEDUP_PROCESS_MIN_BATCH:
+            signatures = await cpu_pool.map_texts(
+                partial(compute_signatures, num_perm=self.num_perm, shingle_size=self.shingle_size),
+                texts,
+            )
+        else:
+            signatures = compute_signatures(texts, self.num_perm, self.shingle_size)
+        await self._insert([(row.id, sig) for row, sig in zip(missing, signatures, strict=True)])
+        await self.db.commit()
+        return len(missing)
+
+    async def list_clusters(self) -> list[DuplicateCluster]:
+        """Group the vault into clusters of near-duplicate or same-source notes.
+
+        Notes not yet signed by the startup backfill job are left out until it runs.
+        """
+        parent: dict[UUID, UUID] = {}
+
+        def find(note_id: UUID) -> UUID:
+            root = parent.setdefault(note_id, note_id)
+            while root != parent[root]:
+                parent[root] = parent[parent[root]]
+                root = parent[root]
+            return root
+
+        def union(first: UUID, second: UUID) -> None:
+            parent[find(first)] = find(second)
+
+        shared = (
+            select(NoteLshBucket.band, NoteLshBucket.bucket)
+            .group_by(NoteLshBucket.band, NoteLshBucket.bucket)
+            .having(func.count() > 1)
+            .subquery()
+        )
+        result = await self.db.execute(
+            select(NoteLshBucket.band, NoteLshBucket.bucket, NoteLshBucket.note_id).join(
+                shared,
+                (NoteLshBucket.band == shared.c.band) & (NoteLshBucket.bucket == shared.c.bucket),
+            )
+        )
+        buckets: dict[tuple[int, int], list[UUID]] = defaultdict(list)
+        for band, bucket, note_id in result.all():
+            buckets[(band, bucket)].append(note_id)
+
+        if buckets:
+            candidate_ids = {note_id for members in buckets.values() for note_id in members}
+            signatures = await self._signatures(candidate_ids)
+            for members in buckets.values():
+                # Verify each member against one representative per cluster already
+                # found in the bucket: linear while a bucket holds few clusters, and
+                # members unlike the first still pair with each other
+                representatives: list[UUID] = []
+                for note_id in members:
+                    matched = False
+                    for representative in representatives:
+                        if find(representative) == find(note_id) or (
+                            estimated_jaccard(signatures[representative], signatures[note_id])
+                            >= settings.DEDUP_THRESHOLD
+                        ):
+                            union(note_id, representative)
+                            matched = True
+                    if not matched:
+                        representatives.append(note_id)
+
+        repeated_urls = (
+            select(Note.source_url)
+            .where(Note.source_url.is_not(None))
+            .group_by(Note.source_url)
+            .having(func.count() > 1)
+        )
+        result = await self.db.execute(
+            select(Note.source_url, Note.id).where(Note.source_url.in_(repeated_urls))
+        )
+        first_by_url: dict[str, UUID] = {}
+        for source_url, note_id in result.all():
+            union(note_id, first_by_url.setdefault(source_url, note_id))
+
+        groups: dict[UUID, list[UUID]] = defaultdict(list)
+        for note_id in parent:
+            groups[find(note_id)].append(note_id)
+        clustered = [members for members in groups.values() if len(members) > 1]
+        if not clustered:
+            return []
+
+        result = await self.db.execute(
+            select(Note.id, Note.title, Note.source_url, Note.captured_at).where(
+                Note.id.in_([note_id for members in clustered for note_id in members])
+            )
+        )
+        notes = {row.id: DuplicateNote.model_validate(row) for row in result.all()}
+        clusters = [
+            DuplicateCluster(
+                size=len(members),
+                notes=sorted((notes[m] for m in members), key=lambda note: note.captured_at),
+            )
+            for members in clustered
+        ]
+        return sorted(clusters, key=lambda c: (-c.size, c.notes[0].captured_at))
+
+    async def _signatures(self, note_ids: set[UUID]) -> dict[UUID, Signature]:
+        result = await self.db.execute(
+            select(NoteSignature.note_id, NoteSignature.minhash).where(
+                NoteSignature.note_id.in_(note_ids)
+            )
+        )
+        return {row.note_id: _from_bytes(row.minhash) for row in result.all()}
+
+    async def _insert(self, signed: list[tuple[UUID, bytes]]) -> None:
+        """Insert signature and bucket rows with one executemany each."""
+        if not signed:
+            return
+        await self.db.execute(
+            insert(NoteSignature),
+            [{"note_id": note_id, "minhash": minhash} for note_id, minhash in signed],
+        )
+        bucket_rows = [
+            {"note_id": note_id, "band": band, "bucket": bucket}
+            for note_id, minhash in signed
+            if minhash
+            for band, bucket in enumerate(band_buckets(_from_bytes(minhash), self.bands))
+        ]
+        if bucket_rows:
+            await self.db.execute(insert(NoteLshBucket), bucket_rows)
+
+
+def _from_bytes(minhash: bytes) -> Signature:
+    return np.frombuffer(minhash, dtype=np.uint32)
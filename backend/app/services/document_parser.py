@@ -0,0 +1,244 @@
+import codecs
+import re
+from html.parser import HTMLParser
+from pathlib import PurePath
+from typing import NamedTuple, Protocol
+
+from app.models.document import DocumentFormat
+
+_EXTENSIONS = {
+    ".txt": DocumentFormat.TEXT,
+    ".text": DocumentFormat.TEXT,
+    ".log": DocumentFormat.TEXT,
+    ".csv": DocumentFormat.TEXT,
+    ".md": DocumentFormat.MARKDOWN,
+    ".markdown": DocumentFormat.MARKDOWN,
+    ".html": DocumentFormat.HTML,
+    ".htm": DocumentFormat.HTML,
+}
+_MEDIA_TYPES = {
+    "text/markdown": DocumentFormat.MARKDOWN,
+    "text/x-markdown": DocumentFormat.MARKDOWN,
+    "text/html": DocumentFormat.HTML,
+    "application/xhtml+xml": DocumentFormat.HTML,
+}
+# Bytes of the upload kept for sniffing its format
+SNIFF_BYTES = 512
+
+_WHITESPACE = re.compile(r"\s+")
+# Tags whose content is not document text
+_SKIPPED_TAGS = frozenset({"script", "style", "template", "noscript", "head"})
+_PARAGRAPH_TAGS = frozenset(
+    {"p", "div", "section", "article", "blockquote", "pre", "table", "ul", "ol", "hr"}
+    | {f"h{level}" for level in range(1, 7)}
+)
+_LINE_TAGS = frozenset({"br", "li", "tr", "dt", "dd"})
+
+
+class UnsupportedFormatError(ValueError):
+    pass
+
+
+class TextChunk(NamedTuple):
+    # Character offset in the extracted text
+    start_offset: int
+    content: str
+
+
+def detect_format(filename: str, media_type: str | None, head: bytes) -> DocumentFormat:
+    """The format to parse an upload as, from its extension, declared type or first bytes."""
+    if head.startswith(b"%PDF-"):
+        raise UnsupportedFormatError(
+            "PDF files are not supported; upload a text, Markdown or HTML export"
+        )
+    if b"\x00" in head:
+        raise UnsupportedFormatError("Binary files are not supported; upload UTF-8 text")
+    by_extension = _EXTENSIONS.get(PurePath(filename).suffix.lower())
+    if by_extension is not None:
+        return by_extension
+    media_type = (media_type or "").partition(";")[0].strip().lower()
+    if media_type in _MEDIA_TYPES:
+        return _MEDIA_TYPES[media_type]
+    sniffed = head.lstrip().lower()
+    if sniffed.startswith((b"<!doctype html", b"<html")):
+        return DocumentFormat.HTML
+    return DocumentFormat.TEXT
+
+
+class TextExtractor(Protocol):
+    def feed(self, text: str) -> str: ...
+
+    def close(self) -> str: ...
+
+
+class PlainTextExtractor:
+    """Text and Markdown are chunked as written."""
+
+    def feed(self, text: str) -> str:
+        return text
+
+    def close(self) -> str:
+        return ""
+
+
+class HtmlTextExtractor(HTMLParser):
+    """Visible text of an HTML stream, with block elements as line and paragraph breaks.
+
+    Whitespace is collapsed as a browser would, except inside ``<pre>``.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self._out: list[str] = []
+        self._skip_depth = 0
+        self._pre_depth = 0
+        self._pending_break = 0
+        self._started = False
+        self._ends_in_space = False
+
+    def feed(self, text: str) -> str:  # type: ignore[override]
+        super().feed(text)
+        return self._take()
+
+    def close(self) -> str:  # type: ignore[override]
+        super().close()
+        return self._take()
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == "pre":
+            self._pre_depth += 1
+        self._break_for(tag)
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._break_for(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag == "pre":
+            self._pre_depth = max(self._pre_depth - 1, 0)
+        self._break_for(tag)
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_depth:
+            return
+        collapse = not self._pre_depth
+        text = _WHITESPACE.sub(" ", data) if collapse else data
+        # Text arrives in pieces, so a run of whitespace may span two calls
+        if self._pending_break or not self._started or (collapse and self._ends_in_space):
+            text = text.lstrip()
+        if not text:
+            return
+        if self._started and self._pending_break:
+            self._out.append("\n" * self._pending_break)
+        self._out.append(text)
+        self._pending_break = 0
+        self._started = True
+        self._ends_in_space = collapse and text.endswith(" ")
+
+    def _break_for(self, tag: str) -> None:
+        if tag in _PARAGRAPH_TAGS:
+            self._pending_break = 2
+        elif tag in _LINE_TAGS:
+            self._pending_break = max(self._pending_break, 1)
+
+    def _take(self) -> str:
+        text = "".join(self._out)
+        self._out.clear()
+        return text
+
+
+def text_extractor(document_format: DocumentFormat) -> TextExtractor:
+    if document_format is DocumentFormat.HTML:
+        return HtmlTextExtractor()
+    return PlainTextExtractor()
+
+
+class TextChunker:
+    """Splits a text stream into chunks of about ``size`` characters as it arrives.
+
+    Each chunk ends at the last paragraph, line, sentence or word break in its
+    second half, and the next one starts ``overlap`` characters before that
+    end, so text near a boundary is retrievable from either side. Only the
+    unfinished tail of the stream is buffered.
+    """
+
+    def __init__(self, size: int, overlap: int):
+        self.size = max(size, 16)
+        self.overlap = min(max(overlap, 0), self.size // 4)
+        self._buffer = ""
+        # Offset of the buffer's first character in the whole text
+        self._offset = 0
+        # Offset just past the last emitted chunk
+        self._emitted_to = 0
+
+    def feed(self, text: str) -> list[TextChunk]:
+        buffer = self._buffer + text
+        chunks: list[TextChunk] = []
+        start = 0
+        # Wait for more text rather than emit a short chunk at a block boundary
+        while len(buffer) - start > self.size:
+            end = self._cut(buffer, start)
+            self._emit(chunks, buffer, start, end)
+            start = self._next_start(buffer, start, end)
+        self._buffer = buffer[start:]
+        self._offset += start
+        return chunks
+
+    def close(self) -> list[TextChunk]:
+        chunks: list[TextChunk] = []
+        if self._offset + len(self._buffer) > self._emitted_to:
+            self._emit(chunks, self._buffer, 0, len(self._buffer))
+        self._offset += len(self._buffer)
+        self._buffer = ""
+        return chunks
+
+    def _cut(self, buffer: str, start: int) -> int:
+        limit = start + self.size
+        lowest = start + self.size // 2
+        for separator in ("\n\n", "\n", ". ", " "):
+            found = buffer.rfind(separator, lowest, limit)
+            if found != -1:
+                return found + len(separator)
+        return limit
+
+    def _next_start(self, buffer: str, start: int, end: int) -> int:
+        if not self.overlap:
+            return end
+        # Begin the overlap on a word boundary
+        next_start = end - self.overlap
+        space = buffer.find(" ", next_start, end)
+        if space != -1:
+            next_start = space + 1
+        return max(next_start, start + 1)
+
+    def _emit(self, chunks: list[TextChunk], buffer: str, start: int, end: int) -> None:
+        content = buffer[start:end]
+        if content.strip():
+            chunks.append(TextChunk(self._offset + start, content))
+        self._emitted_to = self._offset + end
+
+
+class DocumentTextPipeline:
+    """Bytes of a stored upload in, chunks of its extracted text out, one block at a time."""
+
+    def __init__(self, document_format: DocumentFormat, chunk_chars: int, overlap_chars: int):
+        # utf-8-sig drops a leading byte order mark; undecodable bytes become U+FFFD
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+        self._extractor = text_extractor(document_format)
+        self._chunker = TextChunker(chunk_chars, overlap_chars)
+        self.char_count = 0
+
+    def feed(self, block: bytes) -> list[TextChunk]:
+        return self._chunk(self._extractor.feed(self._decoder.decode(block)))
+
+    def close(self) -> list[TextChunk]:
+        tail = self._extractor.feed(self._decoder.decode(b"", final=True))
+        chunks = self._chunk(tail + self._extractor.close())
+        return chunks + self._chunker.close()
+
+    def _chunk(self, text: str) -> list[TextChunk]:
+        self.char_count += len(text)
+        return self._chunker.feed(text)
@@ -0,0 +1,172 @@
+import asyncio
+import os
+from collections.abc import AsyncIterable
+from pathlib import Path
+from uuid import UUID
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.document import Document, DocumentChunk
+from app.services.document_parser import (
+    DocumentTextPipeline,
+    TextChunk,
+    UnsupportedFormatError,
+    detect_format,
+)
+from app.services.upload_stream import UploadRejectedError, stage_upload
+
+
+def stored_path(sha256: str) -> Path:
+    return Path(settings.DOCUMENT_STORAGE_DIR) / sha256[:2] / sha256
+
+
+def _store(staged: Path, path: Path) -> bool:
+    """Move a staged upload into place; False if identical content is already stored."""
+    if path.exists():
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(staged, path)
+    return True
+
+
+class DocumentService:
+    """Uploaded documents, ingested into chunks of text in bounded memory.
+
+    An upload is streamed to disk and hashed in one pass, then read back a
+    block at a time through an incremental decoder, text extractor and chunker,
+    with chunk rows inserted in batches. Memory use depends on the block,
+    chunk and batch sizes, not on the size of the file.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def upload(self, body: AsyncIterable[bytes], content_type: str) -> tuple[Document, bool]:
+        """Store and ingest the file in a multipart body; returns it and whether it is new.
+
+        A file whose SHA-256 matches a stored document is not ingested again.
+        """
+        storage = Path(settings.DOCUMENT_STORAGE_DIR)
+        staged = await stage_upload(
+            body, content_type, storage / ".incoming", settings.DOCUMENT_MAX_BYTES
+        )
+        try:
+            existing = await self._by_hash(staged.sha256)
+            if existing is not None:
+                return existing, False
+            try:
+                document_format = detect_format(staged.filename, staged.media_type, staged.head)
+            except UnsupportedFormatError as exc:
+                raise UploadRejectedError(str(exc), status_code=415) from exc
+            path = stored_path(staged.sha256)
+            created_file = await asyncio.to_thread(_store, staged.path, path)
+        finally:
+            await asyncio.to_thread(staged.path.unlink, missing_ok=True)
+
+        document = Document(
+            filename=staged.filename,
+            media_type=staged.media_type,
+            format=document_format,
+            sha256=staged.sha256,
+            size_bytes=staged.size_bytes,
+        )
+        self.db.add(document)
+        try:
+            await self.db.flush()
+        except IntegrityError:
+            # A concurrent upload of the same content committed first
+            await self.db.rollback()
+            winner = await self._by_hash(staged.sha256)
+            if winner is None:
+                raise
+            return winner, False
+
+        try:
+            await self._ingest(document, path)
+            await self.db.commit()
+        except BaseException:
+            await self.db.rollback()
+            if created_file:
+                await asyncio.to_thread(path.unlink, missing_ok=True)
+            raise
+        return document, True
+
+    async def list_documents(self, limit: int = 50, offset: int = 0) -> list[Document]:
+        result = await self.db.execute(
+            select(Document)
+            .order_by(Document.created_at.desc(), Document.id)
+            .offset(offset)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_document(self, document_id: UUID) -> Document | None:
+        return await self.db.get(Document, document_id)
+
+    async def list_chunks(
+        self, document_id: UUID, offset: int = 0, limit: int = 50
+    ) -> list[DocumentChunk] | None:
+        """The document's chunks in order from ordinal ``offset``; None if it does not exist."""
+        if await self.get_document(document_id) is None:
+            return None
+        result = await self.db.execute(
+            select(DocumentChunk)
+            .where(DocumentChunk.document_id == document_id, DocumentChunk.ordinal >= offset)
+            .order_by(DocumentChunk.ordinal)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def delete_document(self, document_id: UUID) -> bool:
+        document = await self.get_document(document_id)
+        if document is None:
+            return False
+        path = stored_path(document.sha256)
+        await self.db.execute(delete(DocumentChunk).where(DocumentChunk.document_id == document_id))
+        await self.db.delete(document)
+        await self.db.commit()
+        await asyncio.to_thread(path.unlink, missing_ok=True)
+        return True
+
+    async def _by_hash(self, sha256: str) -> Document | None:
+        result = await self.db.execute(select(Document).where(Document.sha256 == sha256))
+        return result.scalar_one_or_none()
+
+    async def _ingest(self, document: Document, path: Path) -> None:
+        pipeline = DocumentTextPipeline(
+            document.format,
+            settings.DOCUMENT_CHUNK_CHARS,
+            settings.DOCUMENT_CHUNK_OVERLAP_CHARS,
+        )
+        pending: list[TextChunk] = []
+        inserted = 0
+        with path.open("rb") as f:
+            # Parsing runs off the event loop; inserts run between blocks
+            while block := await asyncio.to_thread(f.read, settings.DOCUMENT_READ_BLOCK_BYTES):
+                pending.extend(await asyncio.to_thread(pipeline.feed, block))
+                if len(pending) >= settings.DOCUMENT_CHUNK_INSERT_BATCH:
+                    inserted += await self._insert_chunks(document.id, inserted, pending)
+                    pending = []
+        pending.extend(pipeline.close())
+        inserted += await self._insert_chunks(document.id, inserted, pending)
+        document.char_count = pipeline.char_count
+        document.chunk_count = inserted
+
+    async def _insert_chunks(self, document_id: UUID, first: int, chunks: list[TextChunk]) -> int:
+        if chunks:
+            await self.db.execute(
+                insert(DocumentChunk),
+                [
+                    {
+                        "document_id": document_id,
+                        "ordinal": first + i,
+                        "start_offset": chunk.start_offset,
+                        "content": chunk.content,
+                    }
+                    for i, chunk in enumerate(chunks)
+                ],
+            )
+        return len(chunks)
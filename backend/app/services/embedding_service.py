@@ -0,0 +1,375 @@
+import asyncio
+import hashlib
+import math
+import re
+import zlib
+from collections import Counter
+from collections.abc import Callable, Mapping, Sequence
+from functools import lru_cache
+from typing import Protocol
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import delete, func, insert, or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.embedding import ChunkEmbedding, NoteChunk, NoteEmbedding
+from app.models.note import Note
+from app.schemas.search import ChunkEmbeddingStats
+from app.services.cpu_pool import cpu_pool
+from app.services.document_parser import TextChunk, TextChunker
+from app.services.vector_index import Vector, VectorIndex
+
+_WORD = re.compile(r"\w+")
+BACKFILL_BATCH_SIZE = 256
+
+# A paragraph with its trailing blank line; the last one may have none
+_PARAGRAPH = re.compile(r".*?(?:\n\n|\Z)", re.DOTALL)
+# Past the minimum size, a chunk ends after a paragraph whose CRC32 is 0 modulo this
+_BOUNDARY_EVERY = 4
+
+
+class Embedder(Protocol):
+    """Turns texts into an (n, dim) float32 matrix of unit-length rows."""
+
+    name: str
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> Vector: ...
+
+
+class HashingEmbedder:
+    """Deterministic, offline embedder: hashed word unigrams and character trigrams.
+
+    Features are hashed with CRC32 (stable across processes, unlike ``hash``) into
+    ``dim`` signed buckets, weighted by sublinear term frequency and L2-normalised.
+    Character trigrams give some tolerance to inflections and typos.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.name = f"hashing-v1-{dim}"
+
+    def embed(self, texts: Sequence[str]) -> Vector:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts = Counter(self._features(text))
+            if not counts:
+                continue
+            hashes = np.fromiter(
+                (zlib.crc32(feature.encode()) for feature in counts), dtype=np.uint32
+            )
+            weights = np.fromiter((1.0 + math.log(n) for n in counts.values()), dtype=np.float32)
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+            np.add.at(matrix[row], hashes % self.dim, signs * weights)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    @staticmethod
+    def _features(text: str) -> list[str]:
+        features = []
+        for word in _WORD.findall(text.lower()):
+            features.append(word)
+            if len(word) > 3:
+                padded = f"<{word}>"
+                features.extend("#" + padded[i : i + 3] for i in range(len(padded) - 2))
+        return features
+
+
+EMBEDDERS: dict[str, Callable[[int], Embedder]] = {"hashing": HashingEmbedder}
+
+
+@lru_cache
+def get_embedder() -> Embedder:
+    return EMBEDDERS[settings.EMBEDDER](settings.EMBEDDING_DIM)
+
+
+vector_index = VectorIndex(
+    dim=settings.EMBEDDING_DIM,
+    ivf_min_size=settings.VECTOR_IVF_MIN_SIZE,
+    nprobe=settings.VECTOR_IVF_NPROBE,
+)
+_index_lock = asyncio.Lock()
+
+
+def note_text(note: Note) -> str:
+    return f"{note.title}\n{note.content}"
+
+
+def chunk_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def chunk_note_text(text: str) -> list[TextChunk]:
+    """Split note text into chunks whose boundaries depend only on nearby content.
+
+    Chunks are runs of whole paragraphs (split further only when one is longer
+    than ``NOTE_CHUNK_MAX_CHARS``). Past ``NOTE_CHUNK_MIN_CHARS``, a chunk ends
+    after a paragraph whose own hash picks it as a boundary, rather than at a
+    fixed size, so inserting or deleting text leaves the chunks around the edit,
+    and their hashes, unchanged.
+    """
+    max_chars, min_chars = settings.NOTE_CHUNK_MAX_CHARS, settings.NOTE_CHUNK_MIN_CHARS
+    pieces: list[TextChunk] = []
+    for match in _PARAGRAPH.finditer(text):
+        paragraph = match.group()
+        if len(paragraph) <= max_chars:
+            if paragraph:
+                pieces.append(TextChunk(match.start(), paragraph))
+            continue
+        splitter = TextChunker(max_chars, 0)
+        pieces.extend(
+            TextChunk(match.start() + piece.start_offset, piece.content)
+            for piece in splitter.feed(paragraph) + splitter.close()
+        )
+
+    chunks: list[TextChunk] = []
+    parts: list[TextChunk] = []
+    size = 0
+    for piece in pieces:
+        if parts and size + len(piece.content) > max_chars:
+            chunks.append(_join(parts))
+            parts, size = [], 0
+        parts.append(piece)
+        size += len(piece.content)
+        if size >= min_chars and zlib.crc32(piece.content.encode()) % _BOUNDARY_EVERY == 0:
+            chunks.append(_join(parts))
+            parts, size = [], 0
+    if parts:
+        chunks.append(_join(parts))
+    return chunks
+
+
+def _join(parts: list[TextChunk]) -> TextChunk:
+    return TextChunk(parts[0].start_offset, "".join(part.content for part in parts))
+
+
+class ChunkReuseCounters:
+    """Counts note chunks embedded since startup, by where each chunk's vector came from."""
+
+    def __init__(self) -> None:
+        self._counts: Counter[str] = Counter()
+
+    def record(self, notes: int, chunks: int, unchanged: int, embedded: int) -> None:
+        self._counts.update(
+            notes=notes,
+            chunks=chunks,
+            unchanged=unchanged,
+            cache_hits=chunks - unchanged - embedded,
+            embedded=embedded,
+        )
+
+    def clear(self) -> None:
+        self._counts.clear()
+
+    def stats(self, cached_vectors: int) -> ChunkEmbeddingStats:
+        chunks = self._counts["chunks"]
+        return ChunkEmbeddingStats(
+            notes=self._counts["notes"],
+            chunks=chunks,
+            unchanged=self._counts["unchanged"],
+            cache_hits=self._counts["cache_hits"],
+            embedded=self._counts["embedded"],
+            reuse_rate=(chunks - self._counts["embedded"]) / chunks if chunks else 0.0,
+            cached_vectors=cached_vectors,
+        )
+
+
+chunk_reuse = ChunkReuseCounters()
+
+
+class EmbeddingService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.embedder = get_embedder()
+
+    async def write_note_embedding(self, note: Note, is_new: bool = False) -> Vector:
+        """Embed a note and stage its NoteEmbedding and chunk rows; the caller commits.
+
+        Only chunks without a cached vector for this model are embedded, so an
+        edit costs about the size of the change. Returns the vector so the
+        caller can publish it to the index after commit.
+        """
+        vectors = await self._embed_notes({note.id: note_text(note)}, replace=not is_new)
+        vector = vectors[note.id]
+        embedding = NoteEmbedding(
+            note_id=note.id,
+            model=self.embedder.name,
+            dim=self.embedder.dim,
+            vector=vector.tobytes(),
+        )
+        if is_new:
+            self.db.add(embedding)
+        else:
+            await self.db.merge(embedding)
+        return vector
+
+    async def delete_note_embedding(self, note_id: UUID) -> None:
+        await self.db.execute(delete(NoteEmbedding).where(NoteEmbedding.note_id == note_id))
+        await self.db.execute(delete(NoteChunk).where(NoteChunk.note_id == note_id))
+
+    async def chunk_stats(self) -> ChunkEmbeddingStats:
+        cached = await self.db.execute(
+            select(func.count()).where(ChunkEmbedding.model == self.embedder.name)
+        )
+        return chunk_reuse.stats(cached.scalar_one())
+
+    async def ensure_index(self) -> None:
+        """Load the in-process index from stored embeddings once per process.
+
+        Notes without an embedding for the current model are embedded first, in
+        batches, so switching embedders or upgrading an old database self-heals.
+        Cached chunk vectors no note uses any more are dropped at the same time.
+        """
+        if vector_index.loaded:
+            return
+        async with _index_lock:
+            if vector_index.loaded:
+                return
+            await self._backfill()
+            await self._prune_chunk_cache()
+            result = await self.db.execute(
+                select(NoteEmbedding.note_id, NoteEmbedding.vector).where(
+                    NoteEmbedding.model == self.embedder.name
+                )
+            )
+            rows = result.all()
+            vectors = np.frombuffer(b"".join(row.vector for row in rows), dtype=np.float32)
+            vector_index.load([row.note_id for row in rows], vectors)
+
+    async def _backfill(self) -> None:
+        current = select(NoteEmbedding.note_id).where(NoteEmbedding.model == self.embedder.name)
+        result = await self.db.execute(
+            select(Note.id, Note.title, Note.content).where(Note.id.not_in(current))
+        )
+        missing = result.all()
+        for start in range(0, len(missing), BACKFILL_BATCH_SIZE):
+            batch = missing[start : start + BACKFILL_BATCH_SIZE]
+            vectors = await self._embed_notes(
+                {row.id: f"{row.title}\n{row.content}" for row in batch}, replace=True
+            )
+            await self.db.execute(delete(NoteEmbedding).where(NoteEmbedding.note_id.in_(vectors)))
+            self.db.add_all(
+                NoteEmbedding(
+                    note_id=note_id,
+                    model=self.embedder.name,
+                    dim=self.embedder.dim,
+                    vector=vector.tobytes(),
+                )
+                for note_id, vector in vectors.items()
+            )
+            await self.db.commit()
+
+    async def _prune_chunk_cache(self) -> None:
+        await self.db.execute(
+            delete(ChunkEmbedding).where(
+                or_(
+                    ChunkEmbedding.model != self.embedder.name,
+                    ChunkEmbedding.content_hash.not_in(select(NoteChunk.content_hash)),
+                )
+            )
+        )
+        await self.db.commit()
+
+    async def _embed_notes(self, texts: Mapping[UUID, str], replace: bool) -> dict[UUID, Vector]:
+        """Chunk, embed and stage the chunk rows of each note; returns note vectors.
+
+        A note's vector is the length-weighted mean of its chunk vectors, which
+        for a note that fits in one chunk is the embedding of its whole text.
+        """
+        chunked = {note_id: chunk_note_text(text) for note_id, text in texts.items()}
+        hashes = {
+            note_id: [chunk_hash(chunk.content) for chunk in chunks]
+            for note_id, chunks in chunked.items()
+        }
+        previous: set[tuple[UUID, str]] = set()
+        if replace:
+            result = await self.db.execute(
+                select(NoteChunk.note_id, NoteChunk.content_hash).where(
+                    NoteChunk.note_id.in_(list(texts))
+                )
+            )
+            previous = set(result.tuples())
+            await self.db.execute(delete(NoteChunk).where(NoteChunk.note_id.in_(list(texts))))
+
+        cached = await self._cached_vectors(
+            {h for note_hashes in hashes.values() for h in note_hashes}
+        )
+        missing = {
+            h: chunk.content
+            for note_id, chunks in chunked.items()
+            for chunk, h in zip(chunks, hashes[note_id], strict=True)
+            if h not in cached
+        }
+        if missing:
+            embedded = await self._embed(list(missing.values()))
+            await self.db.execute(
+                sqlite_insert(ChunkEmbedding).on_conflict_do_nothing(),
+                [
+                    {"model": self.embedder.name, "content_hash": h, "vector": vector.tobytes()}
+                    for h, vector in zip(missing, embedded, strict=True)
+                ],
+            )
+            cached.update(zip(missing, embedded, strict=True))
+
+        await self.db.execute(
+            insert(NoteChunk),
+            [
+                {
+                    "note_id": note_id,
+                    "ordinal": ordinal,
+                    "start_offset": chunk.start_offset,
+                    "length": len(chunk.content),
+                    "content_hash": h,
+                }
+                for note_id, chunks in chunked.items()
+                for ordinal, (chunk, h) in enumerate(zip(chunks, hashes[note_id], strict=True))
+            ],
+        )
+        chunk_reuse.record(
+            notes=len(texts),
+            chunks=sum(len(note_hashes) for note_hashes in hashes.values()),
+            unchanged=sum(
+                (note_id, h) in previous and h not in missing
+                for note_id, note_hashes in hashes.items()
+                for h in note_hashes
+            ),
+            embedded=len(missing),
+        )
+        return {
+            note_id: _note_vector(chunked[note_id], hashes[note_id], cached, self.embedder.dim)
+            for note_id in texts
+        }
+
+    async def _cached_vectors(self, hashes: set[str]) -> dict[str, Vector]:
+        if not hashes:
+            return {}
+        result = await self.db.execute(
+            select(ChunkEmbedding.content_hash, ChunkEmbedding.vector).where(
+                ChunkEmbedding.model == self.embedder.name,
+                ChunkEmbedding.content_hash.in_(hashes),
+            )
+        )
+        return {h: np.frombuffer(vector, dtype=np.float32) for h, vector in result.tuples()}
+
+    async def _embed(self, texts: list[str]) -> Vector:
+        if sum(len(text) for text in texts) <= settings.CPU_POOL_INLINE_MAX_CHARS:
+            return self.embedder.embed(texts)
+        return await cpu_pool.run(self.embedder.embed, texts)
+
+
+def _note_vector(
+    chunks: Sequence[TextChunk], hashes: Sequence[str], cached: Mapping[str, Vector], dim: int
+) -> Vector:
+    if len(chunks) == 1:
+        return cached[hashes[0]].copy()
+    vector: Vector = np.zeros(dim, dtype=np.float32)
+    for chunk, h in zip(chunks, hashes, strict=True):
+        vector += len(chunk.content) * cached[h]
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector /= norm
+    return vector
@@ -0,0 +1,194 @@
+import asyncio
+from collections.abc import Collection, Iterable
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.container import Container
+from app.models.note import CodeStage, Note
+from app.schemas.filing import FilingModelStats, FilingSuggestion, InboxSuggestions
+from app.services.embedding_service import EmbeddingService, vector_index
+from app.services.vector_index import Vector, VectorIndex
+
+_FILED = select(Note.id, Note.container_id).where(Note.container_id.is_not(None))
+_INBOX_PAGE = (
+    select(Note.id, Note.title)
+    .where(Note.code_stage == CodeStage.CAPTURE)
+    .where(Note.container_id.is_(None))
+    .order_by(Note.captured_at.desc())
+    .limit(bindparam("limit"))
+    .offset(bindparam("offset"))
+)
+_ACTIVE_CONTAINERS = select(Container.id, Container.name, Container.type).where(Container.is_active)
+
+
+class FilingModel:
+    """Nearest-centroid classifier from note embeddings to the containers notes are filed in.
+
+    Holds which notes are filed where and one unit-length centroid per container,
+    the mean of its notes' vectors in the vector index. Filing, refiling, editing
+    or deleting a note only marks the containers involved as stale; ``train``
+    recomputes just those centroids. Scoring a page of inbox notes is one matrix
+    product against the stacked centroids.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.clear()
+
+    def clear(self) -> None:
+        self.loaded = False
+        self._filed: dict[UUID, UUID] = {}
+        self._members: dict[UUID, set[UUID]] = {}
+        self._centroids: dict[UUID, Vector] = {}
+        self._stale: set[UUID] = set()
+        self._labels: list[UUID] = []
+        self._matrix: Vector = np.zeros((0, self.dim), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self._filed)
+
+    def load(self, filed: Iterable[tuple[UUID, UUID | None]]) -> None:
+        """Replace the model with these (note, container) pairs; centroids follow on ``train``."""
+        self.clear()
+        for note_id, container_id in filed:
+            self.assign(note_id, container_id)
+        self.loaded = True
+
+    def assign(self, note_id: UUID, container_id: UUID | None) -> None:
+        """Record where a note is filed; ``None`` means it is back in the inbox or gone."""
+        previous = self._filed.pop(note_id, None)
+        if previous is not None:
+            self._members[previous].discard(note_id)
+            self._stale.add(previous)
+        if container_id is not None:
+            self._filed[note_id] = container_id
+            self._members.setdefault(container_id, set()).add(note_id)
+            self._stale.add(container_id)
+
+    def touch(self, container_id: UUID) -> None:
+        """Mark a container stale after one of its notes was re-embedded."""
+        if container_id in self._members:
+            self._stale.add(container_id)
+
+    def drop_containers(self, container_ids: Iterable[UUID]) -> None:
+        for container_id in container_ids:
+            for note_id in self._members.pop(container_id, set()):
+                del self._filed[note_id]
+            self._centroids.pop(container_id, None)
+            self._stale.add(container_id)
+
+    def train(self, index: VectorIndex) -> int:
+        """Recompute the centroids of stale containers from ``index``; returns how many."""
+        stale, self._stale = self._stale, set()
+        for container_id in stale:
+            members = self._members.get(container_id)
+            _, vectors = index.vectors(members or ())
+            if not len(vectors):
+                self._members.pop(container_id, None)
+                self._centroids.pop(container_id, None)
+                continue
+            centroid = vectors.sum(axis=0)
+            norm = float(np.linalg.norm(centroid))
+            self._centroids[container_id] = centroid / norm if norm else centroid
+        if stale:
+            self._labels = list(self._centroids)
+            self._matrix = np.array(
+                [self._centroids[label] for label in self._labels], dtype=np.float32
+            ).reshape(-1, self.dim)
+        return len(stale)
+
+    def predict(
+        self, queries: Vector, top: int, allowed: Collection[UUID], min_score: float = 0.0
+    ) -> list[list[tuple[UUID, float]]]:
+        """The ``top`` containers in ``allowed`` nearest each query row, best first."""
+        keep = [row for row, label in enumerate(self._labels) if label in allowed]
+        labels = [self._labels[row] for row in keep]
+        top = min(top, len(labels))
+        if top <= 0 or not len(queries):
+            return [[] for _ in range(len(queries))]
+        scores = queries @ self._matrix[keep].T
+        best = np.argpartition(-scores, top - 1, axis=1)[:, :top]
+        results = []
+        for row_scores, row_best in zip(scores, best, strict=True):
+            ordered = row_best[np.argsort(-row_scores[row_best])]
+            results.append(
+                [(labels[i], float(row_scores[i])) for i in ordered if row_scores[i] >= min_score]
+            )
+        return results
+
+    def stats(self) -> FilingModelStats:
+        return FilingModelStats(
+            loaded=self.loaded,
+            filed_notes=len(self._filed),
+            containers=len(self._centroids),
+            stale_containers=len(self._stale),
+        )
+
+
+filing_model = FilingModel(settings.EMBEDDING_DIM)
+_model_lock = asyncio.Lock()
+
+
+class FilingService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def ensure_model(self) -> None:
+        """Load where notes are filed once per process; centroids are trained from the index."""
+        await EmbeddingService(self.db).ensure_index()
+        if filing_model.loaded:
+            return
+        async with _model_lock:
+            if filing_model.loaded:
+                return
+            result = await self.db.execute(_FILED)
+            filing_model.load(result.tuples().all())
+
+    async def train(self) -> int:
+        """Recompute stale centroids; run as a background job after notes are filed."""
+        await self.ensure_model()
+        return filing_model.train(vector_index)
+
+    async def suggest_inbox(
+        self, limit: int = 50, offset: int = 0, top: int = 3
+    ) -> list[InboxSuggestions]:
+        """Likely containers for a page of inbox notes, scored in one batch.
+
+        Serves the centroids last trained by the ``filing.train`` job and never
+        trains on the request path; until the first run after startup it suggests nothing.
+        """
+        await EmbeddingService(self.db).ensure_index()
+        page = (await self.db.execute(_INBOX_PAGE, {"limit": limit, "offset": offset})).all()
+        containers = {row.id: row for row in await self.db.execute(_ACTIVE_CONTAINERS)}
+        found, vectors = vector_index.vectors(row.id for row in page)
+        ranked = dict(
+            zip(
+                found,
+                filing_model.predict(vectors, top, containers, settings.FILING_MIN_SCORE),
+                strict=True,
+            )
+        )
+        return [
+            InboxSuggestions(
+                note_id=row.id,
+                title=row.title,
+                suggestions=[
+                    FilingSuggestion(
+                        container_id=container_id,
+                        container_name=containers[container_id].name,
+                        container_type=containers[container_id].type,
+                        score=score,
+                    )
+                    for container_id, score in ranked.get(row.id, [])
+                ],
+            )
+            for row in page
+        ]
+
+    async def stats(self) -> FilingModelStats:
+        await self.ensure_model()
+        return filing_model.stats()
@@ -0,0 +1,217 @@
+from collections.abc import Sequence
+from difflib import SequenceMatcher
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.highlight import Highlight
+from app.models.note import Note
+from app.schemas.highlight import HighlightedNote, HighlightPage, HighlightResponse
+
+EXCERPT_SEPARATOR = "\n…\n"
+MAX_DIFF_CHARS = 20_000
+
+
+def rebase_highlights(
+    old_content: str, new_content: str, highlights: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Shift highlight offsets across a content edit.
+
+    The common prefix and suffix are stripped in O(n) and only the edited middle is
+    diffed, falling back to one replaced span when it is larger than
+    ``MAX_DIFF_CHARS``. A range that sits inside unchanged text is moved; a range
+    whose own text was edited is stretched over the edit and flagged ``stale``.
+    """
+    old_len, new_len = len(old_content), len(new_content)
+    prefix = 0
+    limit = min(old_len, new_len)
+    while prefix < limit and old_content[prefix] == new_content[prefix]:
+        prefix += 1
+    suffix = 0
+    limit -= prefix
+    while suffix < limit and old_content[old_len - 1 - suffix] == new_content[new_len - 1 - suffix]:
+        suffix += 1
+    old_end, new_end = old_len - suffix, new_len - suffix
+
+    old_mid, new_mid = old_content[prefix:old_end], new_content[prefix:new_end]
+    middle: Sequence[tuple[str, int, int, int, int]]
+    if len(old_mid) > MAX_DIFF_CHARS or len(new_mid) > MAX_DIFF_CHARS:
+        middle = [("replace", 0, len(old_mid), 0, len(new_mid))]
+    else:
+        middle = SequenceMatcher(None, old_mid, new_mid, autojunk=False).get_opcodes()
+    ops = [
+        ("equal", 0, prefix, 0, prefix),
+        *(
+            (tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix)
+            for tag, i1, i2, j1, j2 in middle
+        ),
+        ("equal", old_end, old_len, new_end, new_len),
+    ]
+
+    def locate(pos: int, is_end: bool) -> tuple[int, int | None]:
+        """Map ``pos`` to the new text; also return the equal op index it fell in, if any."""
+        for index, (tag, i1, i2, j1, j2) in enumerate(ops):
+            if (i1 < pos <= i2) if is_end else (i1 <= pos < i2):
+                if tag == "equal":
+                    return j1 + pos - i1, index
+                return (j2 if is_end else j1), None
+        return (0 if is_end else new_len), None
+
+    rebased = []
+    for h in highlights:
+        start, start_op = locate(h["start"], is_end=False)
+        end, end_op = locate(h["end"], is_end=True)
+        touched = start_op is None or start_op != end_op
+        rebased.append(
+            {
+                **h,
+                "start": start,
+                "end": max(start, end),
+                "stale": bool(h.get("stale")) or touched,
+            }
+        )
+    return rebased
+
+
+def build_excerpts(content: str, highlights: list[dict[str, Any]]) -> tuple[str | None, str | None]:
+    """Concatenate the L2 (layer >= 2) and L3 text, merging overlaps and skipping stale ranges."""
+
+    def excerpt(min_layer: int) -> str | None:
+        merged: list[list[int]] = []
+        ranges = sorted(
+            (h for h in highlights if h["layer"] >= min_layer and not h.get("stale")),
+            key=lambda h: h["start"],
+        )
+        for h in ranges:
+            if merged and h["start"] <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], h["end"])
+            else:
+                merged.append([h["start"], h["end"]])
+        return EXCERPT_SEPARATOR.join(content[a:b] for a, b in merged) or None
+
+    return excerpt(2), excerpt(3)
+
+
+async def replace_note_highlights(db: AsyncSession, note: Note, rebased: bool = False) -> None:
+    """Mirror ``note.highlights`` into the highlights table and refresh cached excerpts.
+
+    Rows are updated in place so highlight ids, the ``after`` cursor of
+    ``list_highlights``, stay stable: ``rebased`` ranges map one-to-one onto the
+    note's rows in order, while a resubmitted list keeps the row of every range
+    that is unchanged and fills the remaining rows in order. Only a surplus is
+    inserted or deleted. Does not commit; callers write the note and its
+    highlight rows in one transaction.
+    """
+    ranges = (note.highlights or {}).get("highlights", [])
+    note.l2_excerpt, note.l3_excerpt = build_excerpts(note.content, ranges)
+    note.highlights_stale = any(h.get("stale") for h in ranges)
+
+    existing = (
+        await db.execute(
+            select(Highlight.id, Highlight.start, Highlight.end, Highlight.layer)
+            .where(Highlight.note_id == note.id)
+            .order_by(Highlight.id)
+        )
+    ).all()
+    rows = [
+        {
+            "note_id": note.id,
+            "start": h["start"],
+            "end": h["end"],
+            "layer": h["layer"],
+            "text": note.content[h["start"] : h["end"]],
+            "stale": bool(h.get("stale")),
+        }
+        for h in ranges
+    ]
+    row_ids: list[int | None] = [None] * len(rows)
+    spare = [row.id for row in existing]
+    if not rebased:
+        ids_by_range: dict[tuple[int, int, int], list[int]] = {}
+        for row in existing:
+            ids_by_range.setdefault((row.start, row.end, row.layer), []).append(row.id)
+        row_ids = [
+            ids.pop(0) if (ids := ids_by_range.get((r["start"], r["end"], r["layer"]))) else None
+            for r in rows
+        ]
+        spare = sorted(i for ids in ids_by_range.values() for i in ids)
+    for position, row_id in enumerate(row_ids):
+        if row_id is None and spare:
+            row_ids[position] = spare.pop(0)
+
+    updates = [{"id": i, **r} for i, r in zip(row_ids, rows, strict=True) if i is not None]
+    inserts = [r for i, r in zip(row_ids, rows, strict=True) if i is None]
+    if updates:
+        await db.execute(update(Highlight), updates)
+    if spare:
+        await db.execute(delete(Highlight).where(Highlight.id.in_(spare)))
+    if inserts:
+        await db.execute(insert(Highlight), inserts)
+
+
+class HighlightService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_highlights(
+        self,
+        layer: int | None = None,
+        container_id: UUID | None = None,
+        note_id: UUID | None = None,
+        after: int | None = None,
+        limit: int = 100,
+    ) -> HighlightPage:
+        """Page through highlights across notes using a keyset cursor on highlight id.
+
+        ``layer`` keeps highlights at that layer or above, as the L2/L3 excerpts do.
+        """
+        query = select(Highlight)
+        if layer is not None:
+            query = query.where(Highlight.layer >= layer)
+        if note_id:
+            query = query.where(Highlight.note_id == note_id)
+        if container_id:
+            query = query.where(
+                Highlight.note_id.in_(select(Note.id).where(Note.container_id == container_id))
+            )
+        if after is not None:
+            query = query.where(Highlight.id > after)
+
+        result = await self.db.execute(query.order_by(Highlight.id).limit(limit + 1))
+        rows = list(result.scalars().all())
+        next_cursor = rows[limit - 1].id if len(rows) > limit else None
+        return HighlightPage(
+            items=[HighlightResponse.model_validate(h) for h in rows[:limit]],
+            next_cursor=next_cursor,
+        )
+
+    async def list_highlighted_notes(
+        self,
+        layer: int | None = None,
+        container_id: UUID | None = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[HighlightedNote]:
+        """Notes that have highlights at ``layer`` or above, with counts, without note bodies."""
+        query = (
+            select(Note.id, Note.title, Note.container_id, func.count(Highlight.id))
+            .join(Highlight, Highlight.note_id == Note.id)
+            .group_by(Note.id, Note.title, Note.container_id)
+            .order_by(func.count(Highlight.id).desc(), Note.title)
+            .limit(limit)
+            .offset(offset)
+        )
+        if layer is not None:
+            query = query.where(Highlight.layer >= layer)
+        if container_id:
+            query = query.where(Note.container_id == container_id)
+
+        result = await self.db.execute(query)
+        return [
+            HighlightedNote(
+                note_id=note_id, title=title, container_id=note_container, highlight_count=count
+            )
+            for note_id, title, note_container, count in result.all()
+        ]
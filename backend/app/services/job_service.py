@@ -0,0 +1,309 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractAsyncContextManager, suppress
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session_maker
+from app.models.job import Job, JobStatus
+from app.schemas.job import JobQueueStatus, JobResponse
+from app.services.dedup_service import DedupService
+from app.services.filing_service import FilingService
+from app.services.related_service import RelatedNotesService
+from app.services.revision_service import RevisionService
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[AsyncSession, UUID | None], Awaitable[None]]
+SessionFactory = Callable[[], AbstractAsyncContextManager[AsyncSession]]
+JobKey = tuple[str, UUID | None]
+
+REFRESH_RELATED = "related.refresh"
+RECOMPUTE_RELATED = "related.recompute"
+RECORD_REVISION = "revision.record"
+TRAIN_FILING = "filing.train"
+BACKFILL_SIGNATURES = "dedup.backfill"
+RECENT_FAILURES = 20
+
+
+async def _refresh_related(db: AsyncSession, note_id: UUID | None) -> None:
+    if note_id is not None:
+        await RelatedNotesService(db).refresh_note(note_id)
+
+
+async def _recompute_related(db: AsyncSession, note_id: UUID | None) -> None:
+    if note_id is not None:
+        await RelatedNotesService(db).recompute([note_id])
+        await db.commit()
+
+
+async def _record_revision(db: AsyncSession, note_id: UUID | None) -> None:
+    if note_id is not None:
+        await RevisionService(db).record(note_id)
+        await db.commit()
+
+
+async def _train_filing(db: AsyncSession, _: UUID | None) -> None:
+    await FilingService(db).train()
+
+
+async def _backfill_signatures(db: AsyncSession, _: UUID | None) -> None:
+    await DedupService(db).ensure_signatures()
+
+
+JOB_HANDLERS: dict[str, JobHandler] = {
+    REFRESH_RELATED: _refresh_related,
+    RECOMPUTE_RELATED: _recompute_related,
+    RECORD_REVISION: _record_revision,
+    TRAIN_FILING: _train_filing,
+    BACKFILL_SIGNATURES: _backfill_signatures,
+}
+
+
+def _utcnow() -> datetime:
+    """Naive UTC, matching the ``func.now()`` timestamps SQLite writes."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class JobService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def enqueue(self, kind: str, note_id: UUID | None = None) -> None:
+        """Stage a job in the caller's transaction, unless the same one is already pending.
+
+        Jobs only read current state when they run, so one pending job per
+        (kind, note) covers any number of writes made before it starts.
+        """
+        pending = await self.db.execute(
+            select(Job.id)
+            .where(Job.kind == kind, Job.note_id == note_id, Job.status == JobStatus.PENDING)
+            .limit(1)
+        )
+        if pending.first() is None:
+            self.db.add(Job(kind=kind, note_id=note_id, run_after=_utcnow()))
+
+    async def status(self) -> JobQueueStatus:
+        counts = await self.db.execute(select(Job.status, func.count()).group_by(Job.status))
+        by_status = {status.value: count for status, count in counts.tuples().all()}
+        oldest = await self.db.execute(
+            select(func.min(Job.created_at)).where(Job.status == JobStatus.PENDING)
+        )
+        failures = await self.db.execute(
+            select(Job)
+            .where(Job.status == JobStatus.FAILED)
+            .order_by(Job.id.desc())
+            .limit(RECENT_FAILURES)
+        )
+        return JobQueueStatus(
+            pending=by_status.get(JobStatus.PENDING.value, 0),
+            running=by_status.get(JobStatus.RUNNING.value, 0),
+            failed=by_status.get(JobStatus.FAILED.value, 0),
+            oldest_pending_at=oldest.scalar_one(),
+            runner_active=job_runner.running,
+            in_flight=job_runner.in_flight,
+            recent_failures=[JobResponse.model_validate(job) for job in failures.scalars()],
+        )
+
+
+async def execute_job(db: AsyncSession, job_id: int, kind: str, note_id: UUID | None) -> bool:
+    """Run one claimed job; delete it on success, otherwise schedule a retry or fail it."""
+    try:
+        handler = JOB_HANDLERS.get(kind)
+        if handler is None:
+            raise LookupError(f"No handler registered for job kind {kind!r}")
+        await handler(db, note_id)
+    except Exception as exc:
+        await db.rollback()
+        logger.exception("Job %s (%s, note %s) failed", job_id, kind, note_id)
+        await _record_failure(db, job_id, exc)
+        return False
+
+    await db.execute(delete(Job).where(Job.id == job_id))
+    await db.commit()
+    return True
+
+
+async def run_pending_jobs(db: AsyncSession) -> int:
+    """Run every due job inline, one at a time; for tests and maintenance scripts."""
+    ran = 0
+    while claimed := await _claim(db, 1, set()):
+        job_id, kind, note_id = claimed[0]
+        await execute_job(db, job_id, kind, note_id)
+        ran += 1
+    return ran
+
+
+async def _claim(
+    db: AsyncSession, limit: int, busy: set[JobKey]
+) -> list[tuple[int, str, UUID | None]]:
+    """Mark up to ``limit`` due jobs as running, skipping keys that are already running.
+
+    The UPDATE only takes rows still pending, so when another runner claims a job
+    between the SELECT and the UPDATE it is not returned, and not run twice.
+    """
+    result = await db.execute(
+        select(Job.id, Job.kind, Job.note_id)
+        .where(Job.status == JobStatus.PENDING, Job.run_after <= _utcnow())
+        .order_by(Job.id)
+        .limit(limit + len(busy))
+    )
+    chosen = []
+    taken = set(busy)
+    for job_id, kind, note_id in result.tuples():
+        if (kind, note_id) in taken:
+            continue
+        taken.add((kind, note_id))
+        chosen.append(job_id)
+        if len(chosen) == limit:
+            break
+    if not chosen:
+        return []
+    claimed = await db.execute(
+        update(Job)
+        .where(Job.id.in_(chosen), Job.status == JobStatus.PENDING)
+        .values(status=JobStatus.RUNNING)
+        .returning(Job.id, Job.kind, Job.note_id)
+    )
+    rows = sorted(claimed.tuples().all())
+    await db.commit()
+    return rows
+
+
+async def _record_failure(db: AsyncSession, job_id: int, exc: Exception) -> None:
+    job = await db.get(Job, job_id)
+    if job is None:
+        return
+    superseded = await db.execute(
+        select(Job.id)
+        .where(
+            Job.kind == job.kind,
+            Job.note_id == job.note_id,
+            Job.status == JobStatus.PENDING,
+            Job.id != job_id,
+        )
+        .limit(1)
+    )
+    if superseded.first() is not None:
+        # A newer pending job will redo this work against fresher state
+        await db.delete(job)
+        await db.commit()
+        return
+
+    job.attempts += 1
+    job.last_error = f"{type(exc).__name__}: {exc}"
+    if job.attempts >= settings.JOB_MAX_ATTEMPTS:
+        job.status = JobStatus.FAILED
+    else:
+        job.status = JobStatus.PENDING
+        backoff = settings.JOB_RETRY_BASE_SECONDS * 2 ** (job.attempts - 1)
+        job.run_after = _utcnow() + timedelta(seconds=backoff)
+    await db.commit()
+
+
+class JobRunner:
+    """Runs queued jobs on the event loop with bounded concurrency.
+
+    Started and stopped by the app lifespan. Jobs are claimed from the ``jobs``
+    table, so work queued before a restart, or left ``running`` by a crash, is
+    picked up on the next start. At most one job per (kind, note) runs at a time,
+    and failures are retried with exponential backoff up to ``JOB_MAX_ATTEMPTS``.
+    """
+
+    def __init__(self, session_factory: SessionFactory, concurrency: int):
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self._dispatcher: asyncio.Task[None] | None = None
+        self._wake: asyncio.Event | None = None
+        self._active: dict[asyncio.Task[None], JobKey] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._dispatcher is not None
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._active)
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        async with self.session_factory() as db:
+            await db.execute(
+                update(Job).where(Job.status == JobStatus.RUNNING).values(status=JobStatus.PENDING)
+            )
+            await db.commit()
+        self._wake = asyncio.Event()
+        self._dispatcher = asyncio.create_task(self._dispatch(self._wake))
+
+    async def stop(self, grace: float = 0.0) -> None:
+        """Stop claiming work; give in-flight jobs ``grace`` seconds, then cancel them.
+
+        Cancelled jobs stay ``running`` in the table and are re-queued by ``start``.
+        """
+        dispatcher, self._dispatcher = self._dispatcher, None
+        if dispatcher is None:
+            return
+        # Clearing _wake also ends the loop if wait_for swallows the cancel (bpo-42130)
+        self._wake = None
+        dispatcher.cancel()
+        with suppress(asyncio.CancelledError):
+            await dispatcher
+
+        if self._active:
+            _, unfinished = await asyncio.wait(set(self._active), timeout=grace)
+            for task in unfinished:
+                task.cancel()
+            await asyncio.gather(*unfinished, return_exceptions=True)
+
+    def wake(self) -> None:
+        """Tell the dispatcher new work was committed; a no-op when not started."""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _dispatch(self, wake: asyncio.Event) -> None:
+        while wake is self._wake:
+            wake.clear()
+            delay = await self._fill()
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(wake.wait(), delay)
+
+    async def _fill(self) -> float:
+        """Start jobs for free slots; return how long to sleep before the next retry is due."""
+        async with self.session_factory() as db:
+            free = self.concurrency - len(self._active)
+            if free > 0:
+                for job_id, kind, note_id in await _claim(db, free, set(self._active.values())):
+                    task = asyncio.create_task(self._run(job_id, kind, note_id))
+                    self._active[task] = (kind, note_id)
+                    task.add_done_callback(self._finished)
+            # Due jobs left unclaimed are waiting on a busy slot or key; its completion wakes us
+            next_retry = await db.execute(
+                select(func.min(Job.run_after)).where(
+                    Job.status == JobStatus.PENDING, Job.run_after > _utcnow()
+                )
+            )
+            retry_at = next_retry.scalar_one()
+
+        poll = settings.JOB_POLL_INTERVAL_SECONDS
+        if retry_at is None:
+            return poll
+        return min(poll, max(0.0, (retry_at - _utcnow()).total_seconds()))
+
+    async def _run(self, job_id: int, kind: str, note_id: UUID | None) -> None:
+        async with self.session_factory() as db:
+            await execute_job(db, job_id, kind, note_id)
+
+    def _finished(self, task: asyncio.Task[None]) -> None:
+        self._active.pop(task, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Job worker crashed", exc_info=task.exception())
+        self.wake()
+
+
+job_runner = JobRunner(async_session_maker, settings.JOB_CONCURRENCY)
@@ -1,40 +1,124 @@
+import uuid
+from collections.abc import Sequence
+from typing import Any, get_args
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Select, bindparam, delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
 
+from app.models.change import ChangeEntity, ChangeOp
+from app.models.highlight import Highlight
 from app.models.note import CodeStage, Note
-from app.schemas.note import NoteCreate, NoteHighlightsUpdate, NoteUpdate
+from app.models.tag import note_tags
+from app.schemas.autocomplete import SuggestionKind
+from app.schemas.note import (
+    NoteBatch,
+    NoteCreate,
+    NoteDistilled,
+    NoteField,
+    NoteHighlightsUpdate,
+    NoteUpdate,
+)
+from app.schemas.tag import TagResponse
+from app.services.autocomplete_service import autocomplete_index
+from app.services.change_service import ChangeService
+from app.services.concurrency import versioned_write
+from app.services.dedup_service import DedupService
+from app.services.embedding_service import EmbeddingService, note_text, vector_index
+from app.services.filing_service import filing_model
+from app.services.highlight_service import rebase_highlights, replace_note_highlights
+from app.services.job_service import (
+    RECOMPUTE_RELATED,
+    RECORD_REVISION,
+    REFRESH_RELATED,
+    TRAIN_FILING,
+    JobService,
+    job_runner,
+)
+from app.services.related_service import RelatedNotesService
+from app.services.revision_service import REVISED_FIELDS, RevisionService
+from app.services.search_service import invalidate_search_cache
+from app.services.tag_service import notes_tagged_with
+from app.services.trigram_service import TrigramService
+
+# Built once at import, like the hot queries in search_service
+_NOTE_BY_ID = select(Note).where(Note.id == bindparam("note_id"))
+_NOTE_WITH_TAGS_BY_ID = _NOTE_BY_ID.options(selectinload(Note.tags))
 
 
 class NoteService:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.embeddings = EmbeddingService(db)
+        self.related = RelatedNotesService(db)
+        self.dedup = DedupService(db)
+        self.jobs = JobService(db)
+        self.changes = ChangeService(db)
+        self.trigrams = TrigramService(db)
+        self.revisions = RevisionService(db)
 
     async def create_note(self, note_in: NoteCreate) -> Note:
         note = Note(
+            id=uuid.uuid4(),
             title=note_in.title,
             content=note_in.content,
             source_url=note_in.source_url,
             source_type=note_in.source_type,
             code_stage=CodeStage.CAPTURE,
         )
+        signature = await self.dedup.signature(note_text(note))
+        note.duplicate_of_id = await self.dedup.find_duplicate(note.id, note.source_url, signature)
         self.db.add(note)
+        await self.dedup.write_signature(note.id, signature, is_new=True)
+        await self.trigrams.write_terms(note.id, note_text(note), is_new=True)
+        vector = await self.embeddings.write_note_embedding(note, is_new=True)
+        await self.jobs.enqueue(REFRESH_RELATED, note.id)
+        await self.jobs.enqueue(RECORD_REVISION, note.id)
+        await self.changes.record(ChangeEntity.NOTE, [note.id])
         await self.db.commit()
+        invalidate_search_cache()
+        vector_index.upsert(note.id, vector)
+        autocomplete_index.upsert(SuggestionKind.NOTE, note.id, note.title)
+        job_runner.wake()
         await self.db.refresh(note)
         return note
 
     async def get_note(self, note_id: UUID) -> Note | None:
-        result = await self.db.execute(select(Note).where(Note.id == note_id))
+        result = await self.db.execute(_NOTE_BY_ID, {"note_id": note_id})
+        return result.scalar_one_or_none()
+
+    async def get_note_with_tags(self, note_id: UUID) -> Note | None:
+        result = await self.db.execute(_NOTE_WITH_TAGS_BY_ID, {"note_id": note_id})
         return result.scalar_one_or_none()
 
+    async def get_notes_batch(
+        self, note_ids: Sequence[UUID], fields: Sequence[NoteField] | None = None
+    ) -> NoteBatch:
+        """Fetch many notes with one ``IN`` query, loading only the requested fields."""
+        requested = list(dict.fromkeys(note_ids))
+        selected = list(dict.fromkeys(["id", *(fields or get_args(NoteField))]))
+        columns = [getattr(Note, field) for field in selected if field != "tags"]
+        query = select(Note).options(load_only(*columns)).where(Note.id.in_(requested))
+        if "tags" in selected:
+            query = query.options(selectinload(Note.tags))
+        result = await self.db.execute(query)
+        found = {note.id: note for note in result.scalars()}
+        return NoteBatch(
+            notes=[_project(found[note_id], selected) for note_id in requested if note_id in found],
+            not_found=[note_id for note_id in requested if note_id not in found],
+        )
+
     async def list_notes(
         self,
         container_id: UUID | None = None,
         stage: str | None = None,
         q: str | None = None,
+        tags_all: list[str] | None = None,
+        tags_any: list[str] | None = None,
+        tags_none: list[str] | None = None,
     ) -> list[Note]:
-        query = select(Note)
+        query = select(Note).options(selectinload(Note.tags))
 
         if container_id:
             query = query.where(Note.container_id == container_id)
@@ -42,64 +126,192 @@ class NoteService:
             query = query.where(Note.code_stage == stage)
         if q:
             query = query.where(Note.title.ilike(f"%{q}%") | Note.content.ilike(f"%{q}%"))
+        if tags_all:
+            names = set(tags_all)
+            # One grouped pass over note_tags: keep notes that matched every requested tag
+            query = query.where(
+                Note.id.in_(
+                    notes_tagged_with(names)
+                    .group_by(note_tags.c.note_id)
+                    .having(func.count(note_tags.c.tag_id) == len(names))
+                )
+            )
+        if tags_any:
+            query = query.where(Note.id.in_(notes_tagged_with(set(tags_any))))
+        if tags_none:
+            query = query.where(Note.id.not_in(notes_tagged_with(set(tags_none))))
 
         query = query.order_by(Note.updated_at.desc())
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
-    async def update_note(self, note_id: UUID, note_in: NoteUpdate) -> Note | None:
+    async def get_distilled(self, note_id: UUID) -> NoteDistilled | None:
+        result = await self.db.execute(_distilled_columns().where(Note.id == note_id))
+        row = result.one_or_none()
+        return NoteDistilled.model_validate(row) if row else None
+
+    async def list_distilled(
+        self,
+        container_id: UUID | None = None,
+        stage: str | None = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[NoteDistilled]:
+        """Distilled projections of notes that have at least one L2 excerpt."""
+        query = _distilled_columns().where(Note.l2_excerpt.is_not(None))
+        if container_id:
+            query = query.where(Note.container_id == container_id)
+        if stage:
+            query = query.where(Note.code_stage == stage)
+
+        query = query.order_by(Note.updated_at.desc()).limit(limit).offset(offset)
+        result = await self.db.execute(query)
+        return [NoteDistilled.model_validate(row) for row in result.all()]
+
+    async def update_note(
+        self, note_id: UUID, note_in: NoteUpdate, expected_version: int | None = None
+    ) -> Note | None:
         note = await self.get_note(note_id)
         if not note:
             return None
 
-        update_data = note_in.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(note, field, value)
+        async with versioned_write(self.db, ChangeEntity.NOTE, note.version, expected_version):
+            old_content = note.content
+            update_data = note_in.model_dump(exclude_unset=True)
+            for field, value in update_data.items():
+                setattr(note, field, value)
+            if note.highlights and note.content != old_content:
+                note.highlights = {
+                    "highlights": rebase_highlights(
+                        old_content, note.content, note.highlights.get("highlights", [])
+                    )
+                }
+                await replace_note_highlights(self.db, note, rebased=True)
+                await self.changes.record(ChangeEntity.HIGHLIGHTS, [note.id])
+            # Write the note row now, so a lost race fails before the embedding work
+            await self.db.flush()
+            text_changed = "title" in update_data or "content" in update_data
+            if text_changed:
+                vector = await self.embeddings.write_note_embedding(note)
+                signature = await self.dedup.signature(note_text(note))
+                await self.dedup.write_signature(note.id, signature)
+                await self.trigrams.write_terms(note.id, note_text(note))
+                await self.jobs.enqueue(REFRESH_RELATED, note.id)
+                if note.container_id is not None:
+                    await self.jobs.enqueue(TRAIN_FILING)
+            revised = not update_data.keys().isdisjoint(REVISED_FIELDS)
+            if revised:
+                await self.jobs.enqueue(RECORD_REVISION, note.id)
+            await self.changes.record(ChangeEntity.NOTE, [note.id])
+            await self.db.commit()
 
-        await self.db.commit()
+        if text_changed:
+            invalidate_search_cache()
+            vector_index.upsert(note.id, vector)
+            autocomplete_index.upsert(SuggestionKind.NOTE, note.id, note.title)
+            if note.container_id is not None:
+                filing_model.touch(note.container_id)
+        if revised or (text_changed and note.container_id is not None):
+            job_runner.wake()
         await self.db.refresh(note)
         return note
 
-    async def move_to_container(self, note_id: UUID, container_id: UUID | None) -> Note | None:
+    async def restore_revision(
+        self, note_id: UUID, revision: int, expected_version: int | None = None
+    ) -> Note | None:
+        """Write a past revision's text back as a new edit, so the restore is undoable too."""
+        restored = await self.revisions.get_revision(note_id, revision)
+        if not restored:
+            return None
+        note_in = NoteUpdate(
+            title=restored.title, content=restored.content, content_html=restored.content_html
+        )
+        return await self.update_note(note_id, note_in, expected_version)
+
+    async def move_to_container(
+        self, note_id: UUID, container_id: UUID | None, expected_version: int | None = None
+    ) -> Note | None:
         note = await self.get_note(note_id)
         if not note:
             return None
 
-        note.container_id = container_id
+        async with versioned_write(self.db, ChangeEntity.NOTE, note.version, expected_version):
+            note.container_id = container_id
 
-        # Update code_stage based on destination
-        if container_id is None:
-            # Moving to inbox - set to capture
-            note.code_stage = CodeStage.CAPTURE
-        elif note.code_stage == CodeStage.CAPTURE:
-            # Moving from inbox to container - set to organize
-            note.code_stage = CodeStage.ORGANIZE
+            # Update code_stage based on destination
+            if container_id is None:
+                # Moving to inbox - set to capture
+                note.code_stage = CodeStage.CAPTURE
+            elif note.code_stage == CodeStage.CAPTURE:
+                # Moving from inbox to container - set to organize
+                note.code_stage = CodeStage.ORGANIZE
 
-        await self.db.commit()
+            await self.jobs.enqueue(TRAIN_FILING)
+            await self.changes.record(ChangeEntity.NOTE, [note.id])
+            await self.db.commit()
+        filing_model.assign(note.id, container_id)
+        job_runner.wake()
         await self.db.refresh(note)
         return note
 
     async def update_highlights(
-        self, note_id: UUID, highlights_in: NoteHighlightsUpdate
+        self,
+        note_id: UUID,
+        highlights_in: NoteHighlightsUpdate,
+        expected_version: int | None = None,
     ) -> Note | None:
         note = await self.get_note(note_id)
         if not note:
             return None
 
-        note.highlights = {"highlights": [h.model_dump() for h in highlights_in.highlights]}
-
-        if note.code_stage in (CodeStage.CAPTURE, CodeStage.ORGANIZE):
-            note.code_stage = CodeStage.DISTILL
+        async with versioned_write(self.db, ChangeEntity.NOTE, note.version, expected_version):
+            note.highlights = {"highlights": [h.model_dump() for h in highlights_in.highlights]}
+            if note.code_stage in (CodeStage.CAPTURE, CodeStage.ORGANIZE):
+                note.code_stage = CodeStage.DISTILL
+            await replace_note_highlights(self.db, note)
 
-        await self.db.commit()
+            await self.changes.record(ChangeEntity.NOTE, [note.id])
+            await self.changes.record(ChangeEntity.HIGHLIGHTS, [note.id])
+            await self.db.commit()
         await self.db.refresh(note)
         return note
 
-    async def delete_note(self, note_id: UUID) -> bool:
+    async def delete_note(self, note_id: UUID, expected_version: int | None = None) -> bool:
         note = await self.get_note(note_id)
         if not note:
             return False
 
-        await self.db.delete(note)
-        await self.db.commit()
+        async with versioned_write(self.db, ChangeEntity.NOTE, note.version, expected_version):
+            await self.db.execute(delete(Highlight).where(Highlight.note_id == note_id))
+            await self.embeddings.delete_note_embedding(note_id)
+            await self.dedup.delete_signature(note_id)
+            await self.trigrams.delete_terms(note_id)
+            await self.revisions.delete_revisions(note_id)
+            unlinked = await self.dedup.forget_duplicate_links(note_id)
+            await self.changes.record(ChangeEntity.NOTE, unlinked)
+            await self.changes.record(ChangeEntity.NOTE, [note_id], ChangeOp.DELETE)
+            await self.changes.record(ChangeEntity.HIGHLIGHTS, [note_id], ChangeOp.DELETE)
+            for affected_id in await self.related.detach(note_id):
+                await self.jobs.enqueue(RECOMPUTE_RELATED, affected_id)
+            if note.container_id is not None:
+                await self.jobs.enqueue(TRAIN_FILING)
+            await self.db.delete(note)
+            await self.db.commit()
+        invalidate_search_cache()
+        vector_index.remove(note_id)
+        autocomplete_index.remove(note_id)
+        filing_model.assign(note_id, None)
+        job_runner.wake()
         return True
+
+
+def _project(note: Note, fields: list[str]) -> dict[str, Any]:
+    projected = {field: getattr(note, field) for field in fields if field != "tags"}
+    if "tags" in fields:
+        projected["tags"] = [TagResponse.model_validate(tag) for tag in note.tags]
+    return projected
+
+
+def _distilled_columns() -> Select[tuple[Any, ...]]:
+    """Select only the columns NoteDistilled needs, so note bodies never leave the DB."""
+    return select(*(getattr(Note, name) for name in NoteDistilled.model_fields))
@@ -0,0 +1,185 @@
+import asyncio
+from collections.abc import Iterable
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import Row, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.neighbor import NoteNeighbor
+from app.models.note import CodeStage, Note
+from app.schemas.note import RelatedNote
+from app.services.embedding_service import EmbeddingService, vector_index
+from app.services.vector_index import Vector
+
+
+class RelatedNotesService:
+    """Maintains per-note top-k neighbour lists so "related notes" is one indexed read.
+
+    When a note changes only its neighbourhood is refreshed: the note's own list,
+    lists that already contained it, and lists it now qualifies for. Candidates for
+    the last group come from the note's ``RELATED_CANDIDATE_POOL`` most similar
+    notes, which is exact for every list whose k-th score lies above the pool cutoff.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.k = settings.RELATED_TOP_K
+
+    async def get_related(
+        self, note_id: UUID, limit: int = 10, exclude_same_container: bool = False
+    ) -> list[RelatedNote] | None:
+        source = await self.db.execute(select(Note.container_id).where(Note.id == note_id))
+        container_row = source.one_or_none()
+        if container_row is None:
+            return None
+
+        rows = await self._read(note_id, limit, container_row.container_id, exclude_same_container)
+        if not rows and not await self._has_list(note_id):
+            # Notes written before neighbour lists existed are filled in on first read
+            await self.refresh_note(note_id)
+            rows = await self._read(
+                note_id, limit, container_row.container_id, exclude_same_container
+            )
+        return [RelatedNote.model_validate(row) for row in rows]
+
+    async def refresh_note(self, note_id: UUID) -> None:
+        """Recompute the neighbourhood around a created or edited note and commit.
+
+        The candidate pool is scored once, off the event loop. The note's own list
+        comes from the pool and each affected list is patched with one dot product;
+        only a full list the note dropped out of is rescanned, since its new k-th
+        neighbour may be a note it never stored.
+        """
+        await EmbeddingService(self.db).ensure_index()
+        vector = vector_index.vector(note_id)
+        if vector is None:
+            return
+
+        [pool] = await asyncio.to_thread(
+            vector_index.exact_neighbors, vector[None, :], settings.RELATED_CANDIDATE_POOL
+        )
+        pool_scores = {other: score for other, score in pool if other != note_id}
+
+        listed_by = await self.db.execute(
+            select(NoteNeighbor.note_id).where(NoteNeighbor.neighbor_id == note_id)
+        )
+        affected = set(listed_by.scalars().all())
+
+        thresholds = await self.db.execute(
+            select(NoteNeighbor.note_id, func.min(NoteNeighbor.score), func.count())
+            .where(NoteNeighbor.note_id.in_(list(pool_scores)))
+            .group_by(NoteNeighbor.note_id)
+        )
+        for other, kth_score, size in thresholds.all():
+            if size < self.k or pool_scores[other] > kth_score:
+                affected.add(other)
+        affected.discard(note_id)
+
+        stored = await self.db.execute(
+            select(NoteNeighbor.note_id, NoteNeighbor.neighbor_id, NoteNeighbor.score).where(
+                NoteNeighbor.note_id.in_(affected)
+            )
+        )
+        old_lists: dict[UUID, dict[UUID, float]] = {other: {} for other in affected}
+        for other, neighbor_id, score in stored.tuples():
+            old_lists[other][neighbor_id] = score
+
+        lists = {note_id: list(pool_scores.items())}
+        rescan = []
+        for other, neighbors in old_lists.items():
+            other_vector = vector_index.vector(other)
+            if other_vector is None:
+                continue
+            score = float(vector @ other_vector)
+            kth_score = min(neighbors.values(), default=-np.inf)
+            was_listed = neighbors.pop(note_id, None) is not None
+            if was_listed and len(neighbors) + 1 >= self.k and score < kth_score:
+                rescan.append(other)
+                continue
+            neighbors[note_id] = score
+            lists[other] = list(neighbors.items())
+        await self._replace_lists(lists)
+        await self.recompute(rescan)
+        await self.db.commit()
+
+    async def detach(self, note_id: UUID) -> set[UUID]:
+        """Drop all rows mentioning a note about to be deleted; returns lists to recompute."""
+        listed_by = await self.db.execute(
+            select(NoteNeighbor.note_id).where(NoteNeighbor.neighbor_id == note_id)
+        )
+        affected = set(listed_by.scalars().all()) - {note_id}
+        await self.db.execute(
+            delete(NoteNeighbor).where(
+                (NoteNeighbor.note_id == note_id) | (NoteNeighbor.neighbor_id == note_id)
+            )
+        )
+        return affected
+
+    async def recompute(self, note_ids: Iterable[UUID]) -> None:
+        """Replace the lists of ``note_ids`` using one batched similarity pass; no commit."""
+        vectors: dict[UUID, Vector] = {}
+        for note_id in note_ids:
+            vector = vector_index.vector(note_id)
+            if vector is not None:
+                vectors[note_id] = vector
+        if not vectors:
+            return
+        queries = np.stack(list(vectors.values()))
+        neighbor_lists = await asyncio.to_thread(vector_index.exact_neighbors, queries, self.k + 1)
+        await self._replace_lists(dict(zip(vectors, neighbor_lists, strict=True)))
+
+    async def _replace_lists(self, lists: dict[UUID, list[tuple[UUID, float]]]) -> None:
+        """Store the best ``k`` scored candidates of each note as its list; no commit."""
+        if not lists:
+            return
+        await self.db.execute(delete(NoteNeighbor).where(NoteNeighbor.note_id.in_(list(lists))))
+        rows: list[dict[str, object]] = []
+        for note_id, candidates in lists.items():
+            ranked = sorted(
+                (
+                    (other, score)
+                    for other, score in candidates
+                    if other != note_id and score >= settings.SEMANTIC_MIN_SCORE
+                ),
+                key=lambda pair: pair[1],
+                reverse=True,
+            )[: self.k]
+            rows.extend(
+                {"note_id": note_id, "neighbor_id": other, "rank": rank, "score": score}
+                for rank, (other, score) in enumerate(ranked, start=1)
+            )
+        if rows:
+            await self.db.execute(insert(NoteNeighbor), rows)
+
+    async def _read(
+        self,
+        note_id: UUID,
+        limit: int,
+        container_id: UUID | None,
+        exclude_same_container: bool,
+    ) -> list[Row[tuple[UUID, str, UUID | None, CodeStage, float]]]:
+        query = (
+            select(
+                Note.id,
+                Note.title,
+                Note.container_id,
+                Note.code_stage,
+                NoteNeighbor.score,
+            )
+            .join(Note, Note.id == NoteNeighbor.neighbor_id)
+            .where(NoteNeighbor.note_id == note_id)
+            .order_by(NoteNeighbor.rank)
+            .limit(limit)
+        )
+        if exclude_same_container and container_id is not None:
+            query = query.where(Note.container_id.is_(None) | (Note.container_id != container_id))
+        result = await self.db.execute(query)
+        return list(result.all())
+
+    async def _has_list(self, note_id: UUID) -> bool:
+        result = await self.db.execute(
+            select(NoteNeighbor.note_id).where(NoteNeighbor.note_id == note_id).limit(1)
+        )
+        return result.first() is not None
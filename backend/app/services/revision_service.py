@@ -0,0 +1,259 @@
+import json
+import zlib
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.note import Note
+from app.models.revision import NoteRevision, RevisionKind
+from app.schemas.revision import NoteRevisionContent, NoteRevisionInfo, RevisionStorageStats
+
+# Text fields kept in the history; an edit that changes none of them adds no revision
+REVISED_FIELDS = ("title", "content", "content_html")
+
+Fields = dict[str, str | None]
+# Per changed field: None to clear it, else (prefix kept, suffix kept, text in between)
+Delta = dict[str, tuple[int, int, str] | None]
+
+
+def _utcnow() -> datetime:
+    """Naive UTC, matching the ``func.now()`` timestamps SQLite writes."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _encode(data: Any) -> bytes:
+    return zlib.compress(json.dumps(data, separators=(",", ":")).encode())
+
+
+def _decode(payload: bytes) -> Any:
+    return json.loads(zlib.decompress(payload))
+
+
+def _common_prefix(a: str, b: str, limit: int) -> int:
+    # Bisecting on slice equality keeps the character comparisons in C
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid :] == b[len(b) - mid :]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def diff_fields(old: Fields, new: Fields) -> Delta:
+    """Edits turning ``old`` into ``new``, for the fields that differ.
+
+    Each keeps the common prefix and suffix of the old and new text and stores
+    only the text between, which is compact for the localized edits of an autosave.
+    """
+    delta: Delta = {}
+    for name in REVISED_FIELDS:
+        before, after = old.get(name), new.get(name)
+        if before == after:
+            continue
+        if after is None:
+            delta[name] = None
+            continue
+        before = before or ""
+        prefix = _common_prefix(before, after, min(len(before), len(after)))
+        limit = min(len(before), len(after)) - prefix
+        suffix = _common_suffix(before, after, limit)
+        delta[name] = (prefix, suffix, after[prefix : len(after) - suffix])
+    return delta
+
+
+def apply_delta(fields: Fields, delta: Delta) -> Fields:
+    applied = dict(fields)
+    for name, edit in delta.items():
+        if edit is None:
+            applied[name] = None
+            continue
+        prefix, suffix, inserted = edit
+        before = applied.get(name) or ""
+        applied[name] = before[:prefix] + inserted + before[len(before) - suffix :]
+    return applied
+
+
+def _replay(chain: Sequence[NoteRevision]) -> Fields:
+    fields: Fields = _decode(chain[0].payload)
+    for revision in chain[1:]:
+        fields = apply_delta(fields, _decode(revision.payload))
+    return fields
+
+
+def _full_bytes(fields: Fields) -> int:
+    return sum(len(value.encode()) for value in fields.values() if value)
+
+
+class RevisionService:
+    """Note history as periodic full snapshots with compact deltas between them.
+
+    Reading a revision replays at most ``REVISION_SNAPSHOT_INTERVAL`` payloads:
+    the latest snapshot at or before it and the deltas after that snapshot.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def record(self, note_id: UUID) -> NoteRevision | None:
+        """Stage the note's current text as a new revision, then apply retention.
+
+        Runs as a background job after edits; it records nothing if the note is
+        gone or its text matches the latest revision. The caller commits.
+        """
+        result = await self.db.execute(
+            select(Note.version, *(getattr(Note, name) for name in REVISED_FIELDS)).where(
+                Note.id == note_id
+            )
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        current: Fields = {name: getattr(row, name) for name in REVISED_FIELDS}
+
+        chain = await self._chain(note_id)
+        kind, payload = RevisionKind.SNAPSHOT, _encode(current)
+        if chain:
+            if chain[-1].revision >= row.version:
+                return None
+            delta = diff_fields(_replay(chain), current)
+            if not delta:
+                return None
+            delta_payload = _encode(delta)
+            # A rewrite may store no smaller as a delta; a snapshot then also ends the chain
+            chain_full = len(chain) >= settings.REVISION_SNAPSHOT_INTERVAL
+            if not chain_full and len(delta_payload) < len(payload):
+                kind, payload = RevisionKind.DELTA, delta_payload
+
+        revision = NoteRevision(
+            note_id=note_id,
+            revision=row.version,
+            kind=kind,
+            payload=payload,
+            full_bytes=_full_bytes(current),
+        )
+        self.db.add(revision)
+        await self.db.flush()
+        await self.prune(note_id)
+        return revision
+
+    async def list_revisions(self, note_id: UUID) -> list[NoteRevisionInfo] | None:
+        """The note's revisions, newest first; None if the note does not exist."""
+        if await self.db.scalar(select(Note.id).where(Note.id == note_id)) is None:
+            return None
+        result = await self.db.execute(
+            select(
+                NoteRevision.revision,
+                NoteRevision.kind,
+                func.length(NoteRevision.payload).label("stored_bytes"),
+                NoteRevision.full_bytes,
+                NoteRevision.created_at,
+            )
+            .where(NoteRevision.note_id == note_id)
+            .order_by(NoteRevision.revision.desc())
+        )
+        return [NoteRevisionInfo.model_validate(row) for row in result.all()]
+
+    async def get_revision(self, note_id: UUID, revision: int) -> NoteRevisionContent | None:
+        chain = await self._chain(note_id, revision)
+        if not chain or chain[-1].revision != revision:
+            return None
+        fields = _replay(chain)
+        return NoteRevisionContent(
+            revision=revision,
+            title=fields["title"] or "",
+            content=fields["content"] or "",
+            content_html=fields["content_html"],
+            created_at=chain[-1].created_at,
+        )
+
+    async def prune(self, note_id: UUID) -> int:
+        """Drop revisions past the retention count or age, returning how many.
+
+        The latest revision is always kept. If the oldest kept one is a delta,
+        it is rewritten as a snapshot first, since its base is being dropped.
+        """
+        result = await self.db.execute(
+            select(NoteRevision.revision, NoteRevision.created_at)
+            .where(NoteRevision.note_id == note_id)
+            .order_by(NoteRevision.revision.desc())
+        )
+        revisions = list(result.tuples())
+        kept = revisions[: max(settings.REVISION_RETENTION_COUNT, 1)]
+        if settings.REVISION_RETENTION_DAYS:
+            cutoff = _utcnow() - timedelta(days=settings.REVISION_RETENTION_DAYS)
+            kept = kept[:1] + [(rev, at) for rev, at in kept[1:] if at >= cutoff]
+        if len(kept) == len(revisions):
+            return 0
+
+        oldest = kept[-1][0]
+        chain = await self._chain(note_id, oldest)
+        if chain[-1].kind is RevisionKind.DELTA:
+            chain[-1].payload = _encode(_replay(chain))
+            chain[-1].kind = RevisionKind.SNAPSHOT
+        await self.db.execute(
+            delete(NoteRevision).where(
+                NoteRevision.note_id == note_id, NoteRevision.revision < oldest
+            )
+        )
+        return len(revisions) - len(kept)
+
+    async def delete_revisions(self, note_id: UUID) -> None:
+        await self.db.execute(delete(NoteRevision).where(NoteRevision.note_id == note_id))
+
+    async def storage_stats(self) -> RevisionStorageStats:
+        result = await self.db.execute(
+            select(
+                func.count(func.distinct(NoteRevision.note_id)),
+                func.count(),
+                func.coalesce(
+                    func.sum(case((NoteRevision.kind == RevisionKind.SNAPSHOT, 1), else_=0)), 0
+                ),
+                func.coalesce(func.sum(func.length(NoteRevision.payload)), 0),
+                func.coalesce(func.sum(NoteRevision.full_bytes), 0),
+            )
+        )
+        notes, revisions, snapshots, stored, full = result.one()
+        return RevisionStorageStats(
+            notes=notes,
+            revisions=revisions,
+            snapshots=snapshots,
+            deltas=revisions - snapshots,
+            stored_bytes=stored,
+            full_bytes=full,
+            overhead_ratio=stored / full if full else 0.0,
+        )
+
+    async def _chain(self, note_id: UUID, up_to: int | None = None) -> list[NoteRevision]:
+        """The latest snapshot at or before ``up_to`` and the revisions after it, oldest first."""
+        bounds = [NoteRevision.note_id == note_id]
+        if up_to is not None:
+            bounds.append(NoteRevision.revision <= up_to)
+        snapshot = (
+            select(func.max(NoteRevision.revision))
+            .where(*bounds, NoteRevision.kind == RevisionKind.SNAPSHOT)
+            .scalar_subquery()
+        )
+        result = await self.db.execute(
+            select(NoteRevision)
+            .where(*bounds, NoteRevision.revision >= snapshot)
+            .order_by(NoteRevision.revision)
+        )
+        return list(result.scalars().all())
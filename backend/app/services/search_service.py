@@ -1,7 +1,176 @@
-from sqlalchemy import select
+import asyncio
+import re
+import time
+from collections import Counter, OrderedDict
+from itertools import islice
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import (
+    CTE,
+    ColumnElement,
+    Select,
+    String,
+    bindparam,
+    case,
+    cast,
+    func,
+    literal,
+    null,
+    select,
+    union_all,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import QueryableAttribute
 
+from app.config import settings
+from app.models.container import Container, ContainerType
 from app.models.note import CodeStage, Note
+from app.models.tag import Tag, note_tags
+from app.schemas.note import NoteResponse
+from app.schemas.search import (
+    FacetCount,
+    FacetedSearchResponse,
+    HybridSearchOptions,
+    SearchFacets,
+    SearchHit,
+    SearchMode,
+    TextSpan,
+)
+from app.services.embedding_service import EmbeddingService, get_embedder, vector_index
+from app.services.single_flight import coalesced_read
+from app.services.tag_service import notes_tagged_with
+from app.services.trigram_service import TrigramService
+from app.services.vector_index import Vector
+
+
+class SearchMatchCache:
+    """LRU of query -> matched note IDs, so filtered follow-ups reuse the first scan.
+
+    Entries expire after ``ttl`` seconds and the whole cache is dropped whenever
+    note text changes (see ``invalidate_search_cache``).
+    """
+
+    def __init__(self, ttl: float, max_entries: int, max_ids: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_ids = max_ids
+        self._entries: OrderedDict[str, tuple[float, list[UUID]]] = OrderedDict()
+
+    def get(self, query: str) -> list[UUID] | None:
+        entry = self._entries.get(query)
+        if entry is None:
+            return None
+        stored_at, ids = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[query]
+            return None
+        self._entries.move_to_end(query)
+        return ids
+
+    def put(self, query: str, ids: list[UUID]) -> None:
+        if len(ids) > self.max_ids:
+            return
+        self._entries[query] = (time.monotonic(), ids)
+        self._entries.move_to_end(query)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+search_match_cache = SearchMatchCache(
+    ttl=settings.SEARCH_CACHE_TTL_SECONDS,
+    max_entries=settings.SEARCH_CACHE_MAX_ENTRIES,
+    max_ids=settings.SEARCH_CACHE_MAX_IDS,
+)
+
+
+def invalidate_search_cache() -> None:
+    """Drop cached match sets; called whenever a note's title or content changes."""
+    search_match_cache.clear()
+
+
+def _text_match(query: str) -> ColumnElement[bool]:
+    return Note.title.ilike(f"%{query}%") | Note.content.ilike(f"%{query}%")
+
+
+_TERM = re.compile(r"\w+")
+_WHITESPACE = re.compile(r"\s+")
+_SNIPPET_MAX_MATCHES = 256
+
+
+def build_snippet(text: str, query: str, width: int) -> tuple[str, list[TextSpan]]:
+    """Excerpt of about ``width`` chars covering the most distinct query terms.
+
+    Terms match as case-insensitive substrings, like the keyword search itself.
+    Only the first ``_SNIPPET_MAX_MATCHES`` occurrences are weighed, so a long
+    note costs one bounded scan. Text without any term yields its opening.
+    """
+    terms = sorted({term.lower() for term in _TERM.findall(query)}, key=len, reverse=True)
+    pattern = re.compile("|".join(map(re.escape, terms)), re.IGNORECASE) if terms else None
+    hits = list(islice(pattern.finditer(text), _SNIPPET_MAX_MATCHES)) if pattern else []
+
+    anchor = _densest_window(hits, width) if hits else 0
+    start = max(0, anchor - width // 4)
+    if start > 0:
+        boundary = _WHITESPACE.search(text, start, anchor)
+        start = boundary.end() if boundary else anchor
+    end = min(len(text), start + width)
+    if end < len(text):
+        cut = text.rfind(" ", anchor, end)
+        end = cut if cut > anchor else end
+
+    prefix = "… " if start > 0 else ""
+    excerpt = prefix + _WHITESPACE.sub(" ", text[start:end]).strip()
+    if end < len(text):
+        excerpt += " …"
+    highlights = (
+        [TextSpan(start=m.start(), end=m.end()) for m in pattern.finditer(excerpt, len(prefix))]
+        if pattern
+        else []
+    )
+    return excerpt, highlights
+
+
+def _densest_window(hits: list[re.Match[str]], width: int) -> int:
+    """Start offset of the first ``width``-char window holding the most distinct terms."""
+    counts: Counter[str] = Counter()
+    best, best_start, left = 0, hits[0].start(), 0
+    for hit in hits:
+        counts[hit.group().lower()] += 1
+        while hit.end() - hits[left].start() > width:
+            term = hits[left].group().lower()
+            counts[term] -= 1
+            if not counts[term]:
+                del counts[term]
+            left += 1
+        if len(counts) > best:
+            best, best_start = len(counts), hits[left].start()
+    return best_start
+
+
+def reciprocal_rank_fusion(
+    rankings: list[tuple[list[UUID], float]], k: int = 60
+) -> list[tuple[UUID, float]]:
+    """Fuse ranked ID lists: score(d) = sum of weight / (k + rank) over the lists holding d."""
+    scores: dict[UUID, float] = {}
+    for ranked_ids, weight in rankings:
+        for rank, note_id in enumerate(ranked_ids, start=1):
+            scores[note_id] = scores.get(note_id, 0.0) + weight / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+# Built once at import: executing a prebuilt statement only binds parameters, skipping
+# construction and cache-key generation on every request (see evals/statement_cache.py)
+_INBOX = (
+    select(Note)
+    .where(Note.code_stage == CodeStage.CAPTURE)
+    .where(Note.container_id.is_(None))
+    .order_by(Note.captured_at.desc())
+)
+_RECENT = select(Note).order_by(Note.updated_at.desc()).limit(bindparam("limit"))
 
 
 class SearchService:
@@ -10,24 +179,261 @@ class SearchService:
 
     async def get_inbox(self) -> list[Note]:
         """Get all notes in capture stage (inbox)."""
+        result = await self.db.execute(_INBOX)
+        return list(result.scalars().all())
+
+    async def get_inbox_coalesced(self) -> list[NoteResponse]:
+        """``get_inbox``, shared by identical concurrent requests."""
+
+        async def read(db: AsyncSession) -> list[NoteResponse]:
+            return [
+                NoteResponse.model_validate(note) for note in await SearchService(db).get_inbox()
+            ]
+
+        return await coalesced_read(self.db, "inbox", (), read)
+
+    async def search(
+        self, query: str, mode: SearchMode, options: HybridSearchOptions, limit: int | None = None
+    ) -> list[Note]:
+        """Dispatch on ``mode``; keyword results are unbounded unless ``limit`` is given."""
+        if mode == SearchMode.KEYWORD:
+            return await self.search_notes(query, limit=limit)
+        limit = limit or 20
+        if mode == SearchMode.SEMANTIC:
+            return await self.search_semantic(query, limit=limit)
+        if mode == SearchMode.HYBRID:
+            return await self.search_hybrid(query, options, limit=limit)
+        return await self.search_fuzzy(query, limit=limit)
+
+    async def search_snippets(
+        self, query: str, mode: SearchMode, options: HybridSearchOptions, limit: int = 20
+    ) -> list[SearchHit]:
+        """Search results with a highlighted excerpt in place of the full note body."""
+        notes = await self.search(query, mode, options, limit)
+        hits = []
+        for note in notes:
+            snippet, highlights = build_snippet(note.content, query, settings.SEARCH_SNIPPET_CHARS)
+            hits.append(
+                SearchHit(
+                    id=note.id,
+                    title=note.title,
+                    container_id=note.container_id,
+                    code_stage=note.code_stage,
+                    updated_at=note.updated_at,
+                    snippet=snippet,
+                    highlights=highlights,
+                )
+            )
+        return hits
+
+    async def search_notes(self, query: str, limit: int | None = None) -> list[Note]:
+        """Full-text search across notes, most recently updated first."""
         result = await self.db.execute(
-            select(Note)
-            .where(Note.code_stage == CodeStage.CAPTURE)
-            .where(Note.container_id.is_(None))
-            .order_by(Note.captured_at.desc())
+            select(Note).where(_text_match(query)).order_by(Note.updated_at.desc()).limit(limit)
         )
         return list(result.scalars().all())
 
-    async def search_notes(self, query: str) -> list[Note]:
-        """Full-text search across notes."""
+    async def search_semantic(self, query: str, limit: int = 20) -> list[Note]:
+        """Rank notes by embedding similarity using the in-process vector index."""
+        await EmbeddingService(self.db).ensure_index()
+        hits = _vector_candidates(get_embedder().embed([query])[0], limit)
+        if not hits:
+            return []
+
+        result = await self.db.execute(select(Note).where(Note.id.in_([h[0] for h in hits])))
+        by_id = {note.id: note for note in result.scalars().all()}
+        return [by_id[note_id] for note_id, _ in hits if note_id in by_id]
+
+    async def search_fuzzy(self, query: str, limit: int = 20) -> list[Note]:
+        """Typo-tolerant search, ranked by trigram similarity to the query words."""
+        hits = await TrigramService(self.db).search(query, limit)
+        if not hits:
+            return []
+        result = await self.db.execute(select(Note).where(Note.id.in_([h[0] for h in hits])))
+        by_id = {note.id: note for note in result.scalars().all()}
+        return [by_id[note_id] for note_id, _ in hits if note_id in by_id]
+
+    async def search_hybrid(
+        self, query: str, options: HybridSearchOptions, limit: int = 20
+    ) -> list[Note]:
+        """Fuse keyword and vector candidates with weighted reciprocal rank fusion.
+
+        The query is embedded in a worker thread while keyword candidates come from
+        the database. The vector index itself is only read on the event loop, where
+        writes also happen, so a concurrent upsert cannot change it mid-scan.
+        Filters are applied to both candidate lists before fusion, so a
+        filtered-out note never takes up a fused slot.
+        """
+        await EmbeddingService(self.db).ensure_index()
+        keyword_ids, query_vector = await asyncio.gather(
+            self._keyword_candidates(query, options),
+            asyncio.to_thread(lambda: get_embedder().embed([query])[0]),
+        )
+        vector_hits = _vector_candidates(query_vector, options.pool_size)
+
+        allowed = await self.db.execute(
+            _filtered(select(Note.id), options).where(
+                Note.id.in_([note_id for note_id, _ in vector_hits])
+            )
+        )
+        allowed_ids = set(allowed.scalars().all())
+        vector_ids = [note_id for note_id, _ in vector_hits if note_id in allowed_ids]
+
+        fused = reciprocal_rank_fusion(
+            [(keyword_ids, options.keyword_weight), (vector_ids, options.semantic_weight)],
+            k=settings.HYBRID_RRF_K,
+        )[:limit]
+        if not fused:
+            return []
+        result = await self.db.execute(select(Note).where(Note.id.in_([f[0] for f in fused])))
+        by_id = {note.id: note for note in result.scalars().all()}
+        return [by_id[note_id] for note_id, _ in fused if note_id in by_id]
+
+    async def search_faceted(
+        self,
+        query: str,
+        stage: CodeStage | None = None,
+        container_type: ContainerType | None = None,
+        container_id: UUID | None = None,
+        tags: list[str] | None = None,
+    ) -> FacetedSearchResponse:
+        """Search with optional facet filters, returning results plus facet counts.
+
+        The text match runs once per query; its note IDs are cached so narrowing by
+        stage, container or tag only does primary-key lookups. All four facet
+        groups come back from one CTE-backed statement.
+        """
+        match_ids = await self._match_ids(query)
+        if not match_ids:
+            return FacetedSearchResponse(total=0, results=[], facets=SearchFacets())
+
+        matched = (
+            select(
+                Note.id.label("id"),
+                Note.code_stage.label("code_stage"),
+                Note.container_id.label("container_id"),
+                Container.type.label("container_type"),
+                Container.name.label("container_name"),
+            )
+            .outerjoin(Container, Container.id == Note.container_id)
+            .where(Note.id.in_(match_ids))
+        )
+        if stage:
+            matched = matched.where(Note.code_stage == stage)
+        if container_type:
+            matched = matched.where(Container.type == container_type)
+        if container_id:
+            matched = matched.where(Note.container_id == container_id)
+        for tag in set(tags or []):
+            matched = matched.where(Note.id.in_(notes_tagged_with({tag})))
+        facets = await self._facet_counts(matched.cte("matched"))
+
+        filtered_ids = select(matched.subquery().c.id)
         result = await self.db.execute(
-            select(Note)
-            .where(Note.title.ilike(f"%{query}%") | Note.content.ilike(f"%{query}%"))
-            .order_by(Note.updated_at.desc())
+            select(Note).where(Note.id.in_(filtered_ids)).order_by(Note.updated_at.desc())
         )
-        return list(result.scalars().all())
+        results = [NoteResponse.model_validate(note) for note in result.scalars().all()]
+        return FacetedSearchResponse(total=len(results), results=results, facets=facets)
 
     async def get_recent(self, limit: int = 20) -> list[Note]:
         """Get recently modified notes."""
-        result = await self.db.execute(select(Note).order_by(Note.updated_at.desc()).limit(limit))
+        result = await self.db.execute(_RECENT, {"limit": limit})
         return list(result.scalars().all())
+
+    async def get_recent_coalesced(self, limit: int = 20) -> list[NoteResponse]:
+        """``get_recent``, shared by identical concurrent requests."""
+
+        async def read(db: AsyncSession) -> list[NoteResponse]:
+            notes = await SearchService(db).get_recent(limit)
+            return [NoteResponse.model_validate(note) for note in notes]
+
+        return await coalesced_read(self.db, "recent", limit, read)
+
+    async def _keyword_candidates(self, query: str, options: HybridSearchOptions) -> list[UUID]:
+        """Keyword matches, title hits before body-only hits, then most recently updated."""
+        title_first = case((Note.title.ilike(f"%{query}%"), 0), else_=1)
+        result = await self.db.execute(
+            _filtered(select(Note.id), options)
+            .where(_text_match(query))
+            .order_by(title_first, Note.updated_at.desc())
+            .limit(options.pool_size)
+        )
+        return list(result.scalars().all())
+
+    async def _match_ids(self, query: str) -> list[UUID]:
+        ids = search_match_cache.get(query)
+        if ids is None:
+            result = await self.db.execute(select(Note.id).where(_text_match(query)))
+            ids = list(result.scalars().all())
+            search_match_cache.put(query, ids)
+        return ids
+
+    async def _facet_counts(self, matched: CTE) -> SearchFacets:
+        def group(
+            facet: str,
+            value: ColumnElement[Any] | QueryableAttribute[Any],
+            label: ColumnElement[Any],
+        ) -> Select[Any]:
+            return select(
+                literal(facet).label("facet"),
+                cast(value, String).label("value"),
+                label.label("label"),
+                func.count().label("count"),
+            )
+
+        stmt = union_all(
+            group("code_stage", matched.c.code_stage, null()).group_by(matched.c.code_stage),
+            group("container_type", matched.c.container_type, null()).group_by(
+                matched.c.container_type
+            ),
+            group("container", matched.c.container_id, matched.c.container_name).group_by(
+                matched.c.container_id, matched.c.container_name
+            ),
+            group("tag", Tag.name, null())
+            .select_from(matched)
+            .join(note_tags, note_tags.c.note_id == matched.c.id)
+            .join(Tag, Tag.id == note_tags.c.tag_id)
+            .group_by(Tag.name),
+        )
+        result = await self.db.execute(stmt)
+
+        facets = SearchFacets()
+        for facet, value, label, count in result.all():
+            getattr(facets, facet).append(
+                FacetCount(value=_facet_value(facet, value), label=label, count=count)
+            )
+        for counts in (facets.code_stage, facets.container_type, facets.container, facets.tag):
+            counts.sort(key=lambda c: (-c.count, c.value or ""))
+        return facets
+
+
+def _vector_candidates(query_vector: Vector, pool_size: int) -> list[tuple[UUID, float]]:
+    hits = vector_index.search(query_vector, pool_size)
+    return [(note_id, score) for note_id, score in hits if score >= settings.SEMANTIC_MIN_SCORE]
+
+
+def _filtered(stmt: Select[Any], options: HybridSearchOptions) -> Select[Any]:
+    if options.stage:
+        stmt = stmt.where(Note.code_stage == options.stage)
+    if options.container_id:
+        stmt = stmt.where(Note.container_id == options.container_id)
+    if options.container_type:
+        stmt = stmt.where(
+            Note.container_id.in_(
+                select(Container.id).where(Container.type == options.container_type)
+            )
+        )
+    return stmt
+
+
+def _facet_value(facet: str, value: str | None) -> str | None:
+    """Map raw column text back to API values (enum values, dashed UUIDs)."""
+    if value is None:
+        return None
+    if facet == "code_stage":
+        return CodeStage[value].value
+    if facet == "container_type":
+        return ContainerType[value].value
+    if facet == "container":
+        return str(UUID(value))
+    return value
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+from collections import Counter, defaultdict
+from collections.abc import Callable, Coroutine, Hashable
+from typing import Any, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.single_flight import SingleFlightStats
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task[Any]):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces identical concurrent reads: the first caller's query is shared by the rest.
+
+    The query runs in a task of its own, and callers wait on it through
+    ``asyncio.shield``, so a caller that is cancelled (a client disconnecting)
+    only stops waiting; the query is cancelled once nobody is left waiting. If
+    it fails, every caller waiting on it gets the error and the next call runs
+    a fresh query. ``invalidate`` is called after each committed write, so a
+    caller never joins a query that started before a write it may have made.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, _Flight] = {}
+        self._counters: defaultdict[str, Counter[str]] = defaultdict(Counter)
+        self._generation = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def invalidate(self) -> None:
+        self._generation += 1
+
+    def clear(self) -> None:
+        self._flights.clear()
+        self._counters.clear()
+
+    async def do(self, name: str, args: Hashable, read: Callable[[], Coroutine[Any, Any, T]]) -> T:
+        """Return ``read()``, shared with concurrent callers passing the same name and args."""
+        key = (name, args, self._generation)
+        counters = self._counters[name]
+        counters["calls"] += 1
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = self._launch(key, name, read)
+            counters["executed"] += 1
+        else:
+            counters["shared"] += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                # Unlisted first, so a caller arriving now starts over instead of joining
+                self._forget(key, flight)
+                flight.task.cancel()
+
+    def stats(self) -> list[SingleFlightStats]:
+        return [
+            SingleFlightStats(
+                name=name,
+                calls=counters["calls"],
+                executed=counters["executed"],
+                shared=counters["shared"],
+                failed=counters["failed"],
+                coalescing_ratio=counters["shared"] / counters["calls"],
+            )
+            for name, counters in sorted(self._counters.items())
+            if counters["calls"]
+        ]
+
+    def _launch(
+        self, key: Hashable, name: str, read: Callable[[], Coroutine[Any, Any, T]]
+    ) -> _Flight:
+        flight = _Flight(asyncio.create_task(read()))
+
+        def landed(task: asyncio.Task[Any]) -> None:
+            self._forget(key, flight)
+            # Retrieving the error here also keeps an unawaited failure from being logged
+            if not task.cancelled() and (error := task.exception()) is not None:
+                self._counters[name]["failed"] += 1
+                logger.debug("Coalesced read %s failed: %r", name, error)
+
+        flight.task.add_done_callback(landed)
+        return flight
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+
+read_flights = SingleFlight()
+
+
+async def coalesced_read(
+    db: AsyncSession,
+    name: str,
+    args: Hashable,
+    read: Callable[[AsyncSession], Coroutine[Any, Any, T]],
+) -> T:
+    """Run ``read`` once for all concurrent callers with the same ``name`` and ``args``.
+
+    The shared query gets its own session on ``db``'s engine rather than the
+    first caller's, whose request may end while others still wait. ``read``
+    must return detached data, such as response schemas, not ORM objects.
+    """
+
+    async def run() -> T:
+        async with AsyncSession(db.bind, expire_on_commit=False) as session:
+            return await read(session)
+
+    return await read_flights.do(name, args, run)
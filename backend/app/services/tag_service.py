@@ -0,0 +1,166 @@
+from collections.abc import Iterable
+from uuid import UUID
+
+from sqlalchemy import Select, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.models.change import ChangeEntity, ChangeOp
+from app.models.note import Note
+from app.models.tag import Tag, note_tags
+from app.schemas.autocomplete import SuggestionKind
+from app.schemas.tag import TagAssignResult, TagResponse, TagWithCount
+from app.services.autocomplete_service import autocomplete_index
+from app.services.change_service import ChangeService
+
+
+def normalize_tag_names(names: Iterable[str]) -> list[str]:
+    """Strip whitespace, drop empty names and de-duplicate while preserving order."""
+    seen: dict[str, None] = {}
+    for name in names:
+        cleaned = name.strip()
+        if cleaned:
+            seen.setdefault(cleaned, None)
+    return list(seen)
+
+
+def notes_tagged_with(names: set[str]) -> Select[tuple[UUID]]:
+    """Subquery of note IDs carrying at least one of the named tags."""
+    return (
+        select(note_tags.c.note_id)
+        .join(Tag, Tag.id == note_tags.c.tag_id)
+        .where(Tag.name.in_(names))
+    )
+
+
+class TagService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.changes = ChangeService(db)
+
+    async def list_tags_with_counts(self) -> list[TagWithCount]:
+        """List all tags with their note counts from a single aggregate query."""
+        stmt = (
+            select(Tag, func.count(note_tags.c.note_id).label("note_count"))
+            .outerjoin(note_tags, Tag.id == note_tags.c.tag_id)
+            .group_by(Tag.id)
+            .order_by(Tag.name)
+        )
+        result = await self.db.execute(stmt)
+        return [
+            TagWithCount(
+                id=tag.id,
+                name=tag.name,
+                created_at=tag.created_at,
+                note_count=note_count,
+            )
+            for tag, note_count in result.all()
+        ]
+
+    async def get_or_create_tags(self, names: Iterable[str]) -> list[Tag]:
+        """Resolve tag names to Tag rows, creating the missing ones in one flush."""
+        cleaned = normalize_tag_names(names)
+        if not cleaned:
+            return []
+
+        result = await self.db.execute(select(Tag).where(Tag.name.in_(cleaned)))
+        by_name = {tag.name: tag for tag in result.scalars().all()}
+
+        new_tags = [Tag(name=name) for name in cleaned if name not in by_name]
+        if new_tags:
+            self.db.add_all(new_tags)
+            await self.db.flush()
+            by_name.update((tag.name, tag) for tag in new_tags)
+            await self.changes.record(ChangeEntity.TAG, [tag.id for tag in new_tags])
+
+        return [by_name[name] for name in cleaned]
+
+    async def assign_tags(self, note_ids: list[UUID], names: list[str]) -> TagAssignResult:
+        """Attach every tag in ``names`` to every note in ``note_ids``.
+
+        Existing links are skipped, so the call is idempotent. Note IDs that do not
+        exist are reported back rather than failing the whole batch.
+        """
+        requested = list(dict.fromkeys(note_ids))
+        result = await self.db.execute(select(Note.id).where(Note.id.in_(requested)))
+        found = set(result.scalars().all())
+        missing = [note_id for note_id in requested if note_id not in found]
+
+        tags = await self.get_or_create_tags(names)
+        linked_ids = [note_id for note_id in requested if note_id in found]
+        assigned = await self._link(linked_ids, [tag.id for tag in tags])
+        if assigned:
+            await self.changes.record(ChangeEntity.NOTE, linked_ids)
+
+        await self.db.commit()
+        _publish_tags(tags)
+        return TagAssignResult(
+            tags=[TagResponse.model_validate(tag) for tag in tags],
+            assigned=assigned,
+            missing_note_ids=missing,
+        )
+
+    async def set_note_tags(self, note_id: UUID, names: list[str]) -> Note | None:
+        """Replace a note's tags with ``names``."""
+        exists = await self.db.execute(select(Note.id).where(Note.id == note_id))
+        if exists.scalar_one_or_none() is None:
+            return None
+
+        tags = await self.get_or_create_tags(names)
+        await self.db.execute(delete(note_tags).where(note_tags.c.note_id == note_id))
+        await self._link([note_id], [tag.id for tag in tags])
+        await self.changes.record(ChangeEntity.NOTE, [note_id])
+        await self.db.commit()
+        _publish_tags(tags)
+
+        result = await self.db.execute(
+            select(Note)
+            .options(selectinload(Note.tags))
+            .where(Note.id == note_id)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one()
+
+    async def delete_tag(self, tag_id: UUID) -> bool:
+        result = await self.db.execute(select(Tag).where(Tag.id == tag_id))
+        tag = result.scalar_one_or_none()
+        if not tag:
+            return False
+
+        tagged = await self.db.execute(
+            select(note_tags.c.note_id).where(note_tags.c.tag_id == tag_id)
+        )
+        await self.changes.record(ChangeEntity.NOTE, tagged.scalars().all())
+        await self.changes.record(ChangeEntity.TAG, [tag_id], ChangeOp.DELETE)
+        await self.db.execute(delete(note_tags).where(note_tags.c.tag_id == tag_id))
+        await self.db.delete(tag)
+        await self.db.commit()
+        autocomplete_index.remove(tag_id)
+        return True
+
+    async def _link(self, note_ids: list[UUID], tag_ids: list[UUID]) -> int:
+        """Insert the missing (note, tag) pairs with one lookup and one executemany."""
+        if not note_ids or not tag_ids:
+            return 0
+
+        existing = await self.db.execute(
+            select(note_tags.c.note_id, note_tags.c.tag_id).where(
+                note_tags.c.note_id.in_(note_ids), note_tags.c.tag_id.in_(tag_ids)
+            )
+        )
+        linked = set(existing.tuples().all())
+        rows = [
+            {"note_id": note_id, "tag_id": tag_id}
+            for note_id in note_ids
+            for tag_id in tag_ids
+            if (note_id, tag_id) not in linked
+        ]
+        if rows:
+            await self.db.execute(insert(note_tags), rows)
+        return len(rows)
+
+
+def _publish_tags(tags: Iterable[Tag]) -> None:
+    """Add committed tags to autocomplete; existing ones are left untouched."""
+    for tag in tags:
+        autocomplete_index.upsert(SuggestionKind.TAG, tag.id, tag.name)
@@ -0,0 +1,164 @@
+import heapq
+import math
+import re
+from collections.abc import Collection
+from operator import itemgetter
+from uuid import UUID
+
+from sqlalchemy import Float, Integer, String, column, delete, func, insert, select, values
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.trigram import NoteTerm, TermTrigram
+
+_WORD = re.compile(r"\w+")
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 32
+MAX_TERMS_PER_WORD = 10
+
+
+def trigrams(term: str) -> set[str]:
+    """Trigrams of a word padded like pg_trgm: two spaces before, one after."""
+    padded = f"  {term} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def index_terms(text: str) -> list[str]:
+    """Distinct lower-cased words worth indexing, in order of first appearance."""
+    words = _WORD.findall(text.lower())
+    return list(dict.fromkeys(w for w in words if MIN_TERM_LENGTH <= len(w) <= MAX_TERM_LENGTH))
+
+
+class TrigramService:
+    """Typo-tolerant note search over a trigram-indexed vocabulary.
+
+    ``note_terms`` lists the distinct words of each note and ``term_trigrams``
+    the trigrams of every word ever indexed. A query word is matched to the
+    vocabulary words sharing enough trigrams with it (indexed probes, no text
+    scan), and a note scores the mean of its best match per query word.
+    A word's vocabulary rows are pruned when the last note using it drops it, so
+    dead words never take the slots of live matches.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.threshold = settings.FUZZY_SIMILARITY_THRESHOLD
+
+    async def write_terms(self, note_id: UUID, text: str, is_new: bool = False) -> None:
+        """Stage a note's term rows and any new vocabulary; the caller commits."""
+        terms = index_terms(text)
+        if not is_new:
+            await self.delete_terms(note_id, keep=terms)
+        if not terms:
+            return
+        await self.db.execute(
+            insert(NoteTerm), [{"note_id": note_id, "term": term} for term in terms]
+        )
+        await self.db.execute(
+            sqlite_insert(TermTrigram).on_conflict_do_nothing(),
+            [{"trigram": gram, "term": term} for term in terms for gram in trigrams(term)],
+        )
+
+    async def delete_terms(self, note_id: UUID, keep: Collection[str] = ()) -> None:
+        """Stage removal of a note's terms and of vocabulary words no note uses any more.
+
+        Words in ``keep`` are about to be written back for the same note, so their
+        vocabulary rows are left alone.
+        """
+        removed = await self.db.execute(
+            delete(NoteTerm).where(NoteTerm.note_id == note_id).returning(NoteTerm.term)
+        )
+        dropped = set(removed.scalars().all()).difference(keep)
+        if not dropped:
+            return
+        await self.db.execute(
+            delete(TermTrigram)
+            .where(TermTrigram.term.in_(dropped))
+            .where(TermTrigram.term.not_in(select(NoteTerm.term).where(NoteTerm.term.in_(dropped))))
+        )
+
+    async def similar_terms(self, word: str) -> dict[str, float]:
+        """Up to ``MAX_TERMS_PER_WORD`` vocabulary words at least ``threshold`` similar."""
+        grams = trigrams(word)
+        # Jaccard >= t needs at least t * |grams| shared trigrams, whatever the other word
+        shared_needed = max(1, math.ceil(self.threshold * len(grams)))
+        result = await self.db.execute(
+            select(TermTrigram.term, func.count())
+            .where(TermTrigram.trigram.in_(grams))
+            .group_by(TermTrigram.term)
+            .having(func.count() >= shared_needed)
+        )
+        scored = {}
+        for term, shared in result.tuples():
+            # Jaccard of the two trigram sets, as pg_trgm's similarity()
+            score = shared / (len(grams) + len(trigrams(term)) - shared)
+            if score >= self.threshold:
+                scored[term] = score
+        return dict(heapq.nlargest(MAX_TERMS_PER_WORD, scored.items(), key=itemgetter(1)))
+
+    async def search(self, query: str, limit: int = 20) -> list[tuple[UUID, float]]:
+        """Notes whose mean best-match similarity over the query words reaches ``threshold``.
+
+        A first pass only joins each word's closest vocabulary matches. A note it
+        leaves out or underscores has at least one word matched below the cutoff,
+        so its full score is at most the sum of per-word maxima less the smallest
+        gap between a word's maximum and its best match under the cutoff. When the
+        first pass yields ``limit`` notes scoring at least that bound, the wide
+        join over weaker, often very common, matches is skipped.
+        """
+        words = index_terms(query)
+        if not words:
+            return []
+        matches = [await self.similar_terms(word) for word in words]
+        maxima = [max(word_matches.values(), default=0.0) for word_matches in matches]
+        cutoff = max(min(maxima), self.threshold)
+        if cutoff > self.threshold:
+            hits = await self._top_notes(matches, len(words), cutoff, limit)
+            gaps = [
+                best - max((score for score in word_matches.values() if score < cutoff), default=0)
+                for best, word_matches in zip(maxima, matches, strict=True)
+            ]
+            excluded_best = (sum(maxima) - min(gaps)) / len(words)
+            if len(hits) == limit and hits[-1][1] >= excluded_best:
+                return hits
+        return await self._top_notes(matches, len(words), self.threshold, limit)
+
+    async def _top_notes(
+        self, matches: list[dict[str, float]], word_count: int, cutoff: float, limit: int
+    ) -> list[tuple[UUID, float]]:
+        """Top notes by mean per-word similarity, counting only matches at or above ``cutoff``."""
+        rows = [
+            (term, position, score)
+            for position, word_matches in enumerate(matches)
+            for term, score in word_matches.items()
+            if score >= cutoff
+        ]
+        if not rows:
+            return []
+        # Scored in SQL: common words fan out to thousands of notes, too many to ship back
+        matched = (
+            values(
+                column("term", String),
+                column("word", Integer),
+                column("score", Float),
+                name="matched",
+            )
+            .data(rows)
+            .cte("matched")
+        )
+        per_word = (
+            select(NoteTerm.note_id, func.max(matched.c.score).label("score"))
+            .join(matched, matched.c.term == NoteTerm.term)
+            .group_by(NoteTerm.note_id, matched.c.word)
+            .subquery()
+        )
+        score = (func.sum(per_word.c.score) / word_count).label("score")
+        result = await self.db.execute(
+            select(per_word.c.note_id, score)
+            .group_by(per_word.c.note_id)
+            .having(score >= cutoff)
+            .order_by(score.desc())
+            .limit(limit)
+        )
+        return [(note_id, float(total)) for note_id, total in result.tuples()]
@@ -0,0 +1,178 @@
+import asyncio
+import hashlib
+from collections.abc import AsyncIterable
+from dataclasses import dataclass
+from io import BufferedWriter
+from pathlib import Path
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+from python_multipart.exceptions import FormParserError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from app.services.document_parser import SNIFF_BYTES
+
+if TYPE_CHECKING:
+    # Only defined for type checkers
+    from python_multipart.multipart import MultipartCallbacks
+
+
+class UploadRejectedError(Exception):
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass
+class StagedUpload:
+    path: Path
+    filename: str
+    media_type: str | None
+    sha256: str
+    size_bytes: int
+    # First bytes of the file, for sniffing its format
+    head: bytes
+
+
+class _FilePartWriter:
+    """Multipart callbacks that route one named file part to a staging file.
+
+    The callbacks only queue the file's bytes; ``flush`` hashes and writes them
+    off the event loop between reads of the request body. Other parts are skipped.
+    """
+
+    def __init__(self, field: str, path: Path, max_bytes: int):
+        self.field = field
+        self.path = path
+        self.max_bytes = max_bytes
+        self.filename: str | None = None
+        self.media_type: str | None = None
+        self.size = 0
+        self.head = b""
+        self.hasher = hashlib.sha256()
+        self._file: BufferedWriter | None = None
+        self._in_file_part = False
+        self._pending: list[bytes] = []
+        self._headers: dict[bytes, bytes] = {}
+        self._header_name = b""
+        self._header_value = b""
+
+    def callbacks(self) -> "MultipartCallbacks":
+        return {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        }
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        data = b"".join(self._pending)
+        self._pending.clear()
+        file = self._file
+        if file is None:
+            return
+        await asyncio.to_thread(self._write, file, data)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+    def _write(self, file: BufferedWriter, data: bytes) -> None:
+        self.hasher.update(data)
+        file.write(data)
+
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[self._header_name.lower()] = self._header_value
+        self._header_name = self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if options.get(b"name", b"").decode("utf-8", "replace") != self.field:
+            return
+        if b"filename" not in options:
+            raise UploadRejectedError(f"The {self.field!r} form field must be a file")
+        if self._file is not None:
+            raise UploadRejectedError(f"Send one file in the {self.field!r} form field")
+        self.filename = options[b"filename"].decode("utf-8", "replace")
+        media_type = self._headers.get(b"content-type")
+        self.media_type = media_type.decode("latin-1") if media_type else None
+        self._file = self.path.open("wb")
+        self._in_file_part = True
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if not self._in_file_part:
+            return
+        self.size += end - start
+        if self.size > self.max_bytes:
+            raise UploadRejectedError(
+                f"File is larger than the {self.max_bytes} byte upload limit", status_code=413
+            )
+        if len(self.head) < SNIFF_BYTES:
+            self.head += data[start : min(end, start + SNIFF_BYTES - len(self.head))]
+        self._pending.append(data[start:end])
+
+    def _on_part_end(self) -> None:
+        self._in_file_part = False
+
+
+async def stage_upload(
+    body: AsyncIterable[bytes],
+    content_type: str,
+    directory: Path,
+    max_bytes: int,
+    field: str = "file",
+) -> StagedUpload:
+    """Stream the file in a multipart body's ``field`` to a file in ``directory``.
+
+    The body is read as it arrives and the file is hashed while it is written,
+    so memory stays bounded by the size of the reads however large the upload.
+    The caller moves or deletes the staged file.
+    """
+    media_type, params = parse_options_header(content_type)
+    if media_type != b"multipart/form-data":
+        raise UploadRejectedError("Upload the file as multipart/form-data", status_code=415)
+    boundary = params.get(b"boundary")
+    if not boundary:
+        raise UploadRejectedError("Missing boundary in multipart body")
+
+    await asyncio.to_thread(directory.mkdir, parents=True, exist_ok=True)
+    writer = _FilePartWriter(field, directory / f"{uuid4().hex}.part", max_bytes)
+    parser = MultipartParser(boundary, writer.callbacks())
+    try:
+        try:
+            async for data in body:
+                parser.write(data)
+                await writer.flush()
+            parser.finalize()
+        except FormParserError as exc:
+            raise UploadRejectedError("Invalid multipart body") from exc
+        await writer.flush()
+        writer.close()
+        if writer.filename is None:
+            raise UploadRejectedError(f"Expected a file in the {field!r} form field")
+    except BaseException:
+        writer.close()
+        writer.path.unlink(missing_ok=True)
+        raise
+    return StagedUpload(
+        path=writer.path,
+        filename=writer.filename,
+        media_type=writer.media_type,
+        sha256=writer.hasher.hexdigest(),
+        size_bytes=writer.size,
+        head=writer.head,
+    )
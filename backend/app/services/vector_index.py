@@ -0,0 +1,191 @@
+from collections.abc import Iterable
+from uuid import UUID
+
+import numpy as np
+import numpy.typing as npt
+
+Vector = npt.NDArray[np.float32]
+
+
+class VectorIndex:
+    """In-process cosine-similarity index over unit-length float32 vectors.
+
+    Vectors live in one contiguous, geometrically grown matrix; deleted rows go on
+    a free list and are reused. Below ``ivf_min_size`` vectors a query is one exact
+    matrix-vector product. Above it an IVF layer (k-means centroids with inverted
+    lists) is trained, and queries only score the ``nprobe`` nearest lists. The
+    lists are updated on every upsert, and the centroids are retrained once the
+    index has doubled since the last training.
+    """
+
+    def __init__(self, dim: int, ivf_min_size: int = 4096, nprobe: int = 8):
+        self.dim = dim
+        self.ivf_min_size = ivf_min_size
+        self.nprobe = nprobe
+        self.clear()
+
+    def clear(self) -> None:
+        self.loaded = False
+        self._matrix: Vector = np.zeros((0, self.dim), dtype=np.float32)
+        self._ids: list[UUID | None] = []
+        self._rows: dict[UUID, int] = {}
+        self._free: list[int] = []
+        self._centroids: Vector | None = None
+        self._lists: list[set[int]] = []
+        self._row_list: dict[int, int] = {}
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self._matrix.nbytes)
+
+    def load(self, ids: list[UUID], vectors: Vector) -> None:
+        """Replace the index contents in one shot (used at startup)."""
+        self.clear()
+        self._matrix = np.array(vectors, dtype=np.float32).reshape(-1, self.dim)
+        self._ids = list(ids)
+        self._rows = {note_id: row for row, note_id in enumerate(ids)}
+        self.loaded = True
+        self._maybe_train()
+
+    def upsert(self, note_id: UUID, vector: Vector) -> None:
+        row = self._rows.get(note_id)
+        if row is None:
+            row = self._free.pop() if self._free else self._append_row()
+            self._rows[note_id] = row
+            self._ids[row] = note_id
+        self._matrix[row] = vector
+        if self._centroids is not None:
+            self._assign(row)
+        self._maybe_train()
+
+    def remove(self, note_id: UUID) -> None:
+        row = self._rows.pop(note_id, None)
+        if row is None:
+            return
+        self._matrix[row] = 0.0
+        self._ids[row] = None
+        self._free.append(row)
+        list_index = self._row_list.pop(row, None)
+        if list_index is not None:
+            self._lists[list_index].discard(row)
+
+    def search(self, query: Vector, k: int) -> list[tuple[UUID, float]]:
+        """Return up to ``k`` (note_id, cosine similarity) pairs, best first."""
+        if not self._rows or k <= 0:
+            return []
+
+        if self._centroids is None:
+            candidates = None
+            scores = self._matrix[: len(self._ids)] @ query
+            scores[self._free] = -np.inf
+        else:
+            nearest = np.argsort(self._centroids @ query)[::-1][: self.nprobe]
+            candidates = np.fromiter(
+                (row for index in nearest for row in self._lists[index]), dtype=np.int64
+            )
+            if candidates.size == 0:
+                return []
+            scores = self._matrix[candidates] @ query
+
+        top = min(k, scores.shape[0])
+        best = np.argpartition(-scores, top - 1)[:top]
+        best = best[np.argsort(-scores[best])]
+        hits = []
+        for position in best:
+            row = int(candidates[position]) if candidates is not None else int(position)
+            note_id = self._ids[row]
+            if note_id is not None:
+                hits.append((note_id, float(scores[position])))
+        return hits
+
+    def vector(self, note_id: UUID) -> Vector | None:
+        row = self._rows.get(note_id)
+        return None if row is None else self._matrix[row].copy()
+
+    def vectors(self, note_ids: Iterable[UUID]) -> tuple[list[UUID], Vector]:
+        """The indexed notes among ``note_ids`` and their vectors, copied into one matrix."""
+        found = [note_id for note_id in note_ids if note_id in self._rows]
+        return found, self._matrix[[self._rows[note_id] for note_id in found]]
+
+    def exact_neighbors(
+        self, queries: Vector, k: int, chunk_size: int = 256
+    ) -> list[list[tuple[UUID, float]]]:
+        """Exact top-``k`` for each query row, scored in chunks of one matrix product each.
+
+        Bypasses IVF: used for precomputed neighbour lists, where recall matters more
+        than per-query latency. Scores the matrix in place with free rows masked, and
+        only reads the index, so callers can run it in a worker thread.
+        """
+        ids = list(self._ids)
+        live = np.array([note_id is not None for note_id in ids], dtype=bool)
+        top = min(k, int(live.sum()))
+        if top <= 0:
+            return [[] for _ in range(queries.shape[0])]
+        matrix = self._matrix[: len(ids)]
+        results = []
+        for start in range(0, queries.shape[0], chunk_size):
+            scores = queries[start : start + chunk_size] @ matrix.T
+            scores[:, ~live] = -np.inf
+            best = np.argpartition(-scores, top - 1, axis=1)[:, :top]
+            for row_scores, row_best in zip(scores, best, strict=True):
+                ordered = row_best[np.argsort(-row_scores[row_best])]
+                results.append(
+                    [
+                        (note_id, float(row_scores[i]))
+                        for i in ordered
+                        if (note_id := ids[i]) is not None
+                    ]
+                )
+        return results
+
+    def _append_row(self) -> int:
+        row = len(self._ids)
+        if row >= self._matrix.shape[0]:
+            grown = np.zeros((max(16, row * 2), self.dim), dtype=np.float32)
+            grown[:row] = self._matrix[:row]
+            self._matrix = grown
+        self._ids.append(None)
+        return row
+
+    def _maybe_train(self) -> None:
+        size = len(self._rows)
+        if size < self.ivf_min_size or size < 2 * self._trained_size:
+            return
+        rows = np.fromiter(self._rows.values(), dtype=np.int64)
+        nlist = max(1, int(np.sqrt(size)))
+        self._centroids = _kmeans(self._matrix[rows], nlist)
+        self._lists = [set() for _ in range(nlist)]
+        self._row_list = {}
+        for row in rows:
+            self._assign(int(row))
+        self._trained_size = size
+
+    def _assign(self, row: int) -> None:
+        if self._centroids is None:
+            return
+        previous = self._row_list.get(row)
+        if previous is not None:
+            self._lists[previous].discard(row)
+        list_index = int(np.argmax(self._centroids @ self._matrix[row]))
+        self._lists[list_index].add(row)
+        self._row_list[row] = list_index
+
+
+def _kmeans(data: Vector, k: int, iterations: int = 10) -> Vector:
+    """Spherical k-means with a fixed seed, so training is deterministic."""
+    rng = np.random.default_rng(0)
+    centroids = data[rng.choice(data.shape[0], size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(data @ centroids.T, axis=1)
+        for index in range(k):
+            members = data[assignment == index]
+            if members.size:
+                centroid = members.sum(axis=0)
+                norm = np.linalg.norm(centroid)
+                if norm > 0:
+                    centroids[index] = centroid / norm
+    return centroids.astype(np.float32)
@@ -0,0 +1,127 @@
+import asyncio
+import time
+from collections.abc import Iterator
+from contextlib import AsyncExitStack, contextmanager
+from pathlib import Path
+from uuid import uuid4
+
+import fastapi.routing
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.config import settings
+from app.schemas.startup import StartupPhase, StartupReport
+from app.services.change_service import ChangeService
+from app.services.job_service import JobService, SessionFactory
+from app.services.note_service import NoteService
+from app.services.search_service import SearchService
+
+PREFETCH_CHUNK_BYTES = 1 << 20
+
+
+class StartupTimer:
+    """Times the named steps of startup for the report logged when the app is ready."""
+
+    def __init__(self) -> None:
+        self._started = time.perf_counter()
+        self._phases: list[StartupPhase] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._phases.append(StartupPhase(name=name, ms=(time.perf_counter() - started) * 1000))
+
+    def report(self, warmed_up: bool) -> StartupReport:
+        return StartupReport(
+            phases=list(self._phases),
+            total_ms=(time.perf_counter() - self._started) * 1000,
+            warmed_up=warmed_up,
+        )
+
+
+async def open_pool_connections(engine: AsyncEngine, count: int) -> None:
+    """Hold ``count`` connections open at once, so the pool keeps that many ready."""
+    async with AsyncExitStack() as stack:
+        for _ in range(count):
+            conn = await stack.enter_async_context(engine.connect())
+            await conn.execute(text("SELECT 1"))
+
+
+async def run_hot_queries(db: AsyncSession) -> None:
+    """Run the read paths the UI opens with once, so their SQL is compiled and cached.
+
+    SQLAlchemy caches compiled statements by shape, not by parameters, so a lookup
+    of an ID that does not exist warms the cache as well as a real one would.
+    Queries that return or aggregate whole tables are left out, including the
+    container and tag counts, which group every note: on a large vault they
+    would cost a full scan at each start to save one compile on first use.
+    """
+    missing = uuid4()
+    notes = NoteService(db)
+    await notes.get_note_with_tags(missing)
+    await notes.get_notes_batch([missing], None)
+    await SearchService(db).get_recent(limit=1)
+    await ChangeService(db).list_changes(limit=1)
+    await JobService(db).status()
+    await db.rollback()
+
+
+def build_route_handlers(app: FastAPI) -> int:
+    """Build each route's parameter and response models, returning how many routes.
+
+    Recent FastAPI releases build these on a router's first matched request;
+    older ones build them when routes are included, leaving nothing to do here.
+    """
+    iter_route_contexts = getattr(fastapi.routing, "iter_route_contexts", None)
+    if iter_route_contexts is None:
+        return 0
+    return sum(1 for _ in iter_route_contexts(app.routes))
+
+
+def _read_file(path: Path, max_bytes: int) -> int:
+    read = 0
+    with path.open("rb") as f:
+        while read < max_bytes and (chunk := f.read(min(PREFETCH_CHUNK_BYTES, max_bytes - read))):
+            read += len(chunk)
+    return read
+
+
+async def prefetch_database_file(engine: AsyncEngine, max_bytes: int) -> int:
+    """Read up to ``max_bytes`` of a SQLite database file into the OS page cache.
+
+    Returns the bytes read; 0 for in-memory or non-SQLite databases.
+    """
+    database = engine.url.database
+    if engine.dialect.name != "sqlite" or not database or database == ":memory:":
+        return 0
+    path = Path(database)
+    if not path.is_file():
+        return 0
+    return await asyncio.to_thread(_read_file, path, max_bytes)
+
+
+async def warm_up(
+    app: FastAPI, engine: AsyncEngine, session_factory: SessionFactory, timer: StartupTimer
+) -> None:
+    """Pay the first-request costs during startup instead of on the first requests.
+
+    The OpenAPI schema is only needed by ``/docs``, so it is built only when
+    ``WARMUP_OPENAPI`` is set.
+    """
+    if settings.WARMUP_PREFETCH_MAX_BYTES:
+        with timer.phase("warmup.prefetch"):
+            await prefetch_database_file(engine, settings.WARMUP_PREFETCH_MAX_BYTES)
+    with timer.phase("warmup.connections"):
+        await open_pool_connections(engine, settings.WARMUP_POOL_CONNECTIONS)
+    with timer.phase("warmup.routes"):
+        build_route_handlers(app)
+    with timer.phase("warmup.queries"):
+        async with session_factory() as db:
+            await run_hot_queries(db)
+    if settings.WARMUP_OPENAPI:
+        with timer.phase("warmup.openapi"):
+            app.openapi()
@@ -0,0 +1,141 @@
+"""Bursts of identical concurrent reads with and without single-flight coalescing.
+
+Seeds a temporary SQLite file and fires ``--concurrency`` identical requests at
+once at ``/recent``, ``/inbox`` and ``/containers`` through the app in process,
+as when many clients reconnect together. Reports queries executed and the
+burst's wall time, with coalescing on and with every caller running its own query.
+
+Run from ``backend/``::
+
+    .venv/bin/python -m evals.coalescing
+    .venv/bin/python -m evals.coalescing --concurrency 100 --bursts 10 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable, Hashable
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from app.database import Base, get_db
+from app.main import app
+from app.models.container import Container, ContainerType
+from app.models.note import Note
+from app.services.single_flight import read_flights
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+PATHS = ("/api/v1/recent?limit=50", "/api/v1/inbox", "/api/v1/containers")
+
+
+@dataclass
+class BurstReport:
+    path: str
+    coalescing: bool
+    concurrency: int
+    queries_per_burst: float
+    burst_ms: float
+
+
+async def _seed(sessions: async_sessionmaker[AsyncSession], notes: int) -> None:
+    async with sessions() as db:
+        containers = [Container(name=f"Project {i}", type=ContainerType.PROJECT) for i in range(50)]
+        db.add_all(containers)
+        db.add_all(
+            Note(
+                title=f"Note {i}",
+                content=f"Body of note {i} " * 40,
+                # Half stay in the inbox, the rest are filed
+                container=containers[i % 50] if i % 2 else None,
+            )
+            for i in range(notes)
+        )
+        await db.commit()
+
+
+async def _uncoalesced(name: str, args: Hashable, read: Callable[[], Awaitable[Any]]) -> Any:
+    return await read()
+
+
+async def benchmark(notes: int = 2000, concurrency: int = 50, bursts: int = 5) -> list[BurstReport]:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        await _seed(sessions, notes)
+
+        async def session_per_request() -> AsyncGenerator[AsyncSession, None]:
+            async with sessions() as db:
+                yield db
+                await db.commit()
+
+        app.dependency_overrides[get_db] = session_per_request
+        reports = []
+        try:
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://bench"
+            ) as client:
+                for path in PATHS:
+                    for coalescing in (False, True):
+                        with ExitStack() as stack:
+                            if not coalescing:
+                                stack.enter_context(patch.object(read_flights, "do", _uncoalesced))
+                            read_flights.clear()
+                            latencies = []
+                            for _ in range(bursts):
+                                started = time.perf_counter()
+                                responses = await asyncio.gather(
+                                    *(client.get(path) for _ in range(concurrency))
+                                )
+                                latencies.append((time.perf_counter() - started) * 1000)
+                                for response in responses:
+                                    response.raise_for_status()
+                            executed = sum(s.executed for s in read_flights.stats())
+                        reports.append(
+                            BurstReport(
+                                path=path,
+                                coalescing=coalescing,
+                                concurrency=concurrency,
+                                queries_per_burst=(
+                                    executed / bursts if coalescing else float(concurrency)
+                                ),
+                                burst_ms=statistics.median(latencies),
+                            )
+                        )
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            await engine.dispose()
+    return reports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=2000, help="notes to seed")
+    parser.add_argument("--concurrency", type=int, default=50, help="identical requests per burst")
+    parser.add_argument("--bursts", type=int, default=5, help="timed bursts per path and mode")
+    parser.add_argument("--json", action="store_true", help="print machine-readable output")
+    args = parser.parse_args()
+
+    reports = asyncio.run(
+        benchmark(notes=args.notes, concurrency=args.concurrency, bursts=args.bursts)
+    )
+    if args.json:
+        print(json.dumps([asdict(r) for r in reports], indent=2))
+        return
+    print(f"{'path':<26}{'coalescing':<12}{'queries':>9}{'burst ms':>10}")
+    for r in reports:
+        print(f"{r.path:<26}{r.coalescing!s:<12}{r.queries_per_burst:>9.1f}{r.burst_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
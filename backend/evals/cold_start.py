@@ -0,0 +1,152 @@
+"""Cold-start cost of the API: import time and time to first response, with and without warm-up.
+
+Seeds a temporary SQLite file, then for each run starts a fresh interpreter that
+imports ``app.main``, runs the lifespan startup and times a first and a second pass
+over a few hot read endpoints, in process. Time to first response is import +
+startup + first pass; interpreter boot itself is not counted.
+
+Run from ``backend/``::
+
+    .venv/bin/python -m evals.cold_start
+    .venv/bin/python -m evals.cold_start --notes 20000 --runs 5 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+
+from app.database import Base
+from app.models.note import Note
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+HOT_PATHS = ["/api/v1/recent", "/api/v1/containers", "/api/v1/tags", "/api/v1/jobs"]
+INSERT_BATCH = 2_000
+
+
+@dataclass
+class ColdStartReport:
+    warmup: bool
+    import_ms: float
+    startup_ms: float
+    first_pass_ms: float
+    second_pass_ms: float
+    time_to_first_response_ms: float
+
+
+async def _seed(url: str, count: int) -> None:
+    engine = create_async_engine(url)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            for start in range(0, count, INSERT_BATCH):
+                await conn.execute(
+                    insert(Note),
+                    [
+                        {
+                            "title": f"Note {i}",
+                            "content": f"Body of note {i} " * 40,
+                            "highlights": {},
+                        }
+                        for i in range(start, min(start + INSERT_BATCH, count))
+                    ],
+                )
+    finally:
+        await engine.dispose()
+
+
+async def _probe() -> dict[str, float]:
+    """Runs in the child interpreter; the app is imported here so the import is timed."""
+    started = time.perf_counter()
+    from app.main import app
+    from httpx import ASGITransport, AsyncClient
+
+    imported = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            passes = []
+            for _ in range(2):
+                pass_started = time.perf_counter()
+                for path in HOT_PATHS:
+                    (await client.get(path)).raise_for_status()
+                passes.append((time.perf_counter() - pass_started) * 1000)
+    return {
+        "import_ms": (imported - started) * 1000,
+        "startup_ms": (ready - imported) * 1000,
+        "first_pass_ms": passes[0],
+        "second_pass_ms": passes[1],
+    }
+
+
+def _run_child(url: str, warmup: bool) -> dict[str, float]:
+    env = {**os.environ, "DATABASE_URL": url, "DEBUG": "false", "WARMUP_ENABLED": str(warmup)}
+    output = subprocess.run(
+        [sys.executable, "-m", "evals.cold_start", "--probe"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def benchmark(notes: int = 5000, runs: int = 3) -> list[ColdStartReport]:
+    reports = []
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{Path(tmp) / 'cold.db'}"
+        asyncio.run(_seed(url, notes))
+        for warmup in (False, True):
+            samples = [_run_child(url, warmup) for _ in range(runs)]
+            timings = {
+                field.name: statistics.median(sample[field.name] for sample in samples)
+                for field in fields(ColdStartReport)
+                if field.name in samples[0]
+            }
+            reports.append(
+                ColdStartReport(
+                    warmup=warmup,
+                    time_to_first_response_ms=(
+                        timings["import_ms"] + timings["startup_ms"] + timings["first_pass_ms"]
+                    ),
+                    **timings,
+                )
+            )
+    return reports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=5000, help="notes to seed")
+    parser.add_argument("--runs", type=int, default=3, help="fresh processes per setting")
+    parser.add_argument("--json", action="store_true", help="print machine-readable output")
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        print(json.dumps(asyncio.run(_probe())))
+        return
+    reports = benchmark(notes=args.notes, runs=args.runs)
+    if args.json:
+        print(json.dumps([asdict(r) for r in reports], indent=2))
+        return
+    print(f"{'warmup':<8}{'import':>10}{'startup':>10}{'1st pass':>10}{'2nd pass':>10}{'TTFR':>10}")
+    for r in reports:
+        print(
+            f"{r.warmup!s:<8}{r.import_ms:>10.1f}{r.startup_ms:>10.1f}"
+            f"{r.first_pass_ms:>10.1f}{r.second_pass_ms:>10.1f}{r.time_to_first_response_ms:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
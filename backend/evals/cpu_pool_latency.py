@@ -0,0 +1,178 @@
+"""Latency of a light endpoint while large notes are imported, with and without the CPU pool.
+
+Seeds a temporary SQLite file and drives the app in process. A client reads
+one note by id in a loop, timing each request, while another posts
+``--imports`` notes of ``--chars`` characters, whose embedding and MinHash
+signature are the CPU-heavy part of a save. Three runs: no imports; imports
+with that work inline on the event loop, as before the pool existed; and
+imports handed to a ``--workers`` process pool. Reports p50/p99 of the light
+reads and the imports' wall time. Imported text draws on a small vocabulary,
+since the per-word fuzzy-search rows are database writes the pool cannot take.
+
+Run from ``backend/``::
+
+    .venv/bin/python -m evals.cpu_pool_latency
+    .venv/bin/python -m evals.cpu_pool_latency --imports 16 --chars 800000 --workers 4 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from collections.abc import AsyncGenerator
+from contextlib import AsyncExitStack
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+from app.config import settings
+from app.database import Base, get_db
+from app.main import app
+from app.models.note import Note
+from app.services.cpu_pool import cpu_pool
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+WORDS = ["project", "area", "resource", "archive", "summary", "layer", "capture", "insight"]
+# Fuzzy-search vocabulary rows, written on the loop, grow with distinct words, not length
+VARIANTS = 25
+MODES = ("idle", "inline", "pool")
+
+
+@dataclass
+class LatencyReport:
+    mode: str
+    requests: int
+    p50_ms: float
+    p99_ms: float
+    imports_ms: float
+
+
+def _article(rng: random.Random, chars: int) -> str:
+    words: list[str] = []
+    size = 0
+    while size < chars:
+        word = rng.choice(WORDS) + str(rng.randrange(VARIANTS))
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)
+
+
+async def _read_until(
+    client: AsyncClient, path: str, done: asyncio.Event, floor: int
+) -> list[float]:
+    """Time light reads back to back until ``done`` is set and at least ``floor`` have run."""
+    latencies = []
+    while not done.is_set() or len(latencies) < floor:
+        started = time.perf_counter()
+        response = await client.get(path)
+        latencies.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+    return latencies
+
+
+async def _import(client: AsyncClient, articles: list[str]) -> float:
+    started = time.perf_counter()
+    for i, article in enumerate(articles):
+        response = await client.post(
+            "/api/v1/notes", json={"title": f"Import {i}", "content": article}
+        )
+        response.raise_for_status()
+    return (time.perf_counter() - started) * 1000
+
+
+async def benchmark(
+    imports: int = 8, chars: int = 400_000, workers: int = 2, floor: int = 200, seed: int = 7
+) -> list[LatencyReport]:
+    rng = random.Random(seed)
+    articles = [_article(rng, chars) for _ in range(imports)]
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with sessions() as db:
+            note = Note(title="Light", content="A short note read in a loop")
+            db.add(note)
+            await db.commit()
+        path = f"/api/v1/notes/{note.id}"
+
+        async def session_per_request() -> AsyncGenerator[AsyncSession, None]:
+            async with sessions() as db:
+                yield db
+                await db.commit()
+
+        app.dependency_overrides[get_db] = session_per_request
+        reports = []
+        try:
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://bench"
+            ) as client:
+                for mode in MODES:
+                    async with AsyncExitStack() as stack:
+                        if mode == "inline":
+                            stack.enter_context(
+                                patch.object(settings, "CPU_POOL_INLINE_MAX_CHARS", chars * 2)
+                            )
+                        if mode == "pool":
+                            await cpu_pool.start(workers=workers)
+                            stack.push_async_callback(cpu_pool.stop)
+                        done = asyncio.Event()
+                        # Idle reads run a fixed count; the others only while imports run
+                        reads = asyncio.create_task(
+                            _read_until(client, path, done, floor if mode == "idle" else 1)
+                        )
+                        imports_ms = 0.0
+                        if mode != "idle":
+                            imports_ms = await _import(client, articles)
+                        done.set()
+                        latencies = await reads
+                    reports.append(
+                        LatencyReport(
+                            mode=mode,
+                            requests=len(latencies),
+                            p50_ms=float(np.percentile(latencies, 50)),
+                            p99_ms=float(np.percentile(latencies, 99)),
+                            imports_ms=imports_ms,
+                        )
+                    )
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            await engine.dispose()
+    return reports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--imports", type=int, default=8, help="large notes posted per run")
+    parser.add_argument("--chars", type=int, default=400_000, help="characters per imported note")
+    parser.add_argument("--workers", type=int, default=2, help="CPU pool worker processes")
+    parser.add_argument("--floor", type=int, default=200, help="light reads timed with no imports")
+    parser.add_argument("--seed", type=int, default=7, help="random seed for the imported text")
+    parser.add_argument("--json", action="store_true", help="print machine-readable output")
+    args = parser.parse_args()
+
+    reports = asyncio.run(
+        benchmark(
+            imports=args.imports,
+            chars=args.chars,
+            workers=args.workers,
+            floor=args.floor,
+            seed=args.seed,
+        )
+    )
+    if args.json:
+        print(json.dumps([asdict(r) for r in reports], indent=2))
+        return
+    print(f"{'mode':<8}{'requests':>10}{'p50 ms':>9}{'p99 ms':>9}{'imports ms':>12}")
+    for r in reports:
+        print(f"{r.mode:<8}{r.requests:>10}{r.p50_ms:>9.1f}{r.p99_ms:>9.1f}{r.imports_ms:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
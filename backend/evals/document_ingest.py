@@ -0,0 +1,184 @@
+"""Peak memory of a document upload, streamed ingestion versus reading the whole file.
+
+Writes synthetic log files of each ``--sizes-mb`` size to a temporary
+directory and uploads them through the app in process as multipart bodies,
+then ingests them two ways on a fresh SQLite file each: with
+``POST /documents``, which streams the body to disk, hashes it as it is
+written and chunks it a block at a time with batched inserts; and with a
+baseline endpoint that takes a FastAPI ``UploadFile``, reads it into memory,
+decodes and chunks it in one call and inserts every chunk at once. Reports
+peak traced Python memory, wall time and throughput; tracing slows both.
+
+Run from ``backend/``::
+
+    .venv/bin/python -m evals.document_ingest
+    .venv/bin/python -m evals.document_ingest --sizes-mb 8 64 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from collections.abc import AsyncGenerator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from app.api.deps import DbSession
+from app.config import settings
+from app.database import Base, get_db
+from app.main import app
+from app.models.document import Document, DocumentChunk, DocumentFormat
+from app.services.document_parser import TextChunker
+from fastapi import FastAPI, UploadFile
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+LEVELS = ["DEBUG", "INFO", "INFO", "INFO", "WARN", "ERROR"]
+
+
+@dataclass
+class IngestReport:
+    strategy: str
+    size_mb: float
+    chunks: int
+    peak_mb: float
+    seconds: float
+    mb_per_second: float
+
+
+def _write_log(path: Path, size: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    with path.open("w") as f:
+        written = 0
+        while written < size:
+            lines = [
+                f"2026-10-19T{i % 24:02d}:{i % 60:02d}:00 {rng.choice(LEVELS)} "
+                f"worker-{rng.randrange(16)} handled request {rng.randrange(10**6)} "
+                f"in {rng.random() * 100:.1f} ms\n"
+                for i in range(5000)
+            ]
+            block = "".join(lines)[: size - written]
+            f.write(block)
+            written += len(block)
+
+
+async def _buffered(file: UploadFile, db: DbSession) -> dict[str, int]:
+    data = await file.read()
+    text = data.decode()
+    chunker = TextChunker(settings.DOCUMENT_CHUNK_CHARS, settings.DOCUMENT_CHUNK_OVERLAP_CHARS)
+    chunks = chunker.feed(text) + chunker.close()
+    document = Document(
+        filename=file.filename or "upload",
+        media_type=file.content_type,
+        format=DocumentFormat.TEXT,
+        sha256=hashlib.sha256(data).hexdigest(),
+        size_bytes=len(data),
+        char_count=len(text),
+        chunk_count=len(chunks),
+    )
+    db.add(document)
+    await db.flush()
+    await db.execute(
+        insert(DocumentChunk),
+        [
+            {
+                "document_id": document.id,
+                "ordinal": i,
+                "start_offset": c.start_offset,
+                "content": c.content,
+            }
+            for i, c in enumerate(chunks)
+        ],
+    )
+    await db.commit()
+    return {"chunk_count": len(chunks)}
+
+
+baseline = FastAPI()
+baseline.post("/documents")(_buffered)
+
+
+async def _run(target: FastAPI, url: str, source: Path, strategy: str, tmp: Path) -> IngestReport:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp / f'{strategy}.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def session_per_request() -> AsyncGenerator[AsyncSession, None]:
+        async with sessions() as db:
+            yield db
+
+    target.dependency_overrides[get_db] = session_per_request
+    settings.DOCUMENT_STORAGE_DIR = str(tmp / strategy)
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=target), base_url="http://bench"
+        ) as client:
+            with source.open("rb") as f:
+                tracemalloc.start()
+                started = time.perf_counter()
+                response = await client.post(url, files={"file": (source.name, f, "text/plain")})
+                elapsed = time.perf_counter() - started
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+        response.raise_for_status()
+    finally:
+        target.dependency_overrides.pop(get_db, None)
+        await engine.dispose()
+    size_mb = source.stat().st_size / (1 << 20)
+    return IngestReport(
+        strategy=strategy,
+        size_mb=size_mb,
+        chunks=response.json()["chunk_count"],
+        peak_mb=peak / (1 << 20),
+        seconds=elapsed,
+        mb_per_second=size_mb / elapsed,
+    )
+
+
+async def benchmark(sizes_mb: tuple[float, ...] = (4, 16, 64)) -> list[IngestReport]:
+    saved_storage = settings.DOCUMENT_STORAGE_DIR
+    reports = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp = Path(tmp_dir)
+            for size_mb in sizes_mb:
+                source = tmp / f"server-{size_mb:g}mb.log"
+                _write_log(source, int(size_mb * (1 << 20)))
+                reports.append(await _run(app, "/api/v1/documents", source, "streamed", tmp))
+                reports.append(await _run(baseline, "/documents", source, "buffered", tmp))
+                source.unlink()
+    finally:
+        settings.DOCUMENT_STORAGE_DIR = saved_storage
+    return reports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes-mb", type=float, nargs="+", default=[4, 16, 64], help="upload sizes to ingest"
+    )
+    parser.add_argument("--json", action="store_true", help="print machine-readable output")
+    args = parser.parse_args()
+
+    reports = asyncio.run(benchmark(sizes_mb=tuple(args.sizes_mb)))
+    if args.json:
+        print(json.dumps([asdict(r) for r in reports], indent=2))
+        return
+    print(f"{'strategy':<10}{'size MB':>9}{'chunks':>9}{'peak MB':>9}{'s':>8}{'MB/s':>8}")
+    for r in reports:
+        print(
+            f"{r.strategy:<10}{r.size_mb:>9.0f}{r.chunks:>9}{r.peak_mb:>9.1f}"
+            f"{r.seconds:>8.2f}{r.mb_per_second:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Latency of typo-tolerant (trigram) search as the vault grows.
+
+Seeds a temporary SQLite file with synthetic notes drawn from a Zipf-distributed
+pseudo-word vocabulary, filling ``note_terms``/``term_trigrams`` in bulk, then
+times ``SearchService.search_fuzzy`` on misspelled one- and two-word queries.
+
+Run from ``backend/``::
+
+    .venv/bin/python -m evals.fuzzy_search
+    .venv/bin/python -m evals.fuzzy_search --notes 10000 100000 --queries 50 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from app.database import Base
+from app.models.note import CodeStage, Note
+from app.models.trigram import NoteTerm, TermTrigram
+from app.services.search_service import SearchService
+from app.services.trigram_service import index_terms, trigrams
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from evals.search_relevance import percentile
+
+CONSONANTS = "bcdfghjklmnprstvwz"
+VOWELS = "aeiou"
+VOCABULARY_SIZE = 20_000
+WORDS_PER_NOTE = 60
+INSERT_BATCH = 2_000
+
+
+@dataclass
+class FuzzyReport:
+    notes: int
+    p50_ms: float
+    p95_ms: float
+    mean_hits: float
+
+
+def _vocabulary(rng: random.Random) -> list[str]:
+    words: set[str] = set()
+    while len(words) < VOCABULARY_SIZE:
+        # Alternating consonants and vowels: pronounceable, word-like trigram overlap
+        length = rng.randint(3, 11)
+        words.add("".join(rng.choice((CONSONANTS, VOWELS)[i % 2]) for i in range(length)))
+    return sorted(words)
+
+
+def _misspell(word: str, rng: random.Random) -> str:
+    position = rng.randrange(len(word))
+    if rng.random() < 0.5:
+        return word[:position] + word[position + 1 :]
+    return word[:position] + rng.choice("aeiou") + word[position + 1 :]
+
+
+async def _seed(
+    sessions: async_sessionmaker[AsyncSession], count: int, words: list[str], rng: random.Random
+) -> None:
+    weights = [1 / rank for rank in range(1, len(words) + 1)]
+    vocabulary: set[str] = set()
+    async with sessions() as db:
+        for start in range(0, count, INSERT_BATCH):
+            notes, terms = [], []
+            for _ in range(min(INSERT_BATCH, count - start)):
+                note_id = uuid.uuid4()
+                text = " ".join(rng.choices(words, weights, k=WORDS_PER_NOTE))
+                notes.append(
+                    {
+                        "id": note_id,
+                        "title": text[:40],
+                        "content": text,
+                        "highlights": {},
+                        "code_stage": CodeStage.CAPTURE,
+                    }
+                )
+                note_terms = index_terms(text)
+                terms.extend({"note_id": note_id, "term": term} for term in note_terms)
+                vocabulary.update(note_terms)
+            await db.execute(insert(Note), notes)
+            await db.execute(insert(NoteTerm), terms)
+        await db.execute(
+            insert(TermTrigram),
+            [{"trigram": gram, "term": term} for term in vocabulary for gram in trigrams(term)],
+        )
+        await db.commit()
+
+
+async def benchmark(sizes: list[int], queries: int = 30) -> list[FuzzyReport]:
+    rng = random.Random(0)
+    words = _vocabulary(rng)
+    reports = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'fuzzy.db'}")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            try:
+                await _seed(sessions, size, words, rng)
+                latencies, hits = [], []
+                async with sessions() as db:
+                    search = SearchService(db)
+                    for _ in range(queries):
+                        # Mid-frequency words: common enough to be in the vault, rare enough to matter
+                        picked = rng.sample(words[100:2000], rng.randint(1, 2))
+                        query = " ".join(_misspell(word, rng) for word in picked)
+                        started = time.perf_counter()
+                        found = await search.search_fuzzy(query, limit=20)
+                        latencies.append((time.perf_counter() - started) * 1000)
+                        hits.append(len(found))
+                reports.append(
+                    FuzzyReport(
+                        notes=size,
+                        p50_ms=percentile(latencies, 50),
+                        p95_ms=percentile(latencies, 95),
+                        mean_hits=sum(hits) / len(hits),
+                    )
+                )
+            finally:
+                await engine.dispose()
+    return reports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=30, help="timed queries per size")
+    parser.add_argument("--json", action="store_true", help="print machine-readable output")
+    args = parser.parse_args()
+
+    reports = asyncio.run(benchmark(args.notes, queries=args.queries))
+    if args.json:
+        print(json.dumps([asdict(r) for r in reports], indent=2))
+        return
+    print(f"{'notes':>8}{'p50 ms':>10}{'p95 ms':>10}{'hits':>8}")
+    for r in reports:
+        print(f"{r.notes:>8}{r.p50_ms:>10.2f}{r.p95_ms:>10.2f}{r.mean_hits:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Accuracy and latency of inbox filing suggestions from the nearest-centroid classifier.
+
+Seeds a temporary SQLite file with ``--containers`` areas, each with its own
+topic vocabulary that notes mix with words of other topics, files ``--filed``
+notes per container through ``NoteService.move_to_container`` and leaves
+``--inbox`` notes in the inbox.
+Reports how often the note's true container is the first suggestion or among
+the first three, the time to suggest for one page of inbox notes, and the
+time to retrain after one note is refiled versus training from scratch.
+
+Run from ``backend/``::
+
+    .venv/bin/python -m evals.inbox_filing
+    .venv/bin/python -m evals.inbox_filing --containers 40 --filed 50 --inbox 200 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from app.database import Base
+from app.models.container import ContainerType
+from app.schemas.container import ContainerCreate
+from app.schemas.note import NoteCreate
+from app.services.container_service import ContainerService
+from app.services.embedding_service import vector_index
+from app.services.filing_service import FilingService, filing_model
+from app.services.note_service import NoteService
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+COMMON = ["note", "idea", "summary", "later", "review", "draft", "thoughts", "link"]
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "ta", "vo", "shi", "pe", "zu", "ba", "fo"]
+
+
+@dataclass
+class FilingReport:
+    containers: int
+    filed_notes: int
+    inbox_notes: int
+    top1_accuracy: float
+    top3_accuracy: float
+    page_ms: float
+    full_train_ms: float
+    refile_train_ms: float
+
+
+def _topic(rng: random.Random) -> list[str]:
+    return ["".join(rng.choices(SYLLABLES, k=3)) for _ in range(12)]
+
+
+def _text(rng: random.Random, topic: list[str], vocabulary: list[str]) -> str:
+    """A few words of the note's topic, as many from any topic, and filler."""
+    words = (
+        rng.choices(topic, k=rng.randint(2, 6))
+        + rng.choices(vocabulary, k=rng.randint(2, 6))
+        + rng.choices(COMMON, k=rng.randint(4, 10))
+    )
+    rng.shuffle(words)
+    return " ".join(words)
+
+
+async def benchmark(
+    containers: int = 20, filed: int = 30, inbox: int = 100, page: int = 50, seed: int = 7
+) -> FilingReport:
+    rng = random.Random(seed)
+    vector_index.clear()
+    filing_model.clear()
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            notes = NoteService(db)
+            topics = {}
+            for i in range(containers):
+                container = await ContainerService(db).create_container(
+                    ContainerCreate(name=f"Area {i}", type=ContainerType.AREA)
+                )
+                topics[container.id] = _topic(rng)
+            vocabulary = [word for topic in topics.values() for word in topic]
+            for container_id, topic in topics.items():
+                for _ in range(filed):
+                    text = _text(rng, topic, vocabulary)
+                    note = await notes.create_note(NoteCreate(title=text[:40], content=text))
+                    await notes.move_to_container(note.id, container_id)
+            truth = {}
+            for _ in range(inbox):
+                container_id = rng.choice(list(topics))
+                text = _text(rng, topics[container_id], vocabulary)
+                note = await notes.create_note(NoteCreate(title=text[:40], content=text))
+                truth[note.id] = container_id
+
+            filing = FilingService(db)
+            filing_model.clear()
+            started = time.perf_counter()
+            await filing.train()
+            full_train = time.perf_counter() - started
+
+            page_times, top1, top3 = [], 0, 0
+            for offset in range(0, inbox, page):
+                started = time.perf_counter()
+                suggestions = await filing.suggest_inbox(limit=page, offset=offset, top=3)
+                page_times.append(time.perf_counter() - started)
+                for entry in suggestions:
+                    ranked = [s.container_id for s in entry.suggestions]
+                    top1 += ranked[:1] == [truth[entry.note_id]]
+                    top3 += truth[entry.note_id] in ranked
+
+            refiled = next(iter(truth))
+            await notes.move_to_container(refiled, truth[refiled])
+            started = time.perf_counter()
+            await filing.train()
+            refile_train = time.perf_counter() - started
+        await engine.dispose()
+    vector_index.clear()
+    filing_model.clear()
+    return FilingReport(
+        containers=containers,
+        filed_notes=containers * filed,
+        inbox_notes=inbox,
+        top1_accuracy=top1 / inbox,
+        top3_accuracy=top3 / inbox,
+        page_ms=statistics.median(page_times) * 1000,
+        full_train_ms=full_train * 1000,
+        refile_train_ms=refile_train * 1000,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--containers", type=int, default=20, help="containers to file into")
+    parser.add_argument("--filed", type=int, default=30, help="filed notes per container")
+    parser.add_argument("--inbox", type=int, default=100, help="inbox notes to suggest for")
+    parser.add_argument("--page", type=int, default=50, help="inbox notes per suggestion call")
+    parser.add_argument("--seed", type=int, default=7, help="random seed for the corpus")
+    parser.add_argument("--json", action="store_true", help="print machine-readable output")
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        benchmark(
+            containers=args.containers,
+            filed=args.filed,
+            inbox=args.inbox,
+            page=args.page,
+            seed=args.seed,
+        )
+    )
+    if args.json:
+        print(json.dumps(asdict(report), indent=2))
+        return
+    print(
+        f"{report.containers} containers, {report.filed_notes} filed notes, "
+        f"{report.inbox_notes} inbox notes"
+    )
+    print(f"top-1 accuracy   {report.top1_accuracy:.2f}")
+    print(f"top-3 accuracy   {report.top3_accuracy:.2f}")
+    print(f"page of {args.page:<8} {report.page_ms:.1f} ms")
+    print(f"full training    {report.full_train_ms:.1f} ms")
+    print(f"after one refile {report.refile_train_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Embedding work per note edit, whole-note re-embedding versus cached chunks.
+
+Seeds a temporary SQLite file with ``--notes`` long notes of ``--paragraphs``
+paragraphs each, then applies ``--edits`` small edits through
+``NoteService.update_note``: a word changed, a sentence inserted, a
+paragraph appended or one deleted. Each edit re-embeds only the chunks
+whose content hash has no cached vector. The baseline embeds the whole
+edited note, as every save did before notes were chunked. Reports the
+characters sent to the embedder, embedding time and the chunk reuse rate.
+
+Run from ``backend/``::
+
+    .venv/bin/python -m evals.incremental_embedding
+    .venv/bin/python -m evals.incremental_embedding --notes 20 --paragraphs 80 --edits 400 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from app.database import Base
+from app.schemas.note import NoteCreate, NoteUpdate
+from app.services.embedding_service import chunk_reuse, get_embedder
+from app.services.note_service import NoteService
+from app.services.vector_index import Vector
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+WORDS = ["idea", "project", "area", "resource", "archive", "summary", "layer", "capture"]
+
+
+@dataclass
+class EmbeddingReport:
+    strategy: str
+    edits: int
+    chars_embedded: int
+    chars_per_edit: float
+    embed_ms: float
+    reuse_rate: float
+
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(20, 80))) + "."
+
+
+def _edit(paragraphs: list[str], rng: random.Random) -> None:
+    at = rng.randrange(len(paragraphs))
+    roll = rng.random()
+    if roll < 0.5:
+        paragraphs[at] = paragraphs[at].replace(rng.choice(WORDS), "insight", 1)
+    elif roll < 0.8:
+        paragraphs[at] = f"{paragraphs[at]} {_paragraph(rng)[:60]}."
+    elif roll < 0.9 or len(paragraphs) < 3:
+        paragraphs.append(_paragraph(rng))
+    else:
+        del paragraphs[at]
+
+
+class _CountingEmbedder:
+    """Wraps the shared embedder's ``embed`` to count the characters and time it takes."""
+
+    def __init__(self) -> None:
+        self.embedder = get_embedder()
+        self.original = self.embedder.embed
+        self.chars = 0
+        self.seconds = 0.0
+
+    def embed(self, texts: Sequence[str]) -> Vector:
+        started = time.perf_counter()
+        matrix = self.original(texts)
+        self.seconds += time.perf_counter() - started
+        self.chars += sum(len(text) for text in texts)
+        return matrix
+
+    def __enter__(self) -> _CountingEmbedder:
+        self.embedder.embed = self.embed  # type: ignore[method-assign]
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.embedder.embed = self.original  # type: ignore[method-assign]
+
+
+async def benchmark(
+    notes: int = 10, paragraphs: int = 60, edits: int = 200, seed: int = 7
+) -> list[EmbeddingReport]:
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            service = NoteService(db)
+            bodies = [[_paragraph(rng) for _ in range(paragraphs)] for _ in range(notes)]
+            note_ids = [
+                (
+                    await service.create_note(NoteCreate(title=f"Note {i}", content="\n\n".join(b)))
+                ).id
+                for i, b in enumerate(bodies)
+            ]
+            chunk_reuse.clear()
+            whole_chars, whole_seconds = 0, 0.0
+            with _CountingEmbedder() as chunked:
+                for _ in range(edits):
+                    i = rng.randrange(notes)
+                    _edit(bodies[i], rng)
+                    content = "\n\n".join(bodies[i])
+                    await service.update_note(note_ids[i], NoteUpdate(content=content))
+                    # Baseline: the same edit re-embedding the whole note
+                    text = f"Note {i}\n{content}"
+                    started = time.perf_counter()
+                    chunked.original([text])
+                    whole_seconds += time.perf_counter() - started
+                    whole_chars += len(text)
+            stats = chunk_reuse.stats(cached_vectors=0)
+        await engine.dispose()
+    return [
+        EmbeddingReport(
+            "whole-note", edits, whole_chars, whole_chars / edits, whole_seconds * 1000, 0.0
+        ),
+        EmbeddingReport(
+            "chunk-cache",
+            edits,
+            chunked.chars,
+            chunked.chars / edits,
+            chunked.seconds * 1000,
+            stats.reuse_rate,
+        ),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=10, help="notes being edited")
+    parser.add_argument("--paragraphs", type=int, default=60, help="paragraphs per note")
+    parser.add_argument("--edits", type=int, default=200, help="edits across all notes")
+    parser.add_argument("--seed", type=int, default=7, help="random seed for the edits")
+    parser.add_argument("--json", action="store_true", help="print machine-readable output")
+    args = parser.parse_args()
+
+    reports = asyncio.run(
+        benchmark(notes=args.notes, paragraphs=args.paragraphs, edits=args.edits, seed=args.seed)
+    )
+    if args.json:
+        print(json.dumps([asdict(r) for r in reports], indent=2))
+        return
+    print(
+        f"{'strategy':<13}{'edits':>7}{'chars':>11}{'chars/edit':>12}{'embed ms':>10}{'reuse':>7}"
+    )
+    for r in reports:
+        print(
+            f"{r.strategy:<13}{r.edits:>7}{r.chars_embedded:>11}{r.chars_per_edit:>12.0f}"
+            f"{r.embed_ms:>10.1f}{r.reuse_rate:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Latency of fetching many notes: one ``GET /notes/{id}`` per ID versus ``GET /notes/batch``.
+
+Seeds a temporary SQLite file with tagged notes and drives the app in process, with
+a fresh session per request as ``get_db`` opens in production. Reports p50/p95 for
+fetching ``--size`` IDs both ways, plus the batch call with a ``title`` projection.
+
+Run from ``backend/``::
+
+    .venv/bin/python -m evals.note_batch
+    .venv/bin/python -m evals.note_batch --notes 2000 --size 100 --repeat 20 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from uuid import UUID
+
+from app.database import Base, get_db
+from app.main import app
+from app.models.note import Note
+from app.models.tag import Tag
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from evals.search_relevance import percentile
+
+
+@dataclass
+class FetchReport:
+    strategy: str
+    ids: int
+    p50_ms: float
+    p95_ms: float
+
+
+async def _seed(sessions: async_sessionmaker[AsyncSession], count: int) -> list[UUID]:
+    async with sessions() as db:
+        tags = [Tag(name=f"tag-{i}") for i in range(20)]
+        notes = [
+            Note(
+                title=f"Note {i}",
+                content=f"Body of note {i} " * 40,
+                tags=random.sample(tags, 3),
+            )
+            for i in range(count)
+        ]
+        db.add_all(notes)
+        await db.commit()
+        return [note.id for note in notes]
+
+
+async def benchmark(notes: int = 1000, size: int = 50, repeat: int = 10) -> list[FetchReport]:
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        note_ids = await _seed(sessions, notes)
+
+        async def session_per_request() -> AsyncGenerator[AsyncSession, None]:
+            async with sessions() as db:
+                yield db
+                await db.commit()
+
+        app.dependency_overrides[get_db] = session_per_request
+        try:
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://bench"
+            ) as client:
+
+                async def per_id(ids: list[UUID]) -> None:
+                    for note_id in ids:
+                        response = await client.get(f"/api/v1/notes/{note_id}")
+                        response.raise_for_status()
+
+                async def batch(ids: list[UUID], fields: list[str] | None = None) -> None:
+                    params: dict[str, list[str]] = {"ids": [str(i) for i in ids]}
+                    if fields:
+                        params["fields"] = fields
+                    response = await client.get("/api/v1/notes/batch", params=params)
+                    response.raise_for_status()
+
+                strategies: dict[str, Callable[[list[UUID]], Awaitable[None]]] = {
+                    "per-id loop": per_id,
+                    "batch": batch,
+                    "batch fields=title": lambda ids: batch(ids, ["title"]),
+                }
+                reports = []
+                for strategy, fetch in strategies.items():
+                    latencies = []
+                    for _ in range(repeat):
+                        ids = random.sample(note_ids, size)
+                        started = time.perf_counter()
+                        await fetch(ids)
+                        latencies.append((time.perf_counter() - started) * 1000)
+                    reports.append(
+                        FetchReport(
+                            strategy=strategy,
+                            ids=size,
+                            p50_ms=percentile(latencies, 50),
+                            p95_ms=percentile(latencies, 95),
+                        )
+                    )
+                return reports
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=1000, help="notes to seed")
+    parser.add_argument("--size", type=int, default=50, help="IDs fetched per request")
+    parser.add_argument("--repeat", type=int, default=10, help="timed fetches per strategy")
+    parser.add_argument("--json", action="store_true", help="print machine-readable output")
+    args = parser.parse_args()
+
+    reports = asyncio.run(benchmark(notes=args.notes, size=args.size, repeat=args.repeat))
+    if args.json:
+        print(json.dumps([asdict(r) for r in reports], indent=2))
+        return
+    print(f"{'strategy':<20}{'ids':>6}{'p50 ms':>10}{'p95 ms':>10}")
+    for r in reports:
+        print(f"{r.strategy:<20}{r.ids:>6}{r.p50_ms:>10.2f}{r.p95_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
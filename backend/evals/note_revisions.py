@@ -0,0 +1,144 @@
+"""Revision storage overhead and read cost across snapshot intervals.
+
+Seeds a temporary SQLite file with ``--notes`` notes and puts each through
+``--edits`` saves of a synthetic editing session: mostly typing appended at
+the end, with inserts and deletes in the middle and the occasional pasted
+paragraph, each save recorded with ``RevisionService.record``. Repeats it for
+each snapshot interval (1 stores every revision in full) and reports the
+bytes stored against full uncompressed copies and the mean time to
+reconstruct a revision.
+
+Run from ``backend/``::
+
+    .venv/bin/python -m evals.note_revisions
+    .venv/bin/python -m evals.note_revisions --notes 20 --edits 200 --intervals 1 8 32 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from app.config import settings
+from app.database import Base
+from app.models.note import Note
+from app.services.revision_service import RevisionService
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+WORDS = ["note", "idea", "project", "keeps", "until", "needs", "moves", "the", "and", "a"]
+
+
+@dataclass
+class RevisionReport:
+    snapshot_interval: int
+    revisions: int
+    snapshots: int
+    stored_bytes: int
+    full_bytes: int
+    overhead_ratio: float
+    read_ms: float
+
+
+def _edit(content: str, rng: random.Random) -> str:
+    roll = rng.random()
+    words = " ".join(rng.choices(WORDS, k=rng.randint(3, 12)))
+    if roll < 0.6 or not content:
+        return f"{content} {words}"
+    at = rng.randrange(len(content))
+    if roll < 0.8:
+        return f"{content[:at]}{words} {content[at:]}"
+    if roll < 0.95:
+        return content[:at] + content[at + rng.randint(5, 60) :]
+    paragraph = " ".join(rng.choices(WORDS, k=rng.randint(80, 200)))
+    return f"{content}\n\n{paragraph}"
+
+
+async def _run(interval: int, notes: int, edits: int, seed: int) -> RevisionReport:
+    rng = random.Random(seed)
+    settings.REVISION_SNAPSHOT_INTERVAL = interval
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            service = RevisionService(db)
+            seeded = [Note(title=f"Note {i}", content="Draft") for i in range(notes)]
+            db.add_all(seeded)
+            await db.commit()
+            for _ in range(edits):
+                for note in seeded:
+                    note.content = _edit(note.content, rng)
+                    note.version += 1
+                    await db.flush()
+                    await service.record(note.id)
+                await db.commit()
+
+            stats = await service.storage_stats()
+            started = time.perf_counter()
+            reads = 0
+            for note in seeded:
+                for revision in range(1, note.version + 1, max(edits // 20, 1)):
+                    await service.get_revision(note.id, revision)
+                    reads += 1
+            read_ms = (time.perf_counter() - started) * 1000 / reads
+        await engine.dispose()
+    return RevisionReport(
+        snapshot_interval=interval,
+        revisions=stats.revisions,
+        snapshots=stats.snapshots,
+        stored_bytes=stats.stored_bytes,
+        full_bytes=stats.full_bytes,
+        overhead_ratio=stats.overhead_ratio,
+        read_ms=read_ms,
+    )
+
+
+async def benchmark(
+    notes: int = 10, edits: int = 100, intervals: tuple[int, ...] = (1, 4, 16, 64), seed: int = 7
+) -> list[RevisionReport]:
+    saved = settings.REVISION_SNAPSHOT_INTERVAL, settings.REVISION_RETENTION_COUNT
+    # Keep every revision so each interval stores the same history
+    settings.REVISION_RETENTION_COUNT = edits + 1
+    try:
+        return [await _run(interval, notes, edits, seed) for interval in intervals]
+    finally:
+        settings.REVISION_SNAPSHOT_INTERVAL, settings.REVISION_RETENTION_COUNT = saved
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=10, help="notes edited")
+    parser.add_argument("--edits", type=int, default=100, help="saves per note")
+    parser.add_argument(
+        "--intervals", type=int, nargs="+", default=[1, 4, 16, 64], help="snapshot intervals"
+    )
+    parser.add_argument("--seed", type=int, default=7, help="random seed for the edit session")
+    parser.add_argument("--json", action="store_true", help="print machine-readable output")
+    args = parser.parse_args()
+
+    reports = asyncio.run(
+        benchmark(
+            notes=args.notes, edits=args.edits, intervals=tuple(args.intervals), seed=args.seed
+        )
+    )
+    if args.json:
+        print(json.dumps([asdict(r) for r in reports], indent=2))
+        return
+    print(
+        f"{'interval':>9}{'revisions':>11}{'snapshots':>11}{'stored':>10}{'full':>11}{'ratio':>8}"
+    )
+    for r in reports:
+        print(
+            f"{r.snapshot_interval:>9}{r.revisions:>11}{r.snapshots:>11}{r.stored_bytes:>10}"
+            f"{r.full_bytes:>11}{r.overhead_ratio:>8.3f}  read {r.read_ms:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Offline relevance and latency evaluation for keyword, semantic and hybrid search.
+
+Seeds an in-memory SQLite database with the labeled corpus in
+``search_queries.json``, runs every query through each search mode and reports
+recall@k, MRR and nDCG@k alongside p50/p95 latency.
+
+Run from ``backend/``::
+
+    .venv/bin/python -m evals.search_relevance
+    .venv/bin/python -m evals.search_relevance --k 5 --repeat 20 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import statistics
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from app.database import Base
+from app.models.note import Note
+from app.schemas.note import NoteCreate
+from app.schemas.search import HybridSearchOptions
+from app.services.embedding_service import vector_index
+from app.services.note_service import NoteService
+from app.services.search_service import SearchService, invalidate_search_cache
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+DATASET = Path(__file__).with_name("search_queries.json")
+
+
+@dataclass
+class ModeReport:
+    mode: str
+    recall: float
+    mrr: float
+    ndcg: float
+    p50_ms: float
+    p95_ms: float
+
+
+def recall_at_k(ranked: Sequence[str], relevant: set[str], k: int) -> float:
+    if not relevant:
+        return 0.0
+    return len(set(ranked[:k]) & relevant) / len(relevant)
+
+
+def reciprocal_rank(ranked: Sequence[str], relevant: set[str]) -> float:
+    for rank, key in enumerate(ranked, start=1):
+        if key in relevant:
+            return 1.0 / rank
+    return 0.0
+
+
+def ndcg_at_k(ranked: Sequence[str], relevant: set[str], k: int) -> float:
+    dcg = sum(
+        1.0 / math.log2(rank + 1) for rank, key in enumerate(ranked[:k], 1) if key in relevant
+    )
+    ideal = sum(1.0 / math.log2(rank + 1) for rank in range(1, min(k, len(relevant)) + 1))
+    return dcg / ideal if ideal else 0.0
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def evaluate(k: int = 10, repeat: int = 5, dataset: Path = DATASET) -> list[ModeReport]:
+    data = json.loads(dataset.read_text())
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    invalidate_search_cache()
+    vector_index.clear()
+
+    try:
+        async with sessions() as db:
+            keys: dict[Any, str] = {}
+            for item in data["notes"]:
+                note = await NoteService(db).create_note(
+                    NoteCreate(title=item["title"], content=item["content"])
+                )
+                keys[note.id] = item["key"]
+
+            search = SearchService(db)
+            modes: dict[str, Callable[[str], Awaitable[list[Note]]]] = {
+                "keyword": lambda q: search.search_notes(q, limit=k),
+                "semantic": lambda q: search.search_semantic(q, limit=k),
+                "hybrid": lambda q: search.search_hybrid(q, HybridSearchOptions(), limit=k),
+            }
+            reports = []
+            for mode, run in modes.items():
+                recalls, rrs, ndcgs, latencies = [], [], [], []
+                for labeled in data["queries"]:
+                    relevant = set(labeled["relevant"])
+                    for _ in range(repeat):
+                        started = time.perf_counter()
+                        notes = await run(labeled["query"])
+                        latencies.append((time.perf_counter() - started) * 1000)
+                    ranked = [keys[note.id] for note in notes]
+                    recalls.append(recall_at_k(ranked, relevant, k))
+                    rrs.append(reciprocal_rank(ranked, relevant))
+                    ndcgs.append(ndcg_at_k(ranked, relevant, k))
+                reports.append(
+                    ModeReport(
+                        mode=mode,
+                        recall=statistics.fmean(recalls),
+                        mrr=statistics.fmean(rrs),
+                        ndcg=statistics.fmean(ndcgs),
+                        p50_ms=percentile(latencies, 50),
+                        p95_ms=percentile(latencies, 95),
+                    )
+                )
+            return reports
+    finally:
+        vector_index.clear()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per query")
+    parser.add_argument("--json", action="store_true", help="print machine-readable output")
+    args = parser.parse_args()
+
+    reports = asyncio.run(evaluate(k=args.k, repeat=args.repeat))
+    if args.json:
+        print(json.dumps([asdict(r) for r in reports], indent=2))
+        return
+    print(
+        f"{'mode':<10}{'recall@' + str(args.k):>11}{'MRR':>8}{'nDCG':>8}{'p50 ms':>9}{'p95 ms':>9}"
+    )
+    for r in reports:
+        print(
+            f"{r.mode:<10}{r.recall:>11.3f}{r.mrr:>8.3f}{r.ndcg:>8.3f}{r.p50_ms:>9.2f}{r.p95_ms:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Throughput of the hot read paths with per-call versus prebuilt SQL statements.
+
+Seeds a temporary SQLite file, then drives ``GET /notes/{id}``, ``GET /inbox`` and
+``GET /recent`` through the app in process, on one core, alternating between
+the services' prebuilt module-level statements and the previous code, which
+built a fresh ``select()`` on every call. Reports median requests per second
+and, without the HTTP layer, service calls per second.
+
+Run from ``backend/``::
+
+    .venv/bin/python -m evals.statement_cache
+    .venv/bin/python -m evals.statement_cache --seconds 2 --rounds 9 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import tempfile
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from unittest.mock import patch
+from uuid import UUID
+
+from app.database import Base, get_db
+from app.main import app
+from app.models.note import CodeStage, Note
+from app.services.note_service import NoteService
+from app.services.search_service import SearchService
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+
+INBOX_SIZE = 20
+PATHS = ("/api/v1/notes/{id}", "/api/v1/inbox", "/api/v1/recent")
+
+
+@dataclass
+class ThroughputReport:
+    path: str
+    statements: str
+    requests_per_second: float
+    calls_per_second: float
+
+
+async def _get_note_with_tags(self: NoteService, note_id: UUID) -> Note | None:
+    result = await self.db.execute(
+        select(Note).options(selectinload(Note.tags)).where(Note.id == note_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def _get_inbox(self: SearchService) -> list[Note]:
+    result = await self.db.execute(
+        select(Note)
+        .where(Note.code_stage == CodeStage.CAPTURE)
+        .where(Note.container_id.is_(None))
+        .order_by(Note.captured_at.desc())
+    )
+    return list(result.scalars().all())
+
+
+async def _get_recent(self: SearchService, limit: int = 20) -> list[Note]:
+    result = await self.db.execute(select(Note).order_by(Note.updated_at.desc()).limit(limit))
+    return list(result.scalars().all())
+
+
+PER_CALL_STATEMENTS = [
+    (NoteService, "get_note_with_tags", _get_note_with_tags),
+    (SearchService, "get_inbox", _get_inbox),
+    (SearchService, "get_recent", _get_recent),
+]
+
+
+async def _seed(sessions: async_sessionmaker[AsyncSession], count: int) -> list[UUID]:
+    async with sessions() as db:
+        notes = [
+            Note(
+                title=f"Note {i}",
+                content=f"Body of note {i} " * 40,
+                # Only the newest few stay in the inbox, as after a weekly review
+                code_stage=CodeStage.CAPTURE if i >= count - INBOX_SIZE else CodeStage.ORGANIZE,
+            )
+            for i in range(count)
+        ]
+        db.add_all(notes)
+        await db.commit()
+        return [note.id for note in notes]
+
+
+async def _rate(call: Callable[[], Awaitable[object]], seconds: float) -> float:
+    for _ in range(50):
+        await call()
+    done, started = 0, time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < seconds:
+        await call()
+        done += 1
+    return done / elapsed
+
+
+async def benchmark(
+    notes: int = 2000, seconds: float = 1.0, rounds: int = 5
+) -> list[ThroughputReport]:
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        note_ids = await _seed(sessions, notes)
+
+        async def session_per_request() -> AsyncGenerator[AsyncSession, None]:
+            async with sessions() as db:
+                yield db
+                await db.commit()
+
+        async def service_call(path: str) -> None:
+            # A fresh session per call, as each request gets one
+            async with sessions() as db:
+                if path == "/api/v1/inbox":
+                    await SearchService(db).get_inbox()
+                elif path == "/api/v1/recent":
+                    await SearchService(db).get_recent()
+                else:
+                    await NoteService(db).get_note_with_tags(random.choice(note_ids))
+
+        app.dependency_overrides[get_db] = session_per_request
+        try:
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://bench"
+            ) as client:
+
+                async def request(path: str) -> None:
+                    if path == "/api/v1/notes/{id}":
+                        path = f"/api/v1/notes/{random.choice(note_ids)}"
+                    (await client.get(path)).raise_for_status()
+
+                # Variants alternate round by round, so drift on a busy host hits both alike
+                samples: dict[tuple[str, str], list[tuple[float, float]]] = {}
+                for _ in range(rounds):
+                    for statements in ("per-call", "prebuilt"):
+                        with ExitStack() as stack:
+                            if statements == "per-call":
+                                for owner, name, method in PER_CALL_STATEMENTS:
+                                    stack.enter_context(patch.object(owner, name, method))
+                            for path in PATHS:
+                                requests = await _rate(lambda path=path: request(path), seconds)
+                                calls = await _rate(lambda path=path: service_call(path), seconds)
+                                samples.setdefault((path, statements), []).append((requests, calls))
+                reports = [
+                    ThroughputReport(
+                        path=path,
+                        statements=statements,
+                        requests_per_second=statistics.median(r for r, _ in rates),
+                        calls_per_second=statistics.median(c for _, c in rates),
+                    )
+                    for (path, statements), rates in sorted(samples.items())
+                ]
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            await engine.dispose()
+    return reports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=2000, help="notes to seed")
+    parser.add_argument("--seconds", type=float, default=1.0, help="timed run per measurement")
+    parser.add_argument("--rounds", type=int, default=5, help="alternating rounds per variant")
+    parser.add_argument("--json", action="store_true", help="print machine-readable output")
+    args = parser.parse_args()
+
+    reports = asyncio.run(benchmark(notes=args.notes, seconds=args.seconds, rounds=args.rounds))
+    if args.json:
+        print(json.dumps([asdict(r) for r in reports], indent=2))
+        return
+    print(f"{'path':<22}{'statements':<12}{'req/s':>10}{'calls/s':>10}")
+    for r in reports:
+        print(
+            f"{r.path:<22}{r.statements:<12}"
+            f"{r.requests_per_second:>10.0f}{r.calls_per_second:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
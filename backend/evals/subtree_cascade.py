@@ -0,0 +1,187 @@
+"""Archiving and deleting a container subtree, per-row ORM walk versus set-based.
+
+Seeds a temporary SQLite file with an Area holding ``--depth`` levels of
+nested projects, ``--fanout`` children each and ``--notes`` notes per
+container, then archives and deletes the whole subtree both ways, each on a
+fresh copy of the file: walking it level by level through the ORM, as a
+client looping over the single-container endpoints would, and with
+``ContainerService.archive_subtree`` / ``delete_subtree``, which select the
+subtree with one recursive CTE. Reports SQL statements executed and wall time.
+
+Run from ``backend/``::
+
+    .venv/bin/python -m evals.subtree_cascade
+    .venv/bin/python -m evals.subtree_cascade --depth 4 --fanout 6 --notes 20 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import shutil
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from app.database import Base
+from app.models.container import Container, ContainerType
+from app.models.note import CodeStage, Note
+from app.services.container_service import ContainerService
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+
+@dataclass
+class CascadeReport:
+    operation: str
+    strategy: str
+    containers: int
+    notes: int
+    statements: int
+    ms: float
+
+
+async def _seed(path: Path, depth: int, fanout: int, notes: int) -> UUID:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+        root = Container(name="Area", type=ContainerType.AREA)
+        level = [root]
+        containers = [root]
+        for d in range(depth):
+            level = [
+                Container(name=f"Project {d}.{i}", type=ContainerType.PROJECT, parent=parent)
+                for parent in level
+                for i in range(fanout)
+            ]
+            containers.extend(level)
+        db.add_all(containers)
+        db.add_all(
+            Note(title=f"Note {i}", content="Body", container=container)
+            for container in containers
+            for i in range(notes)
+        )
+        await db.commit()
+        root_id = root.id
+    await engine.dispose()
+    return root_id
+
+
+async def _orm_subtree(db: AsyncSession, root_id: UUID) -> list[Container]:
+    containers = [await db.get_one(Container, root_id)]
+    frontier = [root_id]
+    while frontier:
+        result = await db.execute(select(Container).where(Container.parent_id.in_(frontier)))
+        children = list(result.scalars())
+        containers.extend(children)
+        frontier = [child.id for child in children]
+    return containers
+
+
+async def _orm_archive(db: AsyncSession, root_id: UUID) -> tuple[int, int]:
+    containers = await _orm_subtree(db, root_id)
+    notes = 0
+    for container in containers:
+        container.type = ContainerType.ARCHIVE
+        container.is_active = False
+        result = await db.execute(select(Note.id).where(Note.container_id == container.id))
+        notes += len(result.all())
+    await db.commit()
+    return len(containers), notes
+
+
+async def _orm_delete(db: AsyncSession, root_id: UUID) -> tuple[int, int]:
+    containers = await _orm_subtree(db, root_id)
+    notes = 0
+    for container in reversed(containers):
+        result = await db.execute(select(Note).where(Note.container_id == container.id))
+        for note in result.scalars():
+            note.container_id = None
+            note.code_stage = CodeStage.CAPTURE
+            notes += 1
+        await db.flush()
+        await db.delete(container)
+    await db.commit()
+    return len(containers), notes
+
+
+async def _set_based(db: AsyncSession, root_id: UUID, operation: str) -> tuple[int, int]:
+    service = ContainerService(db)
+    run = service.archive_subtree if operation == "archive" else service.delete_subtree
+    result = await run(root_id)
+    return (result.containers, result.notes) if result else (0, 0)
+
+
+async def _measure(
+    source: Path, operation: str, strategy: str, run: Callable[[AsyncSession], Awaitable[Any]]
+) -> CascadeReport:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "run.db"
+        shutil.copy(source, path)
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        statements = 0
+
+        def count(*_: object) -> None:
+            nonlocal statements
+            statements += 1
+
+        event.listen(engine.sync_engine, "before_cursor_execute", count)
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            started = time.perf_counter()
+            containers, notes = await run(db)
+            elapsed = (time.perf_counter() - started) * 1000
+        await engine.dispose()
+    return CascadeReport(operation, strategy, containers, notes, statements, elapsed)
+
+
+async def benchmark(depth: int = 3, fanout: int = 5, notes: int = 10) -> list[CascadeReport]:
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "seed.db"
+        root_id = await _seed(source, depth, fanout, notes)
+        orm = {"archive": _orm_archive, "delete": _orm_delete}
+        reports = []
+        for operation in ("archive", "delete"):
+            reports.append(
+                await _measure(
+                    source, operation, "orm-walk", lambda db, op=operation: orm[op](db, root_id)
+                )
+            )
+            reports.append(
+                await _measure(
+                    source,
+                    operation,
+                    "set-based",
+                    lambda db, op=operation: _set_based(db, root_id, op),
+                )
+            )
+    return reports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depth", type=int, default=3, help="levels of projects under the Area")
+    parser.add_argument("--fanout", type=int, default=5, help="child projects per container")
+    parser.add_argument("--notes", type=int, default=10, help="notes per container")
+    parser.add_argument("--json", action="store_true", help="print machine-readable output")
+    args = parser.parse_args()
+
+    reports = asyncio.run(benchmark(depth=args.depth, fanout=args.fanout, notes=args.notes))
+    if args.json:
+        print(json.dumps([asdict(r) for r in reports], indent=2))
+        return
+    print(f"{'operation':<11}{'strategy':<11}{'containers':>11}{'notes':>7}{'stmts':>7}{'ms':>9}")
+    for r in reports:
+        print(
+            f"{r.operation:<11}{r.strategy:<11}{r.containers:>11}{r.notes:>7}"
+            f"{r.statements:>7}{r.ms:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,36 @@
 import pytest
 from app.database import Base, get_db
 from app.main import app
+from app.services.autocomplete_service import autocomplete_index
+from app.services.concurrency import write_conflicts
+from app.services.embedding_service import chunk_reuse, vector_index
+from app.services.filing_service import filing_model
+from app.services.search_service import invalidate_search_cache
+from app.services.single_flight import read_flights
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 
+@pytest.fixture(autouse=True)
+def clear_search_cache():
+    """Cached search state must not leak between per-test databases."""
+    invalidate_search_cache()
+    vector_index.clear()
+    autocomplete_index.clear()
+    read_flights.clear()
+    write_conflicts.clear()
+    chunk_reuse.clear()
+    filing_model.clear()
+    yield
+    invalidate_search_cache()
+    vector_index.clear()
+    autocomplete_index.clear()
+    read_flights.clear()
+    write_conflicts.clear()
+    chunk_reuse.clear()
+    filing_model.clear()
+
+
 @pytest.fixture
 async def db_session():
     """Create a fresh in-memory SQLite database for each test."""
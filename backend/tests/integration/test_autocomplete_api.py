@@ -0,0 +1,30 @@
+import pytest
+from httpx import AsyncClient
+
+
+async def _labels(client: AsyncClient, q: str, **params: str) -> list[tuple[str, str]]:
+    response = await client.get("/api/v1/autocomplete", params={"q": q, **params})
+    assert response.status_code == 200
+    return [(s["kind"], s["label"]) for s in response.json()]
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_follows_writes(client: AsyncClient):
+    note = (await client.post("/api/v1/notes", json={"title": "Garden log", "content": "x"})).json()
+    await client.post("/api/v1/containers", json={"name": "Gardening", "type": "area"})
+    await client.put(f"/api/v1/notes/{note['id']}/tags", json={"tags": ["garlic"]})
+
+    assert await _labels(client, "gar") == [
+        ("tag", "garlic"),
+        ("container", "Gardening"),
+        ("note", "Garden log"),
+    ]
+
+    await client.put(f"/api/v1/notes/{note['id']}", json={"title": "Orchard log"})
+    assert await _labels(client, "log") == [("note", "Orchard log")]
+    await client.delete(f"/api/v1/notes/{note['id']}")
+    assert await _labels(client, "gar", kinds="note") == []
+
+    stats = (await client.get("/api/v1/autocomplete/stats")).json()
+    assert stats["entries"] == 2
+    assert stats["approx_bytes"] > 0
@@ -0,0 +1,57 @@
+import pytest
+from httpx import AsyncClient
+
+
+async def _changes(client: AsyncClient, since: int = 0, limit: int = 500) -> dict:
+    response = await client.get("/api/v1/changes", params={"since": since, "limit": limit})
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_feed_keeps_latest_change_per_entity(client: AsyncClient):
+    """Repeated edits collapse to one record, ordered after everything older."""
+    container = await client.post("/api/v1/containers", json={"name": "P", "type": "project"})
+    container_id = container.json()["id"]
+    note = await client.post("/api/v1/notes", json={"title": "Draft", "content": "v1"})
+    note_id = note.json()["id"]
+    await client.put(f"/api/v1/notes/{note_id}", json={"content": "v2"})
+    await client.patch(f"/api/v1/notes/{note_id}/move", json={"container_id": container_id})
+
+    changes = (await _changes(client))["changes"]
+
+    assert [(c["entity"], c["entity_id"], c["op"]) for c in changes] == [
+        ("container", container_id, "upsert"),
+        ("note", note_id, "upsert"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cursor_returns_only_newer_changes_including_tombstones(client: AsyncClient):
+    keep = (await client.post("/api/v1/notes", json={"title": "Keep", "content": "x"})).json()
+    gone = (await client.post("/api/v1/notes", json={"title": "Gone", "content": "y"})).json()
+    cursor = (await _changes(client))["next_cursor"]
+
+    await client.delete(f"/api/v1/notes/{gone['id']}")
+    await client.put(f"/api/v1/notes/{keep['id']}/tags", json={"tags": ["sync"]})
+
+    page = await _changes(client, since=cursor)
+    records = {(c["entity"], c["entity_id"], c["op"]) for c in page["changes"]}
+    assert ("note", gone["id"], "delete") in records
+    assert ("highlights", gone["id"], "delete") in records
+    assert ("note", keep["id"], "upsert") in records
+    assert any(c["entity"] == "tag" and c["op"] == "upsert" for c in page["changes"])
+    assert all(c["seq"] > cursor for c in page["changes"])
+
+
+@pytest.mark.asyncio
+async def test_changes_are_paged(client: AsyncClient):
+    for i in range(5):
+        await client.post("/api/v1/notes", json={"title": f"N{i}", "content": "body"})
+
+    first = await _changes(client, limit=3)
+    second = await _changes(client, since=first["next_cursor"], limit=3)
+
+    assert (len(first["changes"]), first["has_more"]) == (3, True)
+    assert (len(second["changes"]), second["has_more"]) == (2, False)
+    assert second["next_cursor"] > first["next_cursor"]
@@ -143,6 +143,30 @@ async def test_archive_container(client: AsyncClient):
     assert response.json()["is_active"] is False
 
 
+@pytest.mark.asyncio
+async def test_conditional_container_writes(client: AsyncClient):
+    """Container writes apply only over the version named in If-Match."""
+    create_response = await client.post(
+        "/api/v1/containers",
+        json={"name": "Launch", "type": "project"},
+    )
+    container_id = create_response.json()["id"]
+    assert create_response.headers["etag"] == '"1"'
+
+    renamed = await client.put(
+        f"/api/v1/containers/{container_id}", json={"name": "Relaunch"}, headers={"If-Match": '"1"'}
+    )
+    assert renamed.headers["etag"] == '"2"'
+
+    url = f"/api/v1/containers/{container_id}"
+    stale_archive = await client.patch(f"{url}/archive", headers={"If-Match": '"1"'})
+    assert stale_archive.status_code == 412
+    assert (await client.delete(url, headers={"If-Match": '"1"'})).status_code == 412
+    assert (await client.get(url)).json()["type"] == "project"
+
+    assert (await client.delete(url, headers={"If-Match": '"2"'})).status_code == 204
+
+
 @pytest.mark.asyncio
 async def test_delete_container(client: AsyncClient):
     """Delete container removes it."""
@@ -185,3 +209,77 @@ async def test_delete_nonexistent_container_returns_404(client: AsyncClient):
     response = await client.delete("/api/v1/containers/00000000-0000-0000-0000-000000000000")
 
     assert response.status_code == 404
+
+
+async def _create_tree(client: AsyncClient) -> dict[str, str]:
+    """An Area with nested projects and a note in each, plus an unrelated container."""
+    ids: dict[str, str] = {}
+    for name, parent in (
+        ("area", None),
+        ("a", "area"),
+        ("a1", "a"),
+        ("b", "area"),
+        ("other", None),
+    ):
+        response = await client.post(
+            "/api/v1/containers",
+            json={"name": name, "type": "project", "parent_id": ids.get(parent)},
+        )
+        ids[name] = response.json()["id"]
+        note = await client.post("/api/v1/notes", json={"title": f"In {name}", "content": "x"})
+        await client.patch(
+            f"/api/v1/notes/{note.json()['id']}/move", json={"container_id": ids[name]}
+        )
+    return ids
+
+
+@pytest.mark.asyncio
+async def test_archive_subtree_archives_descendants(client: AsyncClient):
+    """Archiving a subtree archives every descendant and leaves their notes in place."""
+    ids = await _create_tree(client)
+
+    response = await client.patch(f"/api/v1/containers/{ids['area']}/subtree/archive")
+
+    assert response.status_code == 200
+    assert response.json() == {"root_id": ids["area"], "containers": 4, "notes": 4}
+    containers = {c["name"]: c for c in (await client.get("/api/v1/containers")).json()}
+    for name in ("area", "a", "a1", "b"):
+        assert containers[name]["type"] == "archive"
+        assert containers[name]["is_active"] is False
+        assert containers[name]["version"] == 2
+        assert containers[name]["note_count"] == 1
+    assert containers["other"]["type"] == "project"
+
+
+@pytest.mark.asyncio
+async def test_delete_subtree_moves_notes_to_inbox(client: AsyncClient):
+    """Deleting a subtree removes every descendant and sends their notes to the inbox."""
+    ids = await _create_tree(client)
+
+    stale = await client.delete(f"/api/v1/containers/{ids['a']}/subtree", headers={"If-Match": "7"})
+    assert stale.status_code == 412
+
+    response = await client.delete(f"/api/v1/containers/{ids['a']}/subtree")
+
+    assert response.status_code == 200
+    assert response.json() == {"root_id": ids["a"], "containers": 2, "notes": 2}
+    remaining = {c["name"] for c in (await client.get("/api/v1/containers")).json()}
+    assert remaining == {"area", "b", "other"}
+    inbox = (await client.get("/api/v1/inbox")).json()
+    assert {note["title"] for note in inbox} == {"In a", "In a1"}
+    changes = (await client.get("/api/v1/changes")).json()["changes"]
+    deleted = {
+        c["entity_id"] for c in changes if c["entity"] == "container" and c["op"] == "delete"
+    }
+    assert deleted == {ids["a"], ids["a1"]}
+
+
+@pytest.mark.asyncio
+async def test_subtree_with_parent_cycle_terminates(client: AsyncClient):
+    """A parent_id cycle is walked once instead of recursing forever."""
+    ids = await _create_tree(client)
+    await client.put(f"/api/v1/containers/{ids['area']}", json={"parent_id": ids["a1"]})
+
+    response = await client.patch(f"/api/v1/containers/{ids['a']}/subtree/archive")
+
+    assert response.json()["containers"] == 4
@@ -0,0 +1,60 @@
+import asyncio
+import os
+import time
+from functools import partial
+from pathlib import Path
+
+import pytest
+from app.config import settings
+from app.services.cpu_pool import cpu_pool
+from app.services.dedup_service import compute_signatures
+from httpx import AsyncClient
+
+ARTICLE = "Progressive summarization distills captured notes into layers of highlights. "
+
+
+def _pid_once_released(gate: str, timeout: float = 30.0) -> int:
+    """Worker-side: block until the test creates ``gate``, then report the worker's pid."""
+    deadline = time.monotonic() + timeout
+    while not Path(gate).exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_bulk_cpu_job_is_split_across_the_pool(client: AsyncClient, monkeypatch):
+    """A bulk MinHash job runs as chunked pool tasks and matches the inline result."""
+    monkeypatch.setattr(settings, "CPU_POOL_CHUNK_BYTES", 50_000)
+    texts = [f"{i} {ARTICLE * 60}" for i in range(100)]
+    sign = partial(compute_signatures, num_perm=128, shingle_size=3)
+
+    await cpu_pool.start(workers=2)
+    try:
+        signatures = await cpu_pool.map_texts(sign, texts)
+        stats = (await client.get("/api/v1/jobs/cpu-pool")).json()
+    finally:
+        await cpu_pool.stop()
+
+    assert signatures == sign(texts)
+    [task] = [s for s in stats if s["name"] == "compute_signatures"]
+    assert task["count"] > 1
+
+
+@pytest.mark.asyncio
+async def test_requests_are_served_while_a_cpu_task_runs(client: AsyncClient, tmp_path):
+    """The event loop keeps serving while a task is busy in a worker process."""
+    gate = tmp_path / "release"
+
+    await cpu_pool.start(workers=1)
+    try:
+        task = asyncio.create_task(cpu_pool.run(_pid_once_released, str(gate)))
+        responses = [await client.get("/api/v1/jobs") for _ in range(20)]
+        still_running = not task.done()
+        gate.touch()
+        worker_pid = await task
+    finally:
+        await cpu_pool.stop()
+
+    assert [r.status_code for r in responses] == [200] * 20
+    assert still_running
+    assert worker_pid != os.getpid()
@@ -0,0 +1,109 @@
+import hashlib
+
+import pytest
+from app.config import settings
+from app.services.document_service import stored_path
+from httpx import AsyncClient
+
+
+@pytest.fixture(autouse=True)
+def document_storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DOCUMENT_STORAGE_DIR", str(tmp_path / "documents"))
+    return tmp_path / "documents"
+
+
+async def _upload(client: AsyncClient, filename: str, data: bytes, media_type: str = "text/plain"):
+    return await client.post("/api/v1/documents", files={"file": (filename, data, media_type)})
+
+
+@pytest.mark.asyncio
+async def test_upload_streams_and_chunks_document(client: AsyncClient, monkeypatch):
+    """An upload is stored under its hash and split into overlapping chunks in batches."""
+    monkeypatch.setattr(settings, "DOCUMENT_READ_BLOCK_BYTES", 1000)
+    monkeypatch.setattr(settings, "DOCUMENT_CHUNK_CHARS", 300)
+    monkeypatch.setattr(settings, "DOCUMENT_CHUNK_INSERT_BATCH", 4)
+    text = "\n\n".join(f"## Section {i}\n\n" + "Some notes here. " * 10 for i in range(30))
+    data = text.encode()
+
+    response = await client.post(
+        "/api/v1/documents",
+        data={"source": "export"},
+        files={"file": ("notes.md", data, "text/markdown")},
+    )
+
+    assert response.status_code == 201
+    document = response.json()
+    sha256 = hashlib.sha256(data).hexdigest()
+    assert (document["format"], document["sha256"]) == ("markdown", sha256)
+    assert (document["size_bytes"], document["char_count"]) == (len(data), len(text))
+    assert stored_path(sha256).read_bytes() == data
+    chunks = (
+        await client.get(f"/api/v1/documents/{document['id']}/chunks", params={"limit": 500})
+    ).json()
+    assert len(chunks) == document["chunk_count"] > 4
+    assert [c["ordinal"] for c in chunks] == list(range(len(chunks)))
+    assert all(text[c["start_offset"] :].startswith(c["content"]) for c in chunks)
+
+
+@pytest.mark.asyncio
+async def test_duplicate_upload_returns_existing_document(client: AsyncClient, document_storage):
+    """Content already stored is matched by hash and not ingested again."""
+    first = await _upload(client, "a.txt", b"Same bytes")
+    second = await _upload(client, "b.txt", b"Same bytes")
+
+    assert (first.status_code, second.status_code) == (201, 200)
+    assert second.json()["id"] == first.json()["id"]
+    assert len((await client.get("/api/v1/documents")).json()) == 1
+    assert list((document_storage / ".incoming").iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_html_upload_is_chunked_as_text(client: AsyncClient):
+    html = b"<html><head><script>x()</script></head><body><h1>Title</h1><p>Body</p></body></html>"
+
+    response = await _upload(client, "page.html", html, "text/html")
+
+    chunks = (await client.get(f"/api/v1/documents/{response.json()['id']}/chunks")).json()
+    assert [c["content"] for c in chunks] == ["Title\n\nBody"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("filename", "data", "status_code"),
+    [("report.pdf", b"%PDF-1.7 binary", 415), ("image.png", b"\x89PNG\r\n\x1a\n\x00", 415)],
+)
+async def test_unsupported_upload_is_rejected(
+    client: AsyncClient, document_storage, filename, data, status_code
+):
+    response = await _upload(client, filename, data, "application/octet-stream")
+
+    assert response.status_code == status_code
+    assert [p for p in document_storage.rglob("*") if p.is_file()] == []
+
+
+@pytest.mark.asyncio
+async def test_upload_over_size_limit_is_rejected(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(settings, "DOCUMENT_MAX_BYTES", 100)
+
+    response = await _upload(client, "big.log", b"x" * 101)
+
+    assert response.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_upload_requires_multipart_file(client: AsyncClient):
+    not_multipart = await client.post("/api/v1/documents", json={"file": "text"})
+    no_file = await client.post("/api/v1/documents", files={"other": ("a.txt", b"x")})
+
+    assert (not_multipart.status_code, no_file.status_code) == (415, 400)
+
+
+@pytest.mark.asyncio
+async def test_delete_document_removes_chunks_and_file(client: AsyncClient):
+    document = (await _upload(client, "a.txt", b"Delete me")).json()
+
+    response = await client.delete(f"/api/v1/documents/{document['id']}")
+
+    assert response.status_code == 204
+    assert not stored_path(document["sha256"]).exists()
+    assert (await client.get(f"/api/v1/documents/{document['id']}/chunks")).status_code == 404
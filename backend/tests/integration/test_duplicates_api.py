@@ -0,0 +1,116 @@
+from uuid import UUID, uuid4
+
+import numpy as np
+import pytest
+from app.config import settings
+from app.models.note import Note
+from app.models.signature import NoteLshBucket, NoteSignature
+from app.services.job_service import BACKFILL_SIGNATURES, JobService, run_pending_jobs
+from httpx import AsyncClient
+
+ARTICLE = (
+    "The PARA method organizes digital information into projects, areas, resources "
+    "and archives so that every note has an obvious home and can be found again "
+    "when a project needs it"
+)
+
+
+async def _create(client: AsyncClient, title: str, content: str, **extra) -> dict:
+    response = await client.post(
+        "/api/v1/notes", json={"title": title, "content": content, **extra}
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_capture_flags_near_duplicate(client: AsyncClient):
+    """Re-clipping the same article with a trivial edit points at the original."""
+    original = await _create(client, "PARA", ARTICLE)
+    copy = await _create(client, "PARA", ARTICLE.replace("obvious", "clear"))
+    unrelated = await _create(client, "Groceries", "Buy milk, eggs and bread")
+
+    assert original["duplicate_of_id"] is None
+    assert copy["duplicate_of_id"] == original["id"]
+    assert unrelated["duplicate_of_id"] is None
+
+
+@pytest.mark.asyncio
+async def test_capture_flags_same_source_url(client: AsyncClient):
+    url = "https://example.com/para"
+    first = await _create(client, "Clip", "First excerpt", source_url=url)
+    second = await _create(client, "Clip again", "Different excerpt entirely", source_url=url)
+
+    assert second["duplicate_of_id"] == first["id"]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_clusters_group_vault(client: AsyncClient):
+    """Clusters join near-duplicates and shared source URLs; singletons are omitted."""
+    original = await _create(client, "PARA", ARTICLE)
+    copy = await _create(client, "PARA copy", ARTICLE)
+    first = await _create(client, "A", "alpha text", source_url="https://example.com/a")
+    second = await _create(client, "B", "beta words", source_url="https://example.com/a")
+    await _create(client, "Lonely", "Nothing else looks like this note")
+
+    response = await client.get("/api/v1/notes/duplicates")
+
+    assert response.status_code == 200
+    clusters = {frozenset(note["id"] for note in c["notes"]) for c in response.json()}
+    assert clusters == {
+        frozenset({original["id"], copy["id"]}),
+        frozenset({first["id"], second["id"]}),
+    }
+
+
+@pytest.mark.asyncio
+async def test_unsigned_notes_are_signed_by_the_backfill_job_not_the_read(
+    client: AsyncClient, db_session
+):
+    """Listing clusters never writes; notes stored before dedup wait for the backfill job."""
+    await _create(client, "PARA", ARTICLE)
+    imported = Note(id=uuid4(), title="PARA import", content=ARTICLE)
+    db_session.add(imported)
+    await db_session.commit()
+
+    before = await client.get("/api/v1/notes/duplicates")
+    assert before.json() == []
+    assert await db_session.get(NoteSignature, imported.id) is None
+
+    await JobService(db_session).enqueue(BACKFILL_SIGNATURES)
+    await db_session.commit()
+    await run_pending_jobs(db_session)
+
+    [cluster] = (await client.get("/api/v1/notes/duplicates")).json()
+    assert str(imported.id) in [note["id"] for note in cluster["notes"]]
+
+
+@pytest.mark.asyncio
+async def test_bucket_members_unlike_the_first_still_pair(client: AsyncClient, db_session):
+    """Two near-duplicates sharing a bucket with an unrelated note are clustered."""
+    ids = [UUID(int=i) for i in (1, 2, 3)]
+    values = [0, 1, 1]
+    for note_id, value in zip(ids, values, strict=True):
+        db_session.add(Note(id=note_id, title=str(note_id), content=ARTICLE))
+        await db_session.flush()
+        minhash = np.full(settings.DEDUP_NUM_PERM, value, dtype=np.uint32).tobytes()
+        db_session.add(NoteSignature(note_id=note_id, minhash=minhash))
+        db_session.add(NoteLshBucket(note_id=note_id, band=0, bucket=7))
+    await db_session.commit()
+
+    [cluster] = (await client.get("/api/v1/notes/duplicates")).json()
+
+    assert sorted(note["id"] for note in cluster["notes"]) == [str(i) for i in ids[1:]]
+
+
+@pytest.mark.asyncio
+async def test_deleting_original_clears_duplicate_link(client: AsyncClient):
+    original = await _create(client, "PARA", ARTICLE)
+    copy = await _create(client, "PARA", ARTICLE)
+
+    await client.delete(f"/api/v1/notes/{original['id']}")
+    response = await client.get(f"/api/v1/notes/{copy['id']}")
+
+    assert response.json()["duplicate_of_id"] is None
+    clusters = await client.get("/api/v1/notes/duplicates")
+    assert clusters.json() == []
@@ -0,0 +1,36 @@
+from uuid import uuid4
+
+import pytest
+from app.models.change import ChangeEntity
+from app.services.broadcaster import change_broadcaster
+from app.services.change_service import ChangeService
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@pytest.mark.asyncio
+async def test_committed_write_is_published_with_its_feed_seq(client: AsyncClient):
+    subscription = change_broadcaster.subscribe()
+    try:
+        note = (await client.post("/api/v1/notes", json={"title": "Live", "content": "x"})).json()
+        frame = await anext(subscription.frames(heartbeat=1))
+    finally:
+        change_broadcaster.unsubscribe(subscription)
+
+    changes = (await client.get("/api/v1/changes")).json()["changes"]
+    assert f"id: {changes[-1]['seq']}\n" in frame
+    assert f'"seq":{changes[-1]["seq"]}' in frame
+    assert '"version"' not in frame
+    assert note["id"] in frame
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_changes_are_not_published(db_session: AsyncSession):
+    subscription = change_broadcaster.subscribe()
+    try:
+        await ChangeService(db_session).record(ChangeEntity.TAG, [uuid4()])
+        await db_session.rollback()
+        await db_session.commit()
+        assert await anext(subscription.frames(heartbeat=0.01)) == ": heartbeat\n\n"
+    finally:
+        change_broadcaster.unsubscribe(subscription)
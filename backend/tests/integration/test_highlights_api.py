@@ -0,0 +1,220 @@
+import pytest
+from httpx import AsyncClient
+
+
+async def _note_with_highlights(
+    client: AsyncClient, title: str, content: str, highlights: list[dict]
+) -> str:
+    response = await client.post("/api/v1/notes", json={"title": title, "content": content})
+    note_id = response.json()["id"]
+    await client.patch(f"/api/v1/notes/{note_id}/highlights", json={"highlights": highlights})
+    return note_id
+
+
+@pytest.mark.asyncio
+async def test_highlights_are_queryable_across_notes(client: AsyncClient):
+    """Highlight rows carry the extracted text; the layer filter includes higher layers."""
+    await _note_with_highlights(
+        client,
+        "First",
+        "Progressive summarization in layers",
+        [{"start": 0, "end": 11, "layer": 2}, {"start": 12, "end": 25, "layer": 3}],
+    )
+    await _note_with_highlights(
+        client, "Second", "Capture what resonates", [{"start": 0, "end": 7, "layer": 2}]
+    )
+
+    response = await client.get("/api/v1/highlights", params={"layer": 3})
+    inclusive = await client.get("/api/v1/highlights", params={"layer": 2})
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [(h["layer"], h["text"]) for h in items] == [(3, "summarization")]
+    assert [h["text"] for h in inclusive.json()["items"]] == [
+        "Progressive",
+        "summarization",
+        "Capture",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_updating_highlights_replaces_rows(client: AsyncClient):
+    """Re-submitting highlights replaces the previous rows for that note."""
+    note_id = await _note_with_highlights(
+        client, "Note", "Hello world", [{"start": 0, "end": 5, "layer": 2}]
+    )
+    await client.patch(
+        f"/api/v1/notes/{note_id}/highlights",
+        json={"highlights": [{"start": 6, "end": 11, "layer": 3}]},
+    )
+
+    response = await client.get("/api/v1/highlights", params={"note_id": note_id})
+
+    assert [h["text"] for h in response.json()["items"]] == ["world"]
+
+
+@pytest.mark.asyncio
+async def test_highlights_page_with_cursor(client: AsyncClient):
+    """Highlights are paged with a keyset cursor."""
+    await _note_with_highlights(
+        client,
+        "Note",
+        "abcdef",
+        [{"start": i, "end": i + 1, "layer": 2} for i in range(5)],
+    )
+
+    first = await client.get("/api/v1/highlights", params={"limit": 3})
+    cursor = first.json()["next_cursor"]
+    second = await client.get("/api/v1/highlights", params={"limit": 3, "after": cursor})
+
+    assert [h["text"] for h in first.json()["items"]] == ["a", "b", "c"]
+    assert [h["text"] for h in second.json()["items"]] == ["d", "e"]
+    assert second.json()["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_cursor_survives_an_edit_between_pages(client: AsyncClient):
+    """An edit that shifts highlights keeps their ids, so paging neither repeats nor skips."""
+    note_id = await _note_with_highlights(
+        client,
+        "Note",
+        "abcdef",
+        [{"start": i, "end": i + 1, "layer": 2} for i in range(5)],
+    )
+    await _note_with_highlights(client, "Later", "xyz", [{"start": 0, "end": 1, "layer": 2}])
+    params = {"note_id": note_id, "limit": 2}
+
+    first = (await client.get("/api/v1/highlights", params=params)).json()
+    await client.put(f"/api/v1/notes/{note_id}", json={"content": "xyz abcdef"})
+    second = (
+        await client.get(
+            "/api/v1/highlights", params={**params, "limit": 5, "after": first["next_cursor"]}
+        )
+    ).json()
+
+    assert [h["text"] for h in first["items"]] == ["a", "b"]
+    assert [h["text"] for h in second["items"]] == ["c", "d", "e"]
+
+
+@pytest.mark.asyncio
+async def test_cursor_survives_resubmitted_highlights(client: AsyncClient):
+    """Resubmitting highlights keeps the rows of unchanged ranges, so none is skipped."""
+    note_id = await _note_with_highlights(
+        client,
+        "Note",
+        "abcdef",
+        [{"start": i, "end": i + 1, "layer": 2} for i in range(5)],
+    )
+
+    first = (await client.get("/api/v1/highlights", params={"limit": 2})).json()
+    await client.patch(
+        f"/api/v1/notes/{note_id}/highlights",
+        json={"highlights": [{"start": i, "end": i + 1, "layer": 2} for i in range(1, 5)]},
+    )
+    second = (
+        await client.get("/api/v1/highlights", params={"limit": 5, "after": first["next_cursor"]})
+    ).json()
+
+    assert [h["text"] for h in first["items"]] == ["a", "b"]
+    assert [h["text"] for h in second["items"]] == ["c", "d", "e"]
+
+
+@pytest.mark.asyncio
+async def test_highlighted_notes_filtered_by_container(client: AsyncClient):
+    """Highlighted notes can be listed per container with counts."""
+    container = await client.post("/api/v1/containers", json={"name": "P", "type": "project"})
+    container_id = container.json()["id"]
+    filed = await _note_with_highlights(
+        client,
+        "Filed",
+        "Some text here",
+        [{"start": 0, "end": 4, "layer": 2}, {"start": 5, "end": 9, "layer": 3}],
+    )
+    await client.patch(f"/api/v1/notes/{filed}/move", json={"container_id": container_id})
+    await _note_with_highlights(client, "Inbox", "Other", [{"start": 0, "end": 5, "layer": 3}])
+
+    response = await client.get(
+        "/api/v1/highlights/notes", params={"container_id": container_id, "layer": 3}
+    )
+
+    assert response.json() == [
+        {"note_id": filed, "title": "Filed", "container_id": container_id, "highlight_count": 1}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_deleting_note_removes_highlights(client: AsyncClient):
+    """Deleting a note removes its highlight rows."""
+    note_id = await _note_with_highlights(
+        client, "Gone", "Soon deleted", [{"start": 0, "end": 4, "layer": 2}]
+    )
+
+    await client.delete(f"/api/v1/notes/{note_id}")
+    response = await client.get("/api/v1/highlights")
+
+    assert response.json()["items"] == []
+
+
+@pytest.mark.asyncio
+async def test_highlights_rejects_invalid_layer(client: AsyncClient):
+    """Only layers 2 and 3 can be filtered on."""
+    response = await client.get("/api/v1/highlights", params={"layer": 4})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_distilled_projection_has_excerpts_not_content(client: AsyncClient):
+    """The distilled view returns cached L2/L3 excerpts and no raw content."""
+    note_id = await _note_with_highlights(
+        client,
+        "Distill me",
+        "Raw capture. Key idea here. More raw text.",
+        [{"start": 13, "end": 27, "layer": 2}, {"start": 17, "end": 21, "layer": 3}],
+    )
+
+    response = await client.get(f"/api/v1/notes/{note_id}/distilled")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["l2_excerpt"] == "Key idea here."
+    assert data["l3_excerpt"] == "idea"
+    assert "content" not in data
+
+
+@pytest.mark.asyncio
+async def test_content_edit_rebases_highlights_and_excerpts(client: AsyncClient):
+    """Editing content before a highlight shifts it; editing inside flags it stale."""
+    note_id = await _note_with_highlights(
+        client,
+        "Edit me",
+        "Intro. Keep this. Change this.",
+        [{"start": 7, "end": 17, "layer": 2}, {"start": 18, "end": 30, "layer": 3}],
+    )
+
+    await client.put(
+        f"/api/v1/notes/{note_id}", json={"content": "New intro. Keep this. Changed that."}
+    )
+    distilled = (await client.get(f"/api/v1/notes/{note_id}/distilled")).json()
+    rows = (await client.get("/api/v1/highlights", params={"note_id": note_id})).json()
+
+    assert distilled["l2_excerpt"] == "Keep this."
+    assert distilled["l3_excerpt"] is None
+    assert distilled["highlights_stale"] is True
+    assert [(h["text"], h["stale"]) for h in rows["items"]] == [
+        ("Keep this.", False),
+        ("Changed that.", True),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_list_distilled_only_includes_highlighted_notes(client: AsyncClient):
+    """The distilled listing skips notes without excerpts."""
+    await client.post("/api/v1/notes", json={"title": "Plain", "content": "Nothing"})
+    await _note_with_highlights(
+        client, "Marked", "Marked text", [{"start": 0, "end": 6, "layer": 2}]
+    )
+
+    response = await client.get("/api/v1/notes/distilled")
+
+    assert [n["title"] for n in response.json()] == ["Marked"]
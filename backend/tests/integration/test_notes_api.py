@@ -1,5 +1,12 @@
+from uuid import UUID
+
 import pytest
+from app.schemas.note import NoteUpdate
+from app.services.concurrency import VersionConflictError
+from app.services.job_service import run_pending_jobs
+from app.services.note_service import NoteService
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 @pytest.mark.asyncio
@@ -89,6 +96,113 @@ async def test_update_note(client: AsyncClient):
     assert response.json()["content"] == "Original content"
 
 
+@pytest.mark.asyncio
+async def test_update_with_stale_if_match_returns_412(client: AsyncClient):
+    """A write conditional on a version another write replaced is refused, not applied."""
+    create_response = await client.post(
+        "/api/v1/notes",
+        json={"title": "Shared", "content": "Edited on two devices"},
+    )
+    note_id = create_response.json()["id"]
+    read = await client.get(f"/api/v1/notes/{note_id}")
+    assert read.headers["etag"] == '"1"'
+
+    first = await client.put(
+        f"/api/v1/notes/{note_id}", json={"title": "Laptop"}, headers={"If-Match": '"1"'}
+    )
+    assert first.status_code == 200
+    assert first.json()["version"] == 2
+    assert first.headers["etag"] == '"2"'
+
+    second = await client.put(
+        f"/api/v1/notes/{note_id}", json={"title": "Phone"}, headers={"If-Match": '"1"'}
+    )
+    assert second.status_code == 412
+    assert second.headers["etag"] == '"2"'
+    assert (await client.get(f"/api/v1/notes/{note_id}")).json()["title"] == "Laptop"
+
+    stale_delete = await client.delete(f"/api/v1/notes/{note_id}", headers={"If-Match": '"1"'})
+    assert stale_delete.status_code == 412
+    [stats] = (await client.get("/api/v1/changes/conflicts")).json()
+    assert stats["entity"] == "note"
+    assert (stats["writes"], stats["committed"], stats["precondition_failed"]) == (3, 1, 2)
+
+
+@pytest.mark.asyncio
+async def test_write_that_loses_a_race_is_rolled_back(
+    client: AsyncClient, db_session: AsyncSession
+):
+    """A write over a version that changed after it was read matches no row and rolls back."""
+    create_response = await client.post(
+        "/api/v1/notes",
+        json={"title": "Shared", "content": "Original"},
+    )
+    note_id = UUID(create_response.json()["id"])
+
+    async with AsyncSession(db_session.bind, expire_on_commit=False) as other:
+        # The other request has read version 1 when this one commits version 2
+        other_service = NoteService(other)
+        stale = await other_service.get_note(note_id)
+        await other.commit()
+        assert stale.version == 1
+        await client.put(f"/api/v1/notes/{note_id}", json={"content": "Mine"})
+
+        with pytest.raises(VersionConflictError) as conflict:
+            await other_service.update_note(note_id, NoteUpdate(content="Theirs"))
+    assert conflict.value.expected_version is None
+
+    note = (await client.get(f"/api/v1/notes/{note_id}")).json()
+    assert (note["content"], note["version"]) == ("Mine", 2)
+    [stats] = (await client.get("/api/v1/changes/conflicts")).json()
+    assert (stats["lost_races"], stats["conflict_rate"]) == (1, 0.5)
+
+
+@pytest.mark.asyncio
+async def test_if_match_must_be_an_etag_from_this_api(client: AsyncClient):
+    """Any version matches ``*``; a value that is not one of our ETags is rejected."""
+    create_response = await client.post(
+        "/api/v1/notes",
+        json={"title": "Note", "content": "Content"},
+    )
+    note_id = create_response.json()["id"]
+
+    url = f"/api/v1/notes/{note_id}/move"
+    assert (await client.patch(url, json={}, headers={"If-Match": "*"})).status_code == 200
+    assert (await client.patch(url, json={}, headers={"If-Match": 'W/"2"'})).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_revision_history_and_restore(client: AsyncClient, db_session: AsyncSession):
+    """Edits are recorded as revisions in the background and can be read back and restored."""
+    create_response = await client.post(
+        "/api/v1/notes",
+        json={"title": "Essay", "content": "First draft"},
+    )
+    note_id = create_response.json()["id"]
+    await run_pending_jobs(db_session)
+    await client.put(f"/api/v1/notes/{note_id}", json={"content": "First draft, revised"})
+    await run_pending_jobs(db_session)
+    # Moving changes no revised field, so it adds no revision
+    await client.patch(f"/api/v1/notes/{note_id}/move", json={})
+    await run_pending_jobs(db_session)
+
+    revisions = (await client.get(f"/api/v1/notes/{note_id}/revisions")).json()
+    assert [(r["revision"], r["kind"]) for r in revisions] == [(2, "delta"), (1, "snapshot")]
+    first = (await client.get(f"/api/v1/notes/{note_id}/revisions/1")).json()
+    assert (first["title"], first["content"]) == ("Essay", "First draft")
+
+    etag = (await client.get(f"/api/v1/notes/{note_id}")).headers["etag"]
+    restored = await client.post(
+        f"/api/v1/notes/{note_id}/revisions/1/restore", headers={"If-Match": etag}
+    )
+    assert restored.status_code == 200
+    assert restored.json()["content"] == "First draft"
+    await run_pending_jobs(db_session)
+    stats = (await client.get("/api/v1/notes/revisions/stats")).json()
+    assert (stats["notes"], stats["revisions"]) == (1, 3)
+    assert (await client.get(f"/api/v1/notes/{note_id}/revisions/99")).status_code == 404
+
+
 @pytest.mark.asyncio
 async def test_delete_note(client: AsyncClient):
     """Delete note removes it."""
@@ -241,3 +355,40 @@ async def test_list_notes_with_filters(client: AsyncClient):
     assert response.status_code == 200
     assert len(response.json()) == 1
     assert response.json()[0]["title"] == "Apple Note"
+
+
+@pytest.mark.asyncio
+async def test_batch_get_preserves_order_and_reports_missing(client: AsyncClient):
+    first = (await client.post("/api/v1/notes", json={"title": "One", "content": "a"})).json()
+    second = (await client.post("/api/v1/notes", json={"title": "Two", "content": "b"})).json()
+    await client.put(f"/api/v1/notes/{second['id']}/tags", json={"tags": ["batch"]})
+    missing = "00000000-0000-0000-0000-000000000000"
+
+    response = await client.get(
+        "/api/v1/notes/batch", params={"ids": [second["id"], missing, first["id"]]}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [note["title"] for note in body["notes"]] == ["Two", "One"]
+    assert [tag["name"] for tag in body["notes"][0]["tags"]] == ["batch"]
+    assert body["not_found"] == [missing]
+
+
+@pytest.mark.asyncio
+async def test_batch_get_projects_requested_fields(client: AsyncClient):
+    note = (await client.post("/api/v1/notes", json={"title": "Slim", "content": "long"})).json()
+
+    response = await client.get(
+        "/api/v1/notes/batch", params={"ids": [note["id"]], "fields": ["title", "code_stage"]}
+    )
+
+    assert response.json()["notes"] == [
+        {"id": note["id"], "title": "Slim", "code_stage": "capture"}
+    ]
+    bad_field = await client.get(
+        "/api/v1/notes/batch", params={"ids": [note["id"]], "fields": ["password"]}
+    )
+    assert bad_field.status_code == 422
+    too_many = await client.get("/api/v1/notes/batch", params={"ids": [note["id"]] * 101})
+    assert too_many.status_code == 422
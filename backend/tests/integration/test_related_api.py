@@ -0,0 +1,121 @@
+from uuid import UUID, uuid4
+
+import numpy as np
+import pytest
+from app.config import settings
+from app.services.job_service import run_pending_jobs
+from app.services.related_service import RelatedNotesService
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def _create(
+    client: AsyncClient, title: str, content: str, container_id: str | None = None
+) -> str:
+    response = await client.post("/api/v1/notes", json={"title": title, "content": content})
+    note_id = response.json()["id"]
+    if container_id:
+        await client.patch(f"/api/v1/notes/{note_id}/move", json={"container_id": container_id})
+    return note_id
+
+
+@pytest.mark.asyncio
+async def test_related_notes_ranked_by_similarity(client: AsyncClient):
+    """The closest note comes first and the note itself is never listed."""
+    source = await _create(
+        client, "Sourdough starter", "Feed the sourdough starter flour and water"
+    )
+    close = await _create(client, "Sourdough bread", "Bake sourdough bread with an active starter")
+    await _create(client, "Tax return", "File the quarterly tax return before the deadline")
+
+    response = await client.get(f"/api/v1/notes/{source}/related")
+
+    assert response.status_code == 200
+    related = response.json()
+    assert related[0]["id"] == close
+    assert source not in [note["id"] for note in related]
+    assert related == sorted(related, key=lambda note: note["score"], reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_related_lists_follow_edits_and_deletes(
+    client: AsyncClient, db_session: AsyncSession
+):
+    """Edits and deletes queue neighbourhood refreshes that update the lists around them."""
+    source = await _create(client, "Garden plan", "Plant tomatoes and basil in the raised bed")
+    other = await _create(client, "Invoice", "Send the invoice to the client")
+
+    before = await client.get(f"/api/v1/notes/{source}/related")
+    assert other not in [note["id"] for note in before.json()]
+
+    await client.put(
+        f"/api/v1/notes/{other}",
+        json={"title": "Garden tomatoes", "content": "Plant tomatoes in the raised bed"},
+    )
+    status = await client.get("/api/v1/jobs")
+    assert status.json()["pending"] >= 1
+    await run_pending_jobs(db_session)
+    after_edit = await client.get(f"/api/v1/notes/{source}/related")
+    assert after_edit.json()[0]["id"] == other
+
+    await client.delete(f"/api/v1/notes/{other}")
+    await run_pending_jobs(db_session)
+    after_delete = await client.get(f"/api/v1/notes/{source}/related")
+    assert other not in [note["id"] for note in after_delete.json()]
+
+
+@pytest.mark.asyncio
+async def test_patched_lists_match_a_full_rescan(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch
+):
+    """Lists updated from the candidate pool equal lists rebuilt by scanning every note."""
+    monkeypatch.setattr(settings, "RELATED_TOP_K", 3)
+    rng = np.random.default_rng(5)
+    words = ["garden", "tomato", "invoice", "client", "sourdough", "flour", "tax", "basil"]
+    ids = [
+        await _create(client, f"Note {i}", " ".join(rng.choice(words, size=6))) for i in range(15)
+    ]
+    await run_pending_jobs(db_session)
+    for note_id in rng.choice(ids, size=10):
+        await client.put(
+            f"/api/v1/notes/{note_id}", json={"content": " ".join(rng.choice(words, size=6))}
+        )
+        await run_pending_jobs(db_session)
+
+    patched = {i: (await client.get(f"/api/v1/notes/{i}/related")).json() for i in ids}
+    await RelatedNotesService(db_session).recompute(UUID(i) for i in ids)
+    rescanned = {i: (await client.get(f"/api/v1/notes/{i}/related")).json() for i in ids}
+
+    for note_id in ids:
+        assert [n["score"] for n in patched[note_id]] == pytest.approx(
+            [n["score"] for n in rescanned[note_id]], abs=1e-5
+        )
+
+
+@pytest.mark.asyncio
+async def test_related_can_exclude_same_container(client: AsyncClient):
+    """exclude_same_container drops neighbours filed alongside the note."""
+    container = await client.post("/api/v1/containers", json={"name": "Kitchen", "type": "area"})
+    container_id = container.json()["id"]
+    source = await _create(
+        client, "Pasta sauce", "Simmer tomato pasta sauce", container_id=container_id
+    )
+    sibling = await _create(
+        client, "Pasta dough", "Knead pasta dough with egg", container_id=container_id
+    )
+    outside = await _create(client, "Tomato soup", "Simmer tomato soup with basil")
+
+    response = await client.get(
+        f"/api/v1/notes/{source}/related", params={"exclude_same_container": True}
+    )
+
+    ids = [note["id"] for note in response.json()]
+    assert sibling not in ids
+    assert outside in ids
+
+
+@pytest.mark.asyncio
+async def test_related_unknown_note_returns_404(client: AsyncClient):
+    response = await client.get(f"/api/v1/notes/{uuid4()}/related")
+
+    assert response.status_code == 404
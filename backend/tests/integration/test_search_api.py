@@ -1,4 +1,10 @@
+import asyncio
+import threading
+
 import pytest
+from app.services.embedding_service import vector_index
+from app.services.filing_service import filing_model
+from app.services.job_service import run_pending_jobs
 from httpx import AsyncClient
 
 
@@ -117,3 +123,319 @@ async def test_recent_respects_limit(client: AsyncClient):
     assert response.status_code == 200
     data = response.json()
     assert len(data) == 3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_recent_requests_are_coalesced_and_see_new_writes(client: AsyncClient):
+    """Identical concurrent reads share a query, but never one older than a write."""
+    await client.post("/api/v1/notes", json={"title": "First", "content": "Content"})
+    responses = await asyncio.gather(*(client.get("/api/v1/recent") for _ in range(4)))
+    await client.post("/api/v1/notes", json={"title": "Second", "content": "Content"})
+    after_write = await client.get("/api/v1/recent")
+
+    assert all(r.json() == responses[0].json() for r in responses)
+    assert [note["title"] for note in responses[0].json()] == ["First"]
+    assert {note["title"] for note in after_write.json()} == {"First", "Second"}
+    stats = {s["name"]: s for s in (await client.get("/api/v1/coalescing")).json()}
+    assert stats["recent"]["calls"] == 5
+    assert stats["recent"]["executed"] + stats["recent"]["shared"] == 5
+
+
+async def _seed_faceted(client: AsyncClient) -> str:
+    container = await client.post("/api/v1/containers", json={"name": "Garden", "type": "area"})
+    container_id = container.json()["id"]
+    for title in ("Python in inbox", "Python filed", "Python filed too", "Rust filed"):
+        note = await client.post("/api/v1/notes", json={"title": title, "content": "Body"})
+        note_id = note.json()["id"]
+        if "filed" in title:
+            await client.patch(f"/api/v1/notes/{note_id}/move", json={"container_id": container_id})
+            await client.put(f"/api/v1/notes/{note_id}/tags", json={"tags": ["lang"]})
+    return container_id
+
+
+@pytest.mark.asyncio
+async def test_faceted_search_returns_counts_per_facet(client: AsyncClient):
+    """Faceted search returns results plus counts per stage, type, container and tag."""
+    container_id = await _seed_faceted(client)
+
+    response = await client.get("/api/v1/search/faceted", params={"q": "python"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 3
+    facets = data["facets"]
+    assert {f["value"]: f["count"] for f in facets["code_stage"]} == {
+        "organize": 2,
+        "capture": 1,
+    }
+    assert {f["value"]: f["count"] for f in facets["container_type"]} == {"area": 2, None: 1}
+    assert facets["container"][0] == {"value": container_id, "label": "Garden", "count": 2}
+    assert facets["tag"] == [{"value": "lang", "label": None, "count": 2}]
+
+
+@pytest.mark.asyncio
+async def test_faceted_search_filters_narrow_results_and_counts(client: AsyncClient):
+    """Facet filters narrow both the result list and the facet counts."""
+    container_id = await _seed_faceted(client)
+
+    response = await client.get(
+        "/api/v1/search/faceted",
+        params={"q": "python", "stage": "organize", "container_id": container_id, "tag": "lang"},
+    )
+
+    data = response.json()
+    assert sorted(n["title"] for n in data["results"]) == ["Python filed", "Python filed too"]
+    assert data["facets"]["code_stage"] == [{"value": "organize", "label": None, "count": 2}]
+
+
+@pytest.mark.asyncio
+async def test_faceted_search_sees_notes_created_after_first_pass(client: AsyncClient):
+    """Creating a note invalidates the cached match set for later searches."""
+    await client.post("/api/v1/notes", json={"title": "Python one", "content": "Body"})
+    first = await client.get("/api/v1/search/faceted", params={"q": "python"})
+    await client.post("/api/v1/notes", json={"title": "Python two", "content": "Body"})
+
+    second = await client.get("/api/v1/search/faceted", params={"q": "python"})
+
+    assert first.json()["total"] == 1
+    assert second.json()["total"] == 2
+
+
+@pytest.mark.asyncio
+async def test_faceted_search_without_matches_is_empty(client: AsyncClient):
+    """A query with no matches returns empty results and facets."""
+    response = await client.get("/api/v1/search/faceted", params={"q": "nothing"})
+
+    assert response.json() == {
+        "total": 0,
+        "results": [],
+        "facets": {"code_stage": [], "container_type": [], "container": [], "tag": []},
+    }
+
+
+@pytest.mark.asyncio
+async def test_semantic_search_ranks_related_notes(client: AsyncClient):
+    """Semantic mode finds notes that share meaning-bearing word pieces, best first."""
+    await client.post(
+        "/api/v1/notes",
+        json={"title": "Progressive summarization", "content": "Summarize notes in layers"},
+    )
+    await client.post(
+        "/api/v1/notes", json={"title": "Bike maintenance", "content": "Chain lube schedule"}
+    )
+
+    response = await client.get(
+        "/api/v1/search", params={"q": "summarizing layered notes", "mode": "semantic"}
+    )
+
+    assert response.status_code == 200
+    assert [n["title"] for n in response.json()] == ["Progressive summarization"]
+
+
+@pytest.mark.asyncio
+async def test_semantic_search_tracks_updates_and_deletes(client: AsyncClient):
+    """Note updates and deletes are reflected in the vector index."""
+    created = await client.post(
+        "/api/v1/notes", json={"title": "Gardening", "content": "Tomato seedlings"}
+    )
+    note_id = created.json()["id"]
+    params = {"q": "kubernetes clusters", "mode": "semantic"}
+    assert (await client.get("/api/v1/search", params=params)).json() == []
+
+    await client.put(f"/api/v1/notes/{note_id}", json={"content": "Kubernetes cluster upgrades"})
+    assert len((await client.get("/api/v1/search", params=params)).json()) == 1
+
+    await client.delete(f"/api/v1/notes/{note_id}")
+    assert (await client.get("/api/v1/search", params=params)).json() == []
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_fuses_keyword_and_semantic(client: AsyncClient):
+    """Hybrid mode returns exact keyword hits and semantically related notes."""
+    await client.post(
+        "/api/v1/notes", json={"title": "PARA method", "content": "Projects areas resources"}
+    )
+    await client.post(
+        "/api/v1/notes",
+        json={"title": "Organizing projects", "content": "Sorting project folders by area"},
+    )
+    await client.post("/api/v1/notes", json={"title": "Sourdough", "content": "Starter feeding"})
+
+    response = await client.get("/api/v1/search", params={"q": "PARA", "mode": "hybrid"})
+
+    titles = [n["title"] for n in response.json()]
+    assert titles[0] == "PARA method"
+    assert "Sourdough" not in titles
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_applies_filters_before_fusion(client: AsyncClient):
+    """Stage and container filters drop candidates from both signals."""
+    container = await client.post("/api/v1/containers", json={"name": "P", "type": "project"})
+    container_id = container.json()["id"]
+    filed = await client.post(
+        "/api/v1/notes", json={"title": "Python filed", "content": "Typing tips"}
+    )
+    await client.patch(
+        f"/api/v1/notes/{filed.json()['id']}/move", json={"container_id": container_id}
+    )
+    await client.post("/api/v1/notes", json={"title": "Python inbox", "content": "Typing tips"})
+
+    response = await client.get(
+        "/api/v1/search",
+        params={"q": "python typing", "mode": "hybrid", "container_type": "project"},
+    )
+
+    assert [n["title"] for n in response.json()] == ["Python filed"]
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_reads_the_vector_index_on_the_event_loop(
+    client: AsyncClient, monkeypatch
+):
+    """Index writes happen on the loop, so a hybrid search never scans it from a thread."""
+    await client.post("/api/v1/notes", json={"title": "PARA method", "content": "Projects"})
+    threads = []
+    original = vector_index.search
+
+    def search(*args, **kwargs):
+        threads.append(threading.get_ident())
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(vector_index, "search", search)
+    response = await client.get("/api/v1/search", params={"q": "PARA", "mode": "hybrid"})
+
+    assert response.status_code == 200
+    assert threads == [threading.get_ident()]
+
+
+@pytest.mark.asyncio
+async def test_search_snippets_omit_body_and_mark_matches(client: AsyncClient):
+    body = (
+        "Background. " * 400 + "The key insight about spaced repetition is here. " + "More. " * 400
+    )
+    await client.post("/api/v1/notes", json={"title": "Memory", "content": body})
+
+    response = await client.get("/api/v1/search/snippets", params={"q": "spaced repetition"})
+
+    assert response.status_code == 200
+    [hit] = response.json()
+    assert "content" not in hit
+    assert len(hit["snippet"]) < 300
+    assert [hit["snippet"][h["start"] : h["end"]] for h in hit["highlights"]] == [
+        "spaced",
+        "repetition",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_keyword_search_applies_limit(client: AsyncClient):
+    for i in range(3):
+        await client.post("/api/v1/notes", json={"title": f"Review {i}", "content": "weekly"})
+
+    notes = await client.get("/api/v1/search", params={"q": "weekly", "limit": 2})
+    snippets = await client.get("/api/v1/search/snippets", params={"q": "weekly", "limit": 2})
+
+    assert len(notes.json()) == len(snippets.json()) == 2
+
+
+@pytest.mark.asyncio
+async def test_keyword_search_is_unbounded_without_a_limit(client: AsyncClient):
+    """Clients calling /search?q= without a limit get every keyword match."""
+    for i in range(25):
+        await client.post("/api/v1/notes", json={"title": f"Review {i}", "content": "weekly"})
+
+    notes = await client.get("/api/v1/search", params={"q": "weekly"})
+
+    assert len(notes.json()) == 25
+
+
+@pytest.mark.asyncio
+async def test_fuzzy_search_tolerates_typos(client: AsyncClient):
+    await client.post(
+        "/api/v1/notes",
+        json={"title": "Progressive Summarization", "content": "Bold, then highlight."},
+    )
+    await client.post("/api/v1/notes", json={"title": "Groceries", "content": "Eggs and milk"})
+
+    keyword = await client.get("/api/v1/search", params={"q": "progresive sumarization"})
+    fuzzy = await client.get(
+        "/api/v1/search", params={"q": "progresive sumarization", "mode": "fuzzy"}
+    )
+
+    assert keyword.json() == []
+    assert [note["title"] for note in fuzzy.json()] == ["Progressive Summarization"]
+
+
+@pytest.mark.asyncio
+async def test_embedding_stats_report_chunk_reuse(client: AsyncClient):
+    """Retitling a note re-embeds only its first chunk; the rest come from the cache."""
+    paragraphs = [f"Paragraph {i} about projects, areas and resources." * 8 for i in range(20)]
+    created = await client.post(
+        "/api/v1/notes", json={"title": "Handbook", "content": "\n\n".join(paragraphs)}
+    )
+    first = (await client.get("/api/v1/search/embeddings")).json()
+
+    await client.put(f"/api/v1/notes/{created.json()['id']}", json={"title": "Field guide"})
+    second = (await client.get("/api/v1/search/embeddings")).json()
+
+    assert first["reuse_rate"] == 0.0
+    assert first["cached_vectors"] == first["chunks"] > 2
+    assert second["embedded"] - first["embedded"] == 1
+    assert second["unchanged"] == first["chunks"] - 1
+    assert second["reuse_rate"] > 0.4
+
+
+@pytest.mark.asyncio
+async def test_inbox_suggestions_follow_filed_notes(client: AsyncClient, db_session):
+    """Inbox notes are matched to the active container whose filed notes they resemble."""
+    topics = {
+        "Garden": ["tomato seedlings and compost", "pruning roses and compost", "watering tomato"],
+        "Finance": ["quarterly tax return", "index fund portfolio", "tax deductions receipts"],
+    }
+    containers = {}
+    for name, titles in topics.items():
+        container = await client.post("/api/v1/containers", json={"name": name, "type": "area"})
+        containers[name] = container.json()["id"]
+        for title in titles:
+            note = await client.post("/api/v1/notes", json={"title": title, "content": title})
+            await client.patch(
+                f"/api/v1/notes/{note.json()['id']}/move", json={"container_id": containers[name]}
+            )
+    await run_pending_jobs(db_session)
+    inbox = await client.post(
+        "/api/v1/notes", json={"title": "Compost for the tomato beds", "content": "seedlings"}
+    )
+
+    response = await client.get("/api/v1/inbox/suggestions", params={"top": 2})
+
+    assert response.status_code == 200
+    [entry] = response.json()
+    assert entry["note_id"] == inbox.json()["id"]
+    assert entry["suggestions"][0]["container_id"] == containers["Garden"]
+    assert entry["suggestions"][0]["container_name"] == "Garden"
+    stats = (await client.get("/api/v1/inbox/suggestions/stats")).json()
+    assert stats == {"loaded": True, "filed_notes": 6, "containers": 2, "stale_containers": 0}
+
+    await client.patch(f"/api/v1/containers/{containers['Garden']}/archive")
+    suggested = (await client.get("/api/v1/inbox/suggestions")).json()[0]["suggestions"]
+    assert containers["Garden"] not in [s["container_id"] for s in suggested]
+
+
+@pytest.mark.asyncio
+async def test_inbox_suggestions_never_train_on_the_request(client: AsyncClient, db_session):
+    """Suggestions serve the last trained centroids; the filing.train job does the training."""
+    container = await client.post("/api/v1/containers", json={"name": "Garden", "type": "area"})
+    filed = await client.post("/api/v1/notes", json={"title": "tomato", "content": "compost"})
+    await client.patch(
+        f"/api/v1/notes/{filed.json()['id']}/move", json={"container_id": container.json()["id"]}
+    )
+    await client.post("/api/v1/notes", json={"title": "tomato beds", "content": "compost"})
+
+    before = (await client.get("/api/v1/inbox/suggestions")).json()
+    assert filing_model.stats().stale_containers == 1
+    await run_pending_jobs(db_session)
+    after = (await client.get("/api/v1/inbox/suggestions")).json()
+
+    assert before[0]["suggestions"] == []
+    assert [s["container_name"] for s in after[0]["suggestions"]] == ["Garden"]
@@ -0,0 +1,97 @@
+import pytest
+from httpx import AsyncClient
+
+
+async def _create_note(client: AsyncClient, title: str) -> str:
+    response = await client.post("/api/v1/notes", json={"title": title, "content": "Content"})
+    return response.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_set_note_tags_replaces_tags(client: AsyncClient):
+    """Setting a note's tags replaces the previous set."""
+    note_id = await _create_note(client, "Tagged")
+
+    await client.put(f"/api/v1/notes/{note_id}/tags", json={"tags": ["python", "basb"]})
+    response = await client.put(f"/api/v1/notes/{note_id}/tags", json={"tags": ["basb", " para "]})
+
+    assert response.status_code == 200
+    assert sorted(t["name"] for t in response.json()["tags"]) == ["basb", "para"]
+
+
+@pytest.mark.asyncio
+async def test_set_tags_on_nonexistent_note_returns_404(client: AsyncClient):
+    """Setting tags on a missing note returns 404."""
+    response = await client.put(
+        "/api/v1/notes/00000000-0000-0000-0000-000000000000/tags", json={"tags": ["x"]}
+    )
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_bulk_assign_is_idempotent_and_reports_missing(client: AsyncClient):
+    """Bulk assignment skips existing links and reports unknown note IDs."""
+    first = await _create_note(client, "First")
+    second = await _create_note(client, "Second")
+    missing = "00000000-0000-0000-0000-000000000000"
+
+    response = await client.post(
+        "/api/v1/tags/assign",
+        json={"note_ids": [first, second, missing], "tags": ["python", "reading"]},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["assigned"] == 4
+    assert data["missing_note_ids"] == [missing]
+
+    again = await client.post("/api/v1/tags/assign", json={"note_ids": [first], "tags": ["python"]})
+    assert again.json()["assigned"] == 0
+
+
+@pytest.mark.asyncio
+async def test_list_tags_with_counts(client: AsyncClient):
+    """Tag listing includes note counts, including unused tags."""
+    first = await _create_note(client, "First")
+    second = await _create_note(client, "Second")
+    await client.post("/api/v1/tags/assign", json={"note_ids": [first, second], "tags": ["a"]})
+    await client.post("/api/v1/tags/assign", json={"note_ids": [first], "tags": ["b"]})
+    await client.put(f"/api/v1/notes/{first}/tags", json={"tags": ["a"]})
+
+    response = await client.get("/api/v1/tags")
+
+    assert response.status_code == 200
+    counts = {t["name"]: t["note_count"] for t in response.json()}
+    assert counts == {"a": 2, "b": 0}
+
+
+@pytest.mark.asyncio
+async def test_list_notes_filters_by_tags(client: AsyncClient):
+    """list_notes supports all-of, any-of and none-of tag filters."""
+    both = await _create_note(client, "Both")
+    only_a = await _create_note(client, "Only A")
+    await _create_note(client, "Untagged")
+    await client.post("/api/v1/tags/assign", json={"note_ids": [both, only_a], "tags": ["a"]})
+    await client.post("/api/v1/tags/assign", json={"note_ids": [both], "tags": ["b"]})
+
+    all_of = await client.get("/api/v1/notes", params={"tags_all": ["a", "b"]})
+    any_of = await client.get("/api/v1/notes", params={"tags_any": ["a", "b"]})
+    none_of = await client.get("/api/v1/notes", params={"tags_none": ["b"]})
+
+    assert [n["title"] for n in all_of.json()] == ["Both"]
+    assert sorted(n["title"] for n in any_of.json()) == ["Both", "Only A"]
+    assert sorted(n["title"] for n in none_of.json()) == ["Only A", "Untagged"]
+
+
+@pytest.mark.asyncio
+async def test_delete_tag(client: AsyncClient):
+    """Deleting a tag removes it; deleting again returns 404."""
+    note_id = await _create_note(client, "Tagged")
+    result = await client.post("/api/v1/tags/assign", json={"note_ids": [note_id], "tags": ["x"]})
+    tag_id = result.json()["tags"][0]["id"]
+
+    response = await client.delete(f"/api/v1/tags/{tag_id}")
+    assert response.status_code == 204
+
+    response = await client.delete(f"/api/v1/tags/{tag_id}")
+    assert response.status_code == 404
@@ -0,0 +1,50 @@
+from uuid import uuid4
+
+from app.schemas.autocomplete import SuggestionKind
+from app.services.autocomplete_service import AutocompleteIndex
+
+
+def test_prefix_matches_any_word_and_ranks_label_prefixes_first():
+    index = AutocompleteIndex()
+    index.load(
+        [
+            (SuggestionKind.NOTE, uuid4(), "Progressive Summarization"),
+            (SuggestionKind.NOTE, uuid4(), "Summary of the week"),
+            (SuggestionKind.TAG, uuid4(), "summer"),
+            (SuggestionKind.CONTAINER, uuid4(), "Taxes"),
+        ]
+    )
+
+    labels = [s.label for s in index.search("SUM")]
+
+    assert labels == ["summer", "Summary of the week", "Progressive Summarization"]
+    assert [s.label for s in index.search("sum", kinds=[SuggestionKind.TAG])] == ["summer"]
+    assert index.search("  ") == []
+
+
+def test_upsert_replaces_old_keys_and_remove_drops_label():
+    index = AutocompleteIndex()
+    note_id = uuid4()
+    index.upsert(SuggestionKind.NOTE, note_id, "Draft plan")
+    index.upsert(SuggestionKind.NOTE, note_id, "Launch plan")
+
+    assert index.search("draft") == []
+    assert [s.id for s in index.search("plan")] == [note_id]
+    assert index.stats().keys == 2
+
+    index.remove(note_id)
+    assert index.search("launch") == []
+    assert index.stats().entries == 0
+
+
+def test_remove_tolerates_an_entry_whose_keys_drifted():
+    """Unlinking never walks past a key's run, so a stale label cannot raise mid-request."""
+    index = AutocompleteIndex()
+    stale, kept = uuid4(), uuid4()
+    index.load([(SuggestionKind.NOTE, stale, "Alpha"), (SuggestionKind.NOTE, kept, "Zulu")])
+    index._entries[stale].label = "Zulu zzz"
+
+    index.remove(stale)
+
+    assert [s.id for s in index.search("zulu")] == [kept]
+    assert len(index) == 1
@@ -0,0 +1,59 @@
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+from app.models.change import ChangeEntity, ChangeOp
+from app.schemas.change import ChangeEvent
+from app.services.broadcaster import ChangeBroadcaster
+
+
+def _event(seq: int, kind: ChangeEntity = ChangeEntity.NOTE) -> ChangeEvent:
+    return ChangeEvent(id=uuid4(), kind=kind, op=ChangeOp.UPSERT, seq=seq)
+
+
+def _data(frame: str) -> dict:
+    return json.loads(frame.split("data: ", 1)[1])
+
+
+@pytest.mark.asyncio
+async def test_events_fan_out_to_matching_subscribers():
+    broadcaster = ChangeBroadcaster()
+    everything = broadcaster.subscribe()
+    containers = broadcaster.subscribe(kinds=[ChangeEntity.CONTAINER])
+
+    broadcaster.publish([_event(1), _event(2, ChangeEntity.CONTAINER)])
+
+    frames = everything.frames(heartbeat=1)
+    first, second = await anext(frames), await anext(frames)
+    assert first.startswith("id: 1\nevent: change\n")
+    assert _data(second)["kind"] == "container"
+    only = await anext(containers.frames(heartbeat=1))
+    assert _data(only)["seq"] == 2
+
+
+@pytest.mark.asyncio
+async def test_lagging_subscriber_gets_one_resync_instead_of_backlog():
+    broadcaster = ChangeBroadcaster()
+    subscription = broadcaster.subscribe(since=5, queue_size=2)
+
+    broadcaster.publish([_event(6), _event(7), _event(8), _event(9)])
+    frames = subscription.frames(heartbeat=1)
+    resync = await anext(frames)
+
+    assert resync.startswith("event: resync\n")
+    assert _data(resync) == {"since": 5}
+    broadcaster.publish([_event(10)])
+    assert _data(await anext(frames))["seq"] == 10
+
+
+@pytest.mark.asyncio
+async def test_idle_stream_sends_heartbeats_and_unsubscribes_on_close():
+    broadcaster = ChangeBroadcaster()
+    stream = broadcaster.stream(last_event_id=3, heartbeat=0.01)
+
+    assert _data(await anext(stream)) == {"since": 3}
+    assert await asyncio.wait_for(anext(stream), 1) == ": heartbeat\n\n"
+    assert broadcaster.subscribers == 1
+    await stream.aclose()
+    assert broadcaster.subscribers == 0
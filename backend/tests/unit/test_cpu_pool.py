@@ -0,0 +1,48 @@
+from functools import partial
+
+import pytest
+from app.config import settings
+from app.services.cpu_pool import CpuPool, PayloadTooLargeError
+from app.services.dedup_service import compute_signatures, signature_from_buffer
+
+
+@pytest.fixture
+async def pool():
+    started = CpuPool()
+    await started.start(workers=2)
+    yield started
+    await started.stop()
+
+
+@pytest.mark.asyncio
+async def test_map_texts_chunks_by_size_and_keeps_order(pool, monkeypatch):
+    monkeypatch.setattr(settings, "CPU_POOL_CHUNK_BYTES", 30)
+    texts = [f"note number {i} about second brains" for i in range(10)]
+    sign = partial(compute_signatures, num_perm=64, shingle_size=3)
+
+    pooled = await pool.map_texts(sign, texts)
+
+    assert pooled == sign(texts)
+    [stats] = pool.stats()
+    assert stats.name == "compute_signatures"
+    assert stats.count == len(texts)
+
+
+@pytest.mark.asyncio
+async def test_large_buffers_go_through_shared_memory(pool, monkeypatch):
+    """Buffers past the threshold are read by the worker from shared memory."""
+    monkeypatch.setattr(settings, "CPU_POOL_SHM_MIN_BYTES", 16)
+    text = "capture organize distill express " * 100
+    sign = partial(signature_from_buffer, num_perm=64, shingle_size=3)
+
+    shared = await pool.run_on_buffer(sign, text.encode())
+
+    assert shared == compute_signatures([text], 64, 3)[0]
+
+
+@pytest.mark.asyncio
+async def test_oversized_payload_is_rejected(monkeypatch):
+    monkeypatch.setattr(settings, "CPU_POOL_MAX_PAYLOAD_BYTES", 10)
+
+    with pytest.raises(PayloadTooLargeError):
+        await CpuPool().run(compute_signatures, ["x" * 11], 64, 3)
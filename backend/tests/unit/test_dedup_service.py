@@ -0,0 +1,58 @@
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+from app.config import settings
+from app.services.dedup_service import (
+    DedupService,
+    band_buckets,
+    estimated_jaccard,
+    minhash_signature,
+    shingles,
+)
+
+ARTICLE = (
+    "Building a second brain means capturing ideas in notes, organizing them by "
+    "projects areas resources and archives, distilling the essence with progressive "
+    "summarization and finally expressing the work in something new"
+)
+
+
+def test_minhash_estimates_shingle_jaccard():
+    """Signature agreement tracks the true Jaccard similarity of the shingle sets."""
+    edited = ARTICLE.replace("finally", "eventually")
+    true = len(shingles(ARTICLE, 3) & shingles(edited, 3)) / len(
+        shingles(ARTICLE, 3) | shingles(edited, 3)
+    )
+
+    first = minhash_signature(ARTICLE, 256, 3)
+    second = minhash_signature(edited, 256, 3)
+
+    assert first is not None and second is not None
+    assert abs(estimated_jaccard(first, second) - true) < 0.1
+    assert minhash_signature("", 256, 3) is None
+
+
+def test_identical_text_shares_every_band_bucket():
+    signature = minhash_signature(ARTICLE, 128, 3)
+    again = minhash_signature(ARTICLE.upper(), 128, 3)
+    unrelated = minhash_signature("Quarterly tax return filing checklist and receipts", 128, 3)
+
+    assert signature is not None and again is not None and unrelated is not None
+    assert band_buckets(signature, 16) == band_buckets(again, 16)
+    assert not set(enumerate(band_buckets(signature, 16))) & set(
+        enumerate(band_buckets(unrelated, 16))
+    )
+
+
+@pytest.mark.asyncio
+async def test_long_note_signature_matches_inline(monkeypatch):
+    """Texts past the inline limit are signed off the loop with identical results."""
+    monkeypatch.setattr(settings, "CPU_POOL_INLINE_MAX_CHARS", 10)
+    service = DedupService(AsyncMock())
+
+    offloaded = await service.signature(ARTICLE)
+
+    assert offloaded is not None
+    assert np.array_equal(offloaded, minhash_signature(ARTICLE, 128, 3))
+    assert await service.signature("  !!  ... ") is None
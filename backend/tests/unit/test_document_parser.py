@@ -0,0 +1,90 @@
+from itertools import pairwise
+
+import pytest
+from app.models.document import DocumentFormat
+from app.services.document_parser import (
+    DocumentTextPipeline,
+    HtmlTextExtractor,
+    TextChunker,
+    UnsupportedFormatError,
+    detect_format,
+)
+
+
+def _chunk_stream(chunker, text, piece):
+    chunks = []
+    for start in range(0, len(text), piece):
+        chunks.extend(chunker.feed(text[start : start + piece]))
+    return chunks + chunker.close()
+
+
+@pytest.mark.parametrize("piece", [7, 100, 10_000])
+def test_chunks_cover_the_text_whatever_the_feed_size(piece):
+    text = "\n\n".join(f"Paragraph {i}. " + "word " * (i % 40) for i in range(200))
+
+    chunks = _chunk_stream(TextChunker(size=200, overlap=40), text, piece)
+
+    assert all(text[c.start_offset : c.start_offset + len(c.content)] == c.content for c in chunks)
+    assert all(len(c.content) <= 200 for c in chunks)
+    assert chunks[0].start_offset == 0
+    assert chunks[-1].start_offset + len(chunks[-1].content) == len(text)
+    for previous, chunk in pairwise(chunks):
+        # Consecutive chunks overlap, so no text falls between them
+        assert previous.start_offset < chunk.start_offset
+        assert chunk.start_offset <= previous.start_offset + len(previous.content)
+
+
+def test_chunks_end_on_paragraph_breaks():
+    text = "\n\n".join("x" * 60 for _ in range(10))
+
+    chunks = _chunk_stream(TextChunker(size=150, overlap=0), text, 1000)
+
+    assert all(c.content.endswith("\n\n") for c in chunks[:-1])
+    assert "".join(c.content for c in chunks) == text
+
+
+def test_html_text_is_the_same_however_the_stream_is_split():
+    html = (
+        "<!DOCTYPE html><html><head><title>T</title><style>p {}</style></head><body>"
+        "<h1>Heading</h1><p>First   paragraph &amp; more</p><script>var x = '<p>';</script>"
+        "<ul><li>One</li><li>Two</li></ul><pre>keep   spacing</pre></body></html>"
+    )
+    whole = HtmlTextExtractor()
+    expected = whole.feed(html) + whole.close()
+
+    split = HtmlTextExtractor()
+    text = "".join(split.feed(html[i : i + 5]) for i in range(0, len(html), 5)) + split.close()
+
+    assert text == expected
+    assert expected == "Heading\n\nFirst paragraph & more\n\nOne\nTwo\n\nkeep   spacing"
+
+
+def test_pipeline_decodes_characters_split_across_blocks():
+    data = "﻿café ☕ ".encode() * 50
+    pipeline = DocumentTextPipeline(DocumentFormat.TEXT, chunk_chars=64, overlap_chars=0)
+
+    chunks = [c for i in range(0, len(data), 3) for c in pipeline.feed(data[i : i + 3])]
+    chunks += pipeline.close()
+
+    assert "".join(c.content for c in chunks) == "café ☕ " + "﻿café ☕ " * 49
+    assert pipeline.char_count == len(data.decode("utf-8-sig"))
+
+
+@pytest.mark.parametrize(
+    ("filename", "media_type", "head", "expected"),
+    [
+        ("notes.md", "application/octet-stream", b"# Title", DocumentFormat.MARKDOWN),
+        ("page", "text/html; charset=utf-8", b"<p>x</p>", DocumentFormat.HTML),
+        ("export", None, b"  <!DOCTYPE html><html>", DocumentFormat.HTML),
+        ("server.log", "text/plain", b"12:00 started", DocumentFormat.TEXT),
+        ("data.bin", None, b"plain words", DocumentFormat.TEXT),
+    ],
+)
+def test_detect_format(filename, media_type, head, expected):
+    assert detect_format(filename, media_type, head) is expected
+
+
+@pytest.mark.parametrize("head", [b"%PDF-1.7\n", b"PK\x03\x04\x00\x00"])
+def test_detect_format_rejects_binary_files(head):
+    with pytest.raises(UnsupportedFormatError):
+        detect_format("upload.txt", "text/plain", head)
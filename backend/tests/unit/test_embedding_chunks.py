@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from app.config import settings
+from app.models.embedding import NoteEmbedding
+from app.schemas.note import NoteCreate, NoteUpdate
+from app.services.embedding_service import (
+    chunk_hash,
+    chunk_note_text,
+    chunk_reuse,
+    get_embedder,
+)
+from app.services.note_service import NoteService
+
+WORDS = ["idea", "project", "archive", "resource", "inbox", "summary", "layer", "note"]
+
+
+def _paragraphs(count: int, seed: int = 3) -> list[str]:
+    rng = np.random.default_rng(seed)
+    return [" ".join(rng.choice(WORDS, size=rng.integers(10, 60))) + "." for _ in range(count)]
+
+
+def test_chunks_cover_the_text_within_size_bounds():
+    text = "Title\n" + "\n\n".join(_paragraphs(80)) + "\n\n" + "x" * 5000
+
+    chunks = chunk_note_text(text)
+
+    assert "".join(c.content for c in chunks) == text
+    assert all(text[c.start_offset :].startswith(c.content) for c in chunks)
+    assert all(len(c.content) <= settings.NOTE_CHUNK_MAX_CHARS for c in chunks)
+    assert sum(len(c.content) >= settings.NOTE_CHUNK_MIN_CHARS for c in chunks) >= len(chunks) - 2
+
+
+def test_an_edit_only_changes_the_chunks_around_it():
+    paragraphs = _paragraphs(120)
+    before = {chunk_hash(c.content) for c in chunk_note_text("\n\n".join(paragraphs))}
+    paragraphs[60] = "An inserted sentence. " + paragraphs[60]
+
+    after = [chunk_hash(c.content) for c in chunk_note_text("\n\n".join(paragraphs))]
+
+    assert len(before) > 10
+    assert sum(h not in before for h in after) <= 2
+
+
+@pytest.mark.asyncio
+async def test_update_reembeds_only_changed_chunks(db_session):
+    service = NoteService(db_session)
+    paragraphs = _paragraphs(60)
+    note = await service.create_note(NoteCreate(title="Long", content="\n\n".join(paragraphs)))
+    created = chunk_reuse.stats(cached_vectors=0)
+    assert created.embedded == created.chunks > 5
+
+    paragraphs[30] = paragraphs[30].replace("idea", "insight", 1)
+    await service.update_note(note.id, NoteUpdate(content="\n\n".join(paragraphs)))
+    edited = chunk_reuse.stats(cached_vectors=0)
+    assert edited.embedded - created.embedded <= 2
+    assert edited.unchanged >= created.chunks - 2
+
+    # Reverting the edit finds every chunk in the cache
+    paragraphs[30] = paragraphs[30].replace("insight", "idea", 1)
+    await service.update_note(note.id, NoteUpdate(content="\n\n".join(paragraphs)))
+    reverted = chunk_reuse.stats(cached_vectors=0)
+    assert reverted.embedded == edited.embedded
+    assert reverted.cache_hits > edited.cache_hits
+
+
+@pytest.mark.asyncio
+async def test_single_chunk_note_vector_is_the_whole_text_embedding(db_session):
+    note = await NoteService(db_session).create_note(NoteCreate(title="Short", content="Body"))
+
+    stored = await db_session.get(NoteEmbedding, note.id)
+
+    expected = get_embedder().embed(["Short\nBody"])[0]
+    np.testing.assert_array_equal(np.frombuffer(stored.vector, dtype=np.float32), expected)
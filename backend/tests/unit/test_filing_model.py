@@ -0,0 +1,60 @@
+from uuid import uuid4
+
+import numpy as np
+from app.services.filing_service import FilingModel
+from app.services.vector_index import VectorIndex
+
+
+def _index(vectors: dict) -> VectorIndex:
+    index = VectorIndex(dim=3)
+    index.load(list(vectors), np.array(list(vectors.values()), dtype=np.float32))
+    return index
+
+
+def test_predict_ranks_the_nearest_container_centroids():
+    a, b, c = uuid4(), uuid4(), uuid4()
+    project, area = uuid4(), uuid4()
+    index = _index({a: [1, 0, 0], b: [0.8, 0.6, 0], c: [0, 0, 1]})
+    model = FilingModel(dim=3)
+    model.load([(a, project), (b, project), (c, area)])
+
+    assert model.train(index) == 2
+    [ranked] = model.predict(np.array([[1, 0, 0]], dtype=np.float32), 2, {project, area})
+
+    assert [container for container, _ in ranked] == [project, area]
+    assert np.isclose(ranked[0][1], 0.9 / np.sqrt(0.9**2 + 0.3**2))
+
+
+def test_refiling_only_retrains_the_containers_involved():
+    a, b, c = uuid4(), uuid4(), uuid4()
+    project, area, resource = uuid4(), uuid4(), uuid4()
+    index = _index({a: [1, 0, 0], b: [0, 1, 0], c: [0, 0, 1]})
+    model = FilingModel(dim=3)
+    model.load([(a, project), (b, area), (c, resource)])
+    model.train(index)
+
+    model.assign(b, project)
+
+    assert model.train(index) == 2
+    assert model.stats().containers == 2
+    query = np.array([[0, 1, 0]], dtype=np.float32)
+    assert [container for container, _ in model.predict(query, 3, {project, resource})[0]] == [
+        project,
+        resource,
+    ]
+
+
+def test_predict_skips_excluded_containers_and_low_scores():
+    a, b = uuid4(), uuid4()
+    project, archived = uuid4(), uuid4()
+    index = _index({a: [1, 0, 0], b: [0, 1, 0]})
+    model = FilingModel(dim=3)
+    model.load([(a, project), (b, archived)])
+    model.train(index)
+
+    ranked = model.predict(np.array([[0, 1, 0]], dtype=np.float32), 3, {project}, min_score=0.1)
+
+    assert ranked == [[]]
+    model.drop_containers([project])
+    model.train(index)
+    assert (len(model), model.stats().containers) == (1, 1)
@@ -0,0 +1,52 @@
+from app.services.highlight_service import build_excerpts, rebase_highlights
+
+
+def test_rebase_shifts_ranges_after_an_insert():
+    """Ranges after an edit move by the length change; ranges before stay put."""
+    highlights = [{"start": 0, "end": 5, "layer": 2}, {"start": 6, "end": 11, "layer": 3}]
+
+    result = rebase_highlights("Hello world", "Hello big world", highlights)
+
+    assert result == [
+        {"start": 0, "end": 5, "layer": 2, "stale": False},
+        {"start": 10, "end": 15, "layer": 3, "stale": False},
+    ]
+
+
+def test_rebase_flags_ranges_whose_text_was_edited():
+    """A range overlapping the edited span is stretched over it and flagged stale."""
+    highlights = [{"start": 6, "end": 11, "layer": 2}]
+
+    result = rebase_highlights("Hello world!", "Hello there!", highlights)
+
+    assert result == [{"start": 6, "end": 11, "layer": 2, "stale": True}]
+
+
+def test_rebase_handles_deletion_before_range():
+    """Deleting text before a range shifts it left."""
+    highlights = [{"start": 10, "end": 14, "layer": 2}]
+
+    result = rebase_highlights("Remove me keep", "keep", highlights)
+
+    assert result == [{"start": 0, "end": 4, "layer": 2, "stale": False}]
+
+
+def test_build_excerpts_merges_overlaps_and_skips_stale():
+    """L2 covers layers 2 and 3 with overlaps merged; stale ranges are left out."""
+    content = "alpha beta gamma delta"
+    highlights = [
+        {"start": 0, "end": 10, "layer": 2},
+        {"start": 6, "end": 10, "layer": 3},
+        {"start": 11, "end": 16, "layer": 2, "stale": True},
+        {"start": 17, "end": 22, "layer": 2},
+    ]
+
+    l2, l3 = build_excerpts(content, highlights)
+
+    assert l2 == "alpha beta\n…\ndelta"
+    assert l3 == "beta"
+
+
+def test_build_excerpts_returns_none_without_highlights():
+    """Notes without highlights have no excerpts."""
+    assert build_excerpts("text", []) == (None, None)
@@ -0,0 +1,141 @@
+import asyncio
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+from app.config import settings
+from app.database import Base
+from app.models.job import Job, JobStatus
+from app.services import job_service
+from app.services.job_service import JobRunner, JobService, run_pending_jobs
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Register a recording ``test.record`` handler and a failing ``test.fail`` handler."""
+    seen = []
+
+    async def record(db, note_id):
+        seen.append(note_id)
+
+    async def fail(db, note_id):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(job_service.JOB_HANDLERS, "test.record", record)
+    monkeypatch.setitem(job_service.JOB_HANDLERS, "test.fail", fail)
+    return seen
+
+
+async def _jobs(db_session):
+    result = await db_session.execute(select(Job).order_by(Job.id))
+    return list(result.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_enqueue_coalesces_pending_jobs_per_note(db_session, calls):
+    note_id = uuid4()
+    service = JobService(db_session)
+
+    for _ in range(3):
+        await service.enqueue("test.record", note_id)
+        await db_session.commit()
+    await service.enqueue("test.record", uuid4())
+    await db_session.commit()
+
+    assert len(await _jobs(db_session)) == 2
+    assert await run_pending_jobs(db_session) == 2
+    assert await _jobs(db_session) == []
+    assert calls[0] == note_id
+
+
+@pytest.mark.asyncio
+async def test_failed_job_backs_off_then_fails(db_session, calls, monkeypatch):
+    """A failing job is rescheduled with backoff and marked failed after the last attempt."""
+    monkeypatch.setattr(settings, "JOB_MAX_ATTEMPTS", 2)
+    await JobService(db_session).enqueue("test.fail", uuid4())
+    await db_session.commit()
+
+    await run_pending_jobs(db_session)
+    [job] = await _jobs(db_session)
+    assert (job.status, job.attempts) == (JobStatus.PENDING, 1)
+    assert job.run_after > job_service._utcnow()
+    assert job.last_error == "RuntimeError: boom"
+
+    job.run_after -= timedelta(seconds=settings.JOB_RETRY_BASE_SECONDS * 2)
+    await db_session.commit()
+    await run_pending_jobs(db_session)
+
+    [job] = await _jobs(db_session)
+    assert (job.status, job.attempts) == (JobStatus.FAILED, 2)
+
+
+@pytest.mark.asyncio
+async def test_runner_recovers_interrupted_jobs_and_drains_queue(tmp_path, calls):
+    """Jobs left running by a crash are re-queued on start and run in the background."""
+    # A file database, so the dispatcher and workers get their own connections
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    interrupted, queued = uuid4(), uuid4()
+    async with session_factory() as db:
+        db.add(Job(kind="test.record", note_id=interrupted, status=JobStatus.RUNNING))
+        await JobService(db).enqueue("test.record", queued)
+        await db.commit()
+
+    runner = JobRunner(session_factory, concurrency=2)
+    await runner.start()
+    try:
+        async with session_factory() as db:
+            for _ in range(200):
+                if not await _jobs(db):
+                    break
+                await asyncio.sleep(0.01)
+    finally:
+        await runner.stop(grace=1.0)
+        await engine.dispose()
+
+    assert sorted(calls) == sorted([interrupted, queued])
+    assert not runner.running
+
+
+@pytest.mark.asyncio
+async def test_a_job_claimed_by_another_runner_is_not_claimed_twice(tmp_path, calls):
+    """A second runner claiming between our SELECT and UPDATE wins; we get nothing."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as db:
+        await JobService(db).enqueue("test.record", uuid4())
+        await db.commit()
+
+    class RacingSession:
+        """Lets the other runner claim right after this session's SELECT."""
+
+        def __init__(self, db):
+            self.db = db
+            self.raced = []
+
+        async def execute(self, *args, **kwargs):
+            result = await self.db.execute(*args, **kwargs)
+            if not self.raced:
+                async with session_factory() as other:
+                    self.raced = await job_service._claim(other, 1, set())
+            return result
+
+        async def commit(self):
+            await self.db.commit()
+
+    try:
+        async with session_factory() as db:
+            racing = RacingSession(db)
+            claimed = await job_service._claim(racing, 1, set())
+    finally:
+        await engine.dispose()
+
+    assert len(racing.raced) == 1
+    assert claimed == []
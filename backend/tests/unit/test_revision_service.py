@@ -0,0 +1,78 @@
+import pytest
+from app.config import settings
+from app.models.note import Note
+from app.models.revision import RevisionKind
+from app.services.revision_service import RevisionService, apply_delta, diff_fields
+
+
+@pytest.mark.parametrize(
+    ("old", "new"),
+    [
+        ("The quick fox", "The quick brown fox"),
+        ("aaaa", "aa"),
+        ("", "Fresh start"),
+        ("Rewritten entirely", "Something else"),
+    ],
+)
+def test_delta_round_trips(old, new):
+    before = {"title": "T", "content": old, "content_html": None}
+    after = {"title": "T", "content": new, "content_html": f"<p>{new}</p>"}
+
+    delta = diff_fields(before, after)
+
+    assert "title" not in delta
+    assert apply_delta(before, delta) == after
+    assert apply_delta(after, diff_fields(after, before)) == before
+
+
+async def _edit(db_session, note, content):
+    note.content = content
+    await db_session.commit()
+    return await RevisionService(db_session).record(note.id)
+
+
+@pytest.mark.asyncio
+async def test_revisions_snapshot_periodically_and_replay(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "REVISION_SNAPSHOT_INTERVAL", 3)
+    note = Note(title="Draft", content="Line 0")
+    db_session.add(note)
+    await db_session.commit()
+    service = RevisionService(db_session)
+    await service.record(note.id)
+
+    contents = {1: "Line 0"}
+    for i in range(1, 7):
+        contents[note.version + 1] = f"{contents[note.version]}\nLine {i}"
+        await _edit(db_session, note, contents[note.version + 1])
+    await db_session.commit()
+
+    revisions = await service.list_revisions(note.id)
+    assert [r.kind for r in reversed(revisions)] == [
+        RevisionKind.SNAPSHOT,
+        RevisionKind.DELTA,
+        RevisionKind.DELTA,
+    ] * 2 + [RevisionKind.SNAPSHOT]
+    for revision, content in contents.items():
+        assert (await service.get_revision(note.id, revision)).content == content
+    assert await service.record(note.id) is None
+
+
+@pytest.mark.asyncio
+async def test_prune_rebases_oldest_kept_delta(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "REVISION_RETENTION_COUNT", 2)
+    note = Note(title="Draft", content="v1")
+    db_session.add(note)
+    await db_session.commit()
+    service = RevisionService(db_session)
+    await service.record(note.id)
+    await _edit(db_session, note, "v1 v2")
+    await _edit(db_session, note, "v1 v2 v3")
+    await db_session.commit()
+
+    revisions = await service.list_revisions(note.id)
+    assert [(r.revision, r.kind) for r in revisions] == [
+        (3, RevisionKind.DELTA),
+        (2, RevisionKind.SNAPSHOT),
+    ]
+    assert (await service.get_revision(note.id, 3)).content == "v1 v2 v3"
+    assert await service.get_revision(note.id, 1) is None
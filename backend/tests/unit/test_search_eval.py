@@ -0,0 +1,23 @@
+import pytest
+from evals.search_relevance import evaluate, ndcg_at_k, recall_at_k, reciprocal_rank
+
+
+def test_ranking_metrics():
+    """Recall, reciprocal rank and nDCG match hand-computed values."""
+    ranked = ["x", "a", "y", "b"]
+    relevant = {"a", "b"}
+
+    assert recall_at_k(ranked, relevant, 2) == 0.5
+    assert reciprocal_rank(ranked, relevant) == 0.5
+    assert ndcg_at_k(["a", "b"], relevant, 10) == 1.0
+    assert ndcg_at_k(["x"], relevant, 10) == 0.0
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_hybrid_beats_keyword_on_labeled_queries():
+    """On the labeled query set, hybrid recall and MRR are at least keyword's."""
+    reports = {r.mode: r for r in await evaluate(k=10, repeat=1)}
+
+    assert reports["hybrid"].recall >= reports["keyword"].recall
+    assert reports["hybrid"].mrr >= reports["keyword"].mrr
@@ -0,0 +1,70 @@
+from unittest.mock import patch
+from uuid import uuid4
+
+from app.services.search_service import SearchMatchCache, build_snippet, reciprocal_rank_fusion
+
+
+def test_match_cache_evicts_least_recently_used():
+    """The match cache keeps at most max_entries queries, evicting the oldest."""
+    cache = SearchMatchCache(ttl=60, max_entries=2, max_ids=10)
+    cache.put("a", [uuid4()])
+    cache.put("b", [uuid4()])
+    cache.get("a")
+    cache.put("c", [uuid4()])
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_match_cache_expires_entries():
+    """Entries older than the TTL are treated as misses."""
+    cache = SearchMatchCache(ttl=5, max_entries=2, max_ids=10)
+    with patch("app.services.search_service.time.monotonic", return_value=100.0):
+        cache.put("a", [uuid4()])
+    with patch("app.services.search_service.time.monotonic", return_value=106.0):
+        assert cache.get("a") is None
+
+
+def test_match_cache_skips_oversized_match_sets():
+    """Match sets larger than max_ids are not cached."""
+    cache = SearchMatchCache(ttl=60, max_entries=2, max_ids=1)
+    cache.put("a", [uuid4(), uuid4()])
+
+    assert cache.get("a") is None
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    """Documents ranked by both signals beat documents ranked highly by one."""
+    a, b, c = uuid4(), uuid4(), uuid4()
+
+    fused = reciprocal_rank_fusion([([a, b], 1.0), ([c, b], 1.0)], k=60)
+
+    assert fused[0][0] == b
+    assert {note_id for note_id, _ in fused} == {a, b, c}
+
+
+def test_reciprocal_rank_fusion_applies_weights():
+    """A zero-weight signal cannot change the order of the other signal."""
+    a, b = uuid4(), uuid4()
+
+    fused = reciprocal_rank_fusion([([a, b], 1.0), ([b, a], 0.0)], k=60)
+
+    assert [note_id for note_id, _ in fused] == [a, b]
+
+
+def test_snippet_centres_on_window_with_most_query_terms():
+    """The excerpt covers the passage holding both terms, not the first lone hit."""
+    text = "progress report. " + "filler words " * 50 + "Progressive summarization in layers."
+    snippet, highlights = build_snippet(text, "progressive summarization", 80)
+
+    assert snippet.startswith("… ")
+    assert len(snippet) <= 80 + 4
+    assert [snippet[h.start : h.end] for h in highlights] == ["Progressive", "summarization"]
+
+
+def test_snippet_without_matches_returns_opening():
+    snippet, highlights = build_snippet("Line one\n\nline two", "absent", 80)
+
+    assert snippet == "Line one line two"
+    assert highlights == []
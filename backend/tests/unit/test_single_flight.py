@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+from app.services.single_flight import SingleFlight
+
+
+class GatedRead:
+    """A read that blocks until released, counting how many times it actually ran."""
+
+    def __init__(self, result="rows", error=None):
+        self.result = result
+        self.error = error
+        self.runs = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.runs += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return self.result
+
+
+async def _settle():
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_read():
+    flights = SingleFlight()
+    read, other = GatedRead(), GatedRead("other")
+    callers = [asyncio.create_task(flights.do("recent", 20, read)) for _ in range(5)]
+    other_args = asyncio.create_task(flights.do("recent", 50, other))
+    await _settle()
+    read.release.set()
+    other.release.set()
+
+    assert await asyncio.gather(*callers) == ["rows"] * 5
+    assert await other_args == "other"
+    assert read.runs == 1
+    [stats] = flights.stats()
+    assert (stats.calls, stats.executed, stats.shared) == (6, 2, 4)
+    assert stats.coalescing_ratio == pytest.approx(4 / 6)
+
+
+@pytest.mark.asyncio
+async def test_failure_reaches_every_waiter_and_next_call_runs_fresh():
+    flights = SingleFlight()
+    failing = GatedRead(error=RuntimeError("db down"))
+    callers = [asyncio.create_task(flights.do("inbox", (), failing)) for _ in range(3)]
+    await _settle()
+    failing.release.set()
+
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert flights.in_flight == 0
+
+    retry = GatedRead()
+    retry.release.set()
+    assert await flights.do("inbox", (), retry) == "rows"
+    assert flights.stats()[0].failed == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_the_shared_read():
+    flights = SingleFlight()
+    read = GatedRead()
+    leader = asyncio.create_task(flights.do("containers", (), read))
+    await _settle()
+    follower = asyncio.create_task(flights.do("containers", (), read))
+    await _settle()
+
+    leader.cancel()
+    await _settle()
+    read.release.set()
+
+    assert await follower == "rows"
+    assert leader.cancelled()
+    assert not read.cancelled
+
+
+@pytest.mark.asyncio
+async def test_read_is_cancelled_when_its_last_waiter_leaves():
+    flights = SingleFlight()
+    read = GatedRead()
+    caller = asyncio.create_task(flights.do("containers", (), read))
+    await _settle()
+
+    caller.cancel()
+    await _settle()
+
+    assert read.cancelled
+    assert flights.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_callers_after_a_write_do_not_join_an_older_read():
+    flights = SingleFlight()
+    before, after = GatedRead("before"), GatedRead("after")
+    first = asyncio.create_task(flights.do("recent", 20, before))
+    await _settle()
+
+    flights.invalidate()
+    second = asyncio.create_task(flights.do("recent", 20, after))
+    await _settle()
+    before.release.set()
+    after.release.set()
+
+    assert await asyncio.gather(first, second) == ["before", "after"]
+    assert before.runs == after.runs == 1
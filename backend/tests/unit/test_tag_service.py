@@ -0,0 +1,44 @@
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from app.services.tag_service import TagService, normalize_tag_names
+
+
+@pytest.fixture
+def mock_db():
+    """Create a mock database session."""
+    return AsyncMock()
+
+
+@pytest.fixture
+def tag_service(mock_db):
+    """Create a TagService with a mock database."""
+    return TagService(mock_db)
+
+
+def test_normalize_tag_names_strips_and_dedupes():
+    """Tag names are stripped, empties dropped and duplicates removed in order."""
+    assert normalize_tag_names([" b", "a", "", "b ", "  "]) == ["b", "a"]
+
+
+@pytest.mark.asyncio
+async def test_set_note_tags_returns_none_when_note_not_found(tag_service, mock_db):
+    """set_note_tags returns None when the note doesn't exist."""
+    mock_result = MagicMock()
+    mock_result.scalar_one_or_none.return_value = None
+    mock_db.execute.return_value = mock_result
+
+    result = await tag_service.set_note_tags(uuid4(), ["python"])
+
+    assert result is None
+    mock_db.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_or_create_tags_skips_query_for_empty_names(tag_service, mock_db):
+    """get_or_create_tags does not hit the database for blank input."""
+    result = await tag_service.get_or_create_tags(["", "  "])
+
+    assert result == []
+    mock_db.execute.assert_not_called()
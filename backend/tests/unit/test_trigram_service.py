@@ -0,0 +1,90 @@
+import uuid
+
+import pytest
+from app.models.note import Note
+from app.models.trigram import NoteTerm, TermTrigram
+from app.services.trigram_service import TrigramService, index_terms, trigrams
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def test_trigrams_are_padded_like_pg_trgm():
+    assert trigrams("cat") == {"  c", " ca", "cat", "at "}
+    assert index_terms("The cat, the CAT and a dog!") == ["the", "cat", "and", "dog"]
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_typo_matches_by_similarity(db_session: AsyncSession):
+    service = TrigramService(db_session)
+    notes = {
+        "exact": "Progressive summarization in layers",
+        "partial": "Progressive overload for strength training",
+        "unrelated": "Quarterly tax return checklist",
+    }
+    ids = {}
+    for key, text in notes.items():
+        note = Note(id=uuid.uuid4(), title=key, content=text)
+        db_session.add(note)
+        await service.write_terms(note.id, text, is_new=True)
+        ids[note.id] = key
+    await db_session.commit()
+
+    hits = await service.search("progresive sumarization")
+
+    assert [ids[note_id] for note_id, _ in hits] == ["exact", "partial"]
+    assert hits[0][1] > hits[1][1]
+
+
+@pytest.mark.asyncio
+async def test_rewritten_note_drops_old_terms(db_session: AsyncSession):
+    service = TrigramService(db_session)
+    note = Note(id=uuid.uuid4(), title="t", content="zettelkasten")
+    db_session.add(note)
+    await service.write_terms(note.id, "zettelkasten", is_new=True)
+    await service.write_terms(note.id, "commonplace book")
+    await db_session.commit()
+
+    assert await service.search("zettelkasten") == []
+    assert [hit[0] for hit in await service.search("comonplace")] == [note.id]
+
+
+@pytest.mark.asyncio
+async def test_vocabulary_is_pruned_when_its_last_note_drops_a_word(db_session: AsyncSession):
+    service = TrigramService(db_session)
+    notes = [Note(id=uuid.uuid4(), title="t", content="") for _ in range(2)]
+    db_session.add_all(notes)
+    await service.write_terms(notes[0].id, "zettelkasten commonplace", is_new=True)
+    await service.write_terms(notes[1].id, "commonplace", is_new=True)
+    await service.write_terms(notes[0].id, "zettelkasten")
+    await service.delete_terms(notes[1].id)
+    await db_session.commit()
+
+    vocabulary = set((await db_session.execute(select(TermTrigram.term))).scalars().all())
+    assert vocabulary == {"zettelkasten"}
+
+
+@pytest.mark.asyncio
+async def test_first_pass_does_not_drop_a_note_that_outranks_its_hits(
+    db_session: AsyncSession, monkeypatch
+):
+    """A note with one exact match and one just under the first-pass cutoff still wins."""
+    service = TrigramService(db_session)
+    vocabulary = {"wone": {"a": 1.0, "a3": 0.6}, "wtwo": {"b": 0.6, "b2": 0.55}}
+
+    async def similar_terms(word):
+        return vocabulary[word]
+
+    monkeypatch.setattr(service, "similar_terms", similar_terms)
+    x = Note(id=uuid.uuid4(), title="x", content="")
+    y = Note(id=uuid.uuid4(), title="y", content="")
+    db_session.add_all([x, y])
+    db_session.add_all(
+        NoteTerm(note_id=note.id, term=term)
+        for note, term in [(x, "a"), (x, "b2"), (y, "a3"), (y, "b")]
+    )
+    await db_session.commit()
+
+    hits = await service.search("wone wtwo", limit=1)
+
+    assert [note_id for note_id, _ in hits] == [x.id]
+    assert hits[0][1] == pytest.approx(0.775)
@@ -0,0 +1,96 @@
+from uuid import uuid4
+
+import numpy as np
+from app.services.embedding_service import HashingEmbedder
+from app.services.vector_index import VectorIndex
+
+
+def _unit_vectors(n: int, dim: int, seed: int = 1) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_hashing_embedder_is_deterministic_and_normalized():
+    """The default embedder gives identical unit vectors for identical text."""
+    embedder = HashingEmbedder(dim=64)
+
+    first, second, empty = embedder.embed(
+        ["Progressive summarization", "Progressive summarization", ""]
+    )
+
+    assert np.array_equal(first, second)
+    assert np.isclose(np.linalg.norm(first), 1.0)
+    assert not empty.any()
+
+
+def test_hashing_embedder_ranks_related_text_higher():
+    """Texts sharing words and word pieces are closer than unrelated texts."""
+    embedder = HashingEmbedder(dim=384)
+    query, related, unrelated = embedder.embed(
+        ["summarizing notes", "progressive summarization of notes", "bicycle repair manual"]
+    )
+
+    assert query @ related > query @ unrelated
+
+
+def test_exact_search_returns_best_matches_first():
+    """Below the IVF threshold, search is exact and ordered by similarity."""
+    index = VectorIndex(dim=8, ivf_min_size=1000)
+    vectors = _unit_vectors(20, 8)
+    ids = [uuid4() for _ in range(20)]
+    for note_id, vector in zip(ids, vectors, strict=True):
+        index.upsert(note_id, vector)
+
+    hits = index.search(vectors[3], k=3)
+
+    assert hits[0][0] == ids[3]
+    assert np.isclose(hits[0][1], 1.0)
+    assert [score for _, score in hits] == sorted((score for _, score in hits), reverse=True)
+
+
+def test_remove_excludes_vector_and_reuses_row():
+    """Removed vectors are never returned and their row is reused."""
+    index = VectorIndex(dim=8, ivf_min_size=1000)
+    vectors = _unit_vectors(3, 8)
+    ids = [uuid4() for _ in range(3)]
+    for note_id, vector in zip(ids, vectors, strict=True):
+        index.upsert(note_id, vector)
+
+    index.remove(ids[0])
+    assert ids[0] not in [note_id for note_id, _ in index.search(vectors[0], k=3)]
+
+    replacement = uuid4()
+    index.upsert(replacement, vectors[0])
+    assert len(index) == 3
+    assert index.search(vectors[0], k=1)[0][0] == replacement
+
+
+def test_ivf_search_finds_exact_neighbour_after_training():
+    """Once trained, IVF search still finds a stored vector as its own top hit."""
+    index = VectorIndex(dim=16, ivf_min_size=200, nprobe=4)
+    vectors = _unit_vectors(400, 16)
+    ids = [uuid4() for _ in range(400)]
+    index.load(ids, vectors)
+    extra = uuid4()
+    index.upsert(extra, vectors[7])
+
+    assert index.search(vectors[10], k=1)[0][0] == ids[10]
+    assert {note_id for note_id, _ in index.search(vectors[7], k=2)} == {ids[7], extra}
+
+
+def test_exact_neighbors_matches_brute_force_across_chunks():
+    """Batched neighbour lists equal per-query brute force, skipping removed rows."""
+    vectors = _unit_vectors(50, 16)
+    ids = [uuid4() for _ in range(50)]
+    index = VectorIndex(dim=16)
+    index.load(ids, vectors)
+    index.remove(ids[3])
+
+    results = index.exact_neighbors(vectors[:10], k=5, chunk_size=4)
+
+    live = [i for i in range(50) if i != 3]
+    for query, neighbors in zip(vectors[:10], results, strict=True):
+        scores = vectors[live] @ query
+        expected = [ids[live[i]] for i in np.argsort(-scores)[:5]]
+        assert [note_id for note_id, _ in neighbors] == expected
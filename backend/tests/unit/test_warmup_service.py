@@ -0,0 +1,49 @@
+import pytest
+from app.config import settings
+from app.database import Base
+from app.main import app
+from app.services.warmup_service import StartupTimer, prefetch_database_file, warm_up
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+
+@pytest.mark.asyncio
+async def test_warm_up_fills_pool_compiles_queries_and_reports_phases(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "WARMUP_POOL_CONNECTIONS", 3)
+    monkeypatch.setattr(settings, "WARMUP_OPENAPI", True)
+    monkeypatch.setattr(settings, "WARMUP_PREFETCH_MAX_BYTES", 1 << 20)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'warm.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    compiled_before = len(engine.sync_engine._compiled_cache)
+
+    timer = StartupTimer()
+    try:
+        await warm_up(app, engine, async_sessionmaker(engine, expire_on_commit=False), timer)
+        checked_in = engine.pool.checkedin()
+    finally:
+        await engine.dispose()
+    report = timer.report(warmed_up=True)
+
+    assert checked_in >= 3
+    assert len(engine.sync_engine._compiled_cache) > compiled_before
+    assert app.openapi_schema is not None
+    assert [phase.name for phase in report.phases] == [
+        "warmup.prefetch",
+        "warmup.connections",
+        "warmup.routes",
+        "warmup.queries",
+        "warmup.openapi",
+    ]
+    assert report.total_ms >= sum(phase.ms for phase in report.phases)
+
+
+@pytest.mark.asyncio
+async def test_prefetch_reads_sqlite_file_up_to_limit(tmp_path):
+    path = tmp_path / "vault.db"
+    path.write_bytes(b"\0" * 3000)
+    file_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    memory_engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+
+    assert await prefetch_database_file(file_engine, 10_000) == 3000
+    assert await prefetch_database_file(file_engine, 1000) == 1000
+    assert await prefetch_database_file(memory_engine, 10_000) == 0